@@ -36,8 +36,10 @@ setup(name='spotty',
       long_description_content_type='text/markdown',
       packages=find_packages(exclude=['tests*']),
       package_data={
+          'spotty.deployment.abstract_cloud_instance': ['data/*'],
           'spotty.deployment.container.docker.scripts': ['data/*', 'data/*/*'],
           'spotty.providers.aws.cfn_templates.instance': ['data/*', 'data/*/*'],
+          'spotty.providers.aws.helpers': ['data/*'],
           'spotty.providers.aws.cfn_templates.instance_profile': ['data/*', 'data/*/*'],
           'spotty.providers.gcp.dm_templates.instance': ['data/*', 'data/*/*'],
       },
@@ -45,7 +47,7 @@ setup(name='spotty',
       install_requires=[
           'boto3>=1.9.0',
           'google-api-python-client>=1.7.8',
-          'google-cloud-storage>=1.15.0',
+          'google-cloud-storage>=1.36.0',
           'cfn_flip',  # to work with CloudFormation templates
           'schema',
           'chevron',
@@ -1,51 +1,101 @@
 import argparse
-from typing import List, Type
-import pkg_resources
+from functools import lru_cache
+from typing import List, Type, Union
 from spotty.commands.abstract_command import AbstractCommand
-from spotty.commands.aws import AwsCommand
-from spotty.commands.download import DownloadCommand
-from spotty.commands.exec import ExecCommand
-from spotty.commands.run import RunCommand
-from spotty.commands.sh import ShCommand
-from spotty.commands.start import StartCommand
-from spotty.commands.status import StatusCommand
-from spotty.commands.stop import StopCommand
-from spotty.commands.sync import SyncCommand
-from spotty.commands.vast import VastCommand
-
-def get_parser() -> argparse.ArgumentParser:
+from spotty.commands.abstract_provider_command import AbstractProviderCommand
+from spotty.commands.lazy_command import LazyCommand, load_command_class
+
+
+COMMANDS = [
+    LazyCommand('start', 'spotty.commands.start', 'StartCommand'),
+    LazyCommand('stop', 'spotty.commands.stop', 'StopCommand'),
+    LazyCommand('status', 'spotty.commands.status', 'StatusCommand'),
+    LazyCommand('sh', 'spotty.commands.sh', 'ShCommand'),
+    LazyCommand('run', 'spotty.commands.run', 'RunCommand'),
+    LazyCommand('exec', 'spotty.commands.exec', 'ExecCommand'),
+    LazyCommand('sync', 'spotty.commands.sync', 'SyncCommand'),
+    LazyCommand('download', 'spotty.commands.download', 'DownloadCommand'),
+    LazyCommand('ssh-close', 'spotty.commands.ssh_close', 'SshCloseCommand'),
+    LazyCommand('jobs', 'spotty.commands.jobs', 'JobsCommand'),
+    LazyCommand('aws', 'spotty.commands.aws', 'AwsCommand'),
+    LazyCommand('vast', 'spotty.commands.vast', 'VastCommand'),
+]
+
+
+def get_parser(args: List[str] = None) -> argparse.ArgumentParser:
+    """Returns the Spotty argument parser.
+
+    Args:
+        args: Command line arguments. If provided, only the selected sub-command will be imported
+            and configured, other sub-commands will be added to the parser as placeholders.
+            Otherwise, the full parser will be built (it's used to generate the documentation).
+    """
     parser = argparse.ArgumentParser()
     parser.add_argument('-V', '--version', action='store_true', help='Display the version of the Spotty')
 
-    command_classes = [
-       StartCommand,
-       StopCommand,
-       StatusCommand,
-       ShCommand,
-       RunCommand,
-       ExecCommand,
-       SyncCommand,
-       DownloadCommand,
-       AwsCommand,
-       VastCommand,
-    ] + _get_custom_commands()
+    commands = list(COMMANDS)
+
+    # custom commands are loaded only if one of them can be selected or the full help should be displayed
+    command_name = _get_command_name(args) if args is not None else None
+    if not command_name or command_name not in [command.name for command in COMMANDS]:
+        commands += _get_custom_commands()
 
     # add commands to the parser
-    add_subparsers(parser, command_classes)
+    add_subparsers(parser, commands, args)
 
     return parser
 
 
-def add_subparsers(parser: argparse.ArgumentParser, command_classes: List[Type[AbstractCommand]]):
-    """Adds commands to the parser."""
+def add_subparsers(parser: argparse.ArgumentParser, commands: List[Union[LazyCommand, Type[AbstractCommand]]],
+                   args: List[str] = None):
+    """Adds commands to the parser.
+
+    If the arguments are provided and one of the commands is selected, only this command will be configured.
+    """
+    command_name = _get_command_name(args) if args is not None else None
+    sub_args = args[(args.index(command_name) + 1):] if command_name else None
+
     subparsers = parser.add_subparsers()
-    for command_class in command_classes:
-        command = command_class()
+    for command in commands:
+        if command_name and (command.name != command_name):
+            # a placeholder for the command that is not going to be used
+            subparsers.add_parser(command.name)
+            continue
+
+        command = load_command_class(command)()
         subparser = subparsers.add_parser(command.name, help=command.description, description=command.description)
         subparser.set_defaults(command=command, parser=subparser)
         command.configure(subparser)
 
+        # add provider sub-commands
+        if isinstance(command, AbstractProviderCommand):
+            add_subparsers(subparser, command.commands, sub_args)
+
+
+def _get_command_name(args: List[str]) -> str:
+    """Returns the name of the selected sub-command: the first positional argument."""
+    for arg in args:
+        if not arg.startswith('-'):
+            return arg
+
+    return ''
 
+
+@lru_cache()
 def _get_custom_commands() -> List[Type[AbstractCommand]]:
     """Returns custom commands that integrated through entry points."""
-    return [entry_point.load() for entry_point in pkg_resources.iter_entry_points('spotty.commands')]
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        # Python < 3.8
+        import pkg_resources
+        return [entry_point.load() for entry_point in pkg_resources.iter_entry_points('spotty.commands')]
+
+    all_entry_points = entry_points()
+    if hasattr(all_entry_points, 'select'):
+        command_entry_points = all_entry_points.select(group='spotty.commands')
+    else:
+        # Python < 3.10
+        command_entry_points = all_entry_points.get('spotty.commands', [])
+
+    return [entry_point.load() for entry_point in command_entry_points]
@@ -3,6 +3,7 @@ from typing import List
 from argparse import Namespace, ArgumentParser
 from spotty.config.config_utils import load_config
 from spotty.deployment.abstract_instance_manager import AbstractInstanceManager
+from spotty.deployment.utils.jobs import resume_interrupted_jobs
 from spotty.providers.instance_manager_factory import InstanceManagerFactory
 from spotty.commands.abstract_command import AbstractCommand
 from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
@@ -18,11 +19,20 @@ class AbstractConfigCommand(AbstractCommand):
     def configure(self, parser: ArgumentParser):
         super().configure(parser)
         parser.add_argument('-c', '--config', type=str, default=None, help='Path to the configuration file')
+        parser.add_argument('--no-config-cache', action='store_true', help='Don\'t use the cached validated '
+                                                                             'configuration')
+        self._configure_instance_arguments(parser)
+
+    def _configure_instance_arguments(self, parser: ArgumentParser):
+        """Adds arguments to select the instance."""
         parser.add_argument('instance_name', metavar='INSTANCE_NAME', nargs='?', type=str, help='Instance name')
 
     def run(self, args: Namespace, output: AbstractOutputWriter):
+        # restart background jobs which workers were killed
+        resume_interrupted_jobs(output)
+
         # get project configuration
-        project_config = load_config(args.config)
+        project_config = load_config(args.config, use_cache=(not args.no_config_cache))
 
         # get instance configuration
         instance_id = self._get_instance_id(project_config.instances, args.instance_name, output)
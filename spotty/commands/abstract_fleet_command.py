@@ -0,0 +1,96 @@
+import sys
+from abc import abstractmethod
+from argparse import Namespace, ArgumentParser
+from spotty.commands.abstract_config_command import AbstractConfigCommand
+from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
+from spotty.config.config_utils import load_config
+from spotty.deployment.abstract_instance_manager import AbstractInstanceManager
+from spotty.deployment.utils.fleet import is_instance_pattern, select_instances, run_on_instances
+from spotty.deployment.utils.jobs import resume_interrupted_jobs
+from spotty.providers.instance_manager_factory import InstanceManagerFactory
+from spotty.utils import render_table
+
+
+class AbstractFleetCommand(AbstractConfigCommand):
+    """Abstract class for a Spotty sub-command that can be run for several instances at the same time.
+
+    Instances can be selected by names, glob patterns or using the "--all" option. If more than one
+    instance is selected, the command is run for all of them concurrently, the output of each instance
+    is prefixed with its name and the command exits with the highest exit code.
+    """
+
+    @abstractmethod
+    def _run_instance(self, instance_manager: AbstractInstanceManager, args: Namespace, output: AbstractOutputWriter,
+                      fleet: bool) -> int:
+        """Runs the command for one instance.
+
+        Args:
+            instance_manager: Instance manager.
+            args: Arguments provided by argparse.
+            output: Output writer.
+            fleet: The command is run for several instances at the same time, so the instance
+                doesn't have access to the terminal.
+        Returns:
+            An exit code.
+        """
+        raise NotImplementedError
+
+    def _check_fleet_args(self, args: Namespace):
+        """Raises an error if the arguments cannot be used with several instances."""
+        pass
+
+    def _configure_instance_arguments(self, parser: ArgumentParser):
+        parser.add_argument('instance_names', metavar='INSTANCE_NAME', nargs='*', type=str,
+                            help='Instance name or a glob pattern (for example, "worker-*"). Several instances can '
+                                 'be specified.')
+        parser.add_argument('-a', '--all', action='store_true', help='Run for all instances from the configuration '
+                                                                     'file')
+        parser.add_argument('-P', '--parallel', type=int, default=8,
+                            help='Maximum number of instances to run the command for at the same time (default: 8)')
+
+    def run(self, args: Namespace, output: AbstractOutputWriter):
+        if not args.all and (len(args.instance_names) <= 1) \
+                and not any(is_instance_pattern(instance_name) for instance_name in args.instance_names):
+            # a single instance
+            args.instance_name = args.instance_names[0] if args.instance_names else None
+            super().run(args, output)
+            return
+
+        if args.parallel < 1:
+            raise ValueError('The "--parallel" value should be greater than 0.')
+
+        self._check_fleet_args(args)
+
+        # restart background jobs which workers were killed
+        resume_interrupted_jobs(output)
+
+        # get project configuration
+        project_config = load_config(args.config, use_cache=(not args.no_config_cache))
+
+        # create instance managers in the main thread, because creating boto3 clients is not thread-safe
+        instance_configs = select_instances(project_config.instances, args.instance_names, args.all)
+        instance_managers = [InstanceManagerFactory.get_instance(project_config, instance_config)
+                             for instance_config in instance_configs]
+
+        # run the command for all instances
+        exit_codes = run_on_instances(instance_managers,
+                                      lambda instance_manager, instance_output:
+                                      self._run_instance(instance_manager, args, instance_output, fleet=True),
+                                      output, max_workers=args.parallel)
+
+        # print the summary
+        table = [('Instance', 'Exit Code')]
+        for instance_manager, exit_code in zip(instance_managers, exit_codes):
+            table.append((instance_manager.instance_config.name, exit_code))
+
+        output.write('\n' + render_table(table, separate_title=True))
+
+        # exit with the highest exit code (a process killed by a signal has a negative exit code)
+        failed_exit_codes = [(exit_code if exit_code > 0 else 1) for exit_code in exit_codes if exit_code]
+        if failed_exit_codes:
+            sys.exit(max(failed_exit_codes))
+
+    def _run(self, instance_manager: AbstractInstanceManager, args: Namespace, output: AbstractOutputWriter):
+        exit_code = self._run_instance(instance_manager, args, output, fleet=False)
+        if exit_code:
+            sys.exit(exit_code)
@@ -11,12 +11,15 @@ class AbstractProviderCommand(AbstractCommand):
     @property
     @abstractmethod
     def commands(self) -> list:
-        """Returns a list of the provider sub-commands."""
+        """Returns a list of the provider sub-commands (command classes or lazy references to them).
+
+        The sub-commands are added to the parser by the "spotty.cli.add_subparsers" function.
+        """
         raise NotImplementedError
 
     def configure(self, parser: ArgumentParser):
-        from spotty.cli import add_subparsers
-        add_subparsers(parser, self.commands)
+        """The provider command doesn't have its own arguments."""
+        pass
 
     def run(self, args: Namespace, output: AbstractOutputWriter):
         """If the command is called, it just displays a list of available sub-commands."""
@@ -1,6 +1,5 @@
 from spotty.commands.abstract_provider_command import AbstractProviderCommand
-from spotty.providers.aws.commands.clean_logs import CleanLogsCommand
-from spotty.providers.aws.commands.spot_prices import SpotPricesCommand
+from spotty.commands.lazy_command import LazyCommand
 
 
 class AwsCommand(AbstractProviderCommand):
@@ -8,6 +7,8 @@ class AwsCommand(AbstractProviderCommand):
     name = 'aws'
     description = 'AWS commands'
     commands = [
-        SpotPricesCommand,
-        CleanLogsCommand,
+        LazyCommand('spot-prices', 'spotty.providers.aws.commands.spot_prices', 'SpotPricesCommand'),
+        LazyCommand('refresh-prices', 'spotty.providers.aws.commands.refresh_prices', 'RefreshPricesCommand'),
+        LazyCommand('bake-ami', 'spotty.providers.aws.commands.bake_ami', 'BakeAmiCommand'),
+        LazyCommand('clean-logs', 'spotty.providers.aws.commands.clean_logs', 'CleanLogsCommand'),
     ]
@@ -1,6 +1,5 @@
-import sys
 from argparse import ArgumentParser, Namespace
-from spotty.commands.abstract_config_command import AbstractConfigCommand
+from spotty.commands.abstract_fleet_command import AbstractFleetCommand
 from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
 from spotty.deployment.utils.cli import shlex_join
 from spotty.errors.instance_not_running import InstanceNotRunningError
@@ -8,7 +7,7 @@ from spotty.errors.nothing_to_do import NothingToDoError
 from spotty.deployment.abstract_instance_manager import AbstractInstanceManager
 
 
-class ExecCommand(AbstractConfigCommand):
+class ExecCommand(AbstractFleetCommand):
 
     name = 'exec'
     description = 'Execute a command in the container'
@@ -27,14 +26,23 @@ class ExecCommand(AbstractConfigCommand):
         parser.epilog = 'The double dash (--) separates the command that you want to execute inside the container ' \
                         'from the Spotty arguments.'
 
-    def _run(self, instance_manager: AbstractInstanceManager, args: Namespace, output: AbstractOutputWriter):
+    def _check_fleet_args(self, args: Namespace):
+        if not args.custom_args:
+            raise ValueError('Use the double-dash ("--") to split Spotty arguments from the command that should be '
+                             'executed inside the container.')
+
+        if args.interactive or args.tty:
+            raise ValueError('The "--interactive" and "--tty" options cannot be used with several instances.')
+
+    def _run_instance(self, instance_manager: AbstractInstanceManager, args: Namespace, output: AbstractOutputWriter,
+                      fleet: bool) -> int:
         # check that the command is provided
         if not args.custom_args:
             raise ValueError('Use the double-dash ("--") to split Spotty arguments from the command that should be '
                              'executed inside the container.')
 
         # check that the instance is started
-        if not instance_manager.is_running():
+        if not instance_manager.is_reachable():
             raise InstanceNotRunningError(instance_manager.instance_config.name)
 
         # sync the project with the instance
@@ -50,5 +58,4 @@ class ExecCommand(AbstractConfigCommand):
                                                            user=args.user)
 
         # execute the command on the host OS
-        exit_code = instance_manager.exec(command, tty=args.tty)
-        sys.exit(exit_code)
+        return instance_manager.exec(command, tty=args.tty, output=(output if fleet else None))
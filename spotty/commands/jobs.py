@@ -0,0 +1,65 @@
+import time
+from argparse import Namespace, ArgumentParser
+from spotty.commands.abstract_command import AbstractCommand
+from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
+from spotty.deployment.utils.jobs import Job, resume_interrupted_jobs
+from spotty.utils import render_table
+
+
+class JobsCommand(AbstractCommand):
+
+    name = 'jobs'
+    description = 'Show background jobs started by Spotty commands (for example, "spotty stop --detach")'
+
+    def configure(self, parser: ArgumentParser):
+        super().configure(parser)
+        parser.add_argument('job_id', metavar='JOB_ID', nargs='?', type=str, help='Show the log of the job')
+        parser.add_argument('--clean', action='store_true', help='Delete records of the finished jobs')
+
+    def run(self, args: Namespace, output: AbstractOutputWriter):
+        # restart background jobs which workers were killed
+        resume_interrupted_jobs(output)
+
+        if args.job_id:
+            job = Job.get(args.job_id)
+            if not job:
+                raise ValueError('Job "%s" not found.' % args.job_id)
+
+            output.write('Job "%s" (%s): %s\n' % (job.job_id, job.description, job.status))
+            output.write('\n'.join(job.get_log_tail(num_lines=1000)))
+            return
+
+        jobs = Job.get_all()
+        if args.clean:
+            finished_jobs = [job for job in jobs if not job.is_running]
+            for job in finished_jobs:
+                job.delete()
+
+            output.write('%d finished job(s) deleted.' % len(finished_jobs))
+            return
+
+        if not jobs:
+            output.write('There are no background jobs.')
+            return
+
+        table = [('Job ID', 'Description', 'Status', 'Started', 'Last Update')]
+        for job in jobs:
+            table.append((job.job_id, job.description, job.status, _format_time(job.created_at),
+                          _format_time(job.updated_at)))
+
+        output.write(render_table(table, separate_title=True))
+
+        # show progress of the unfinished jobs and errors of the failed ones
+        for job in jobs:
+            if job.status == Job.STATUS_FAILED:
+                output.write('\nJob "%s" failed: %s' % (job.job_id, job.error))
+            elif job.is_running:
+                log_lines = job.get_log_tail()
+                if log_lines:
+                    output.write('\nJob "%s" progress:' % job.job_id)
+                    with output.prefix('  '):
+                        output.write('\n'.join(log_lines))
+
+
+def _format_time(timestamp: float) -> str:
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(timestamp))
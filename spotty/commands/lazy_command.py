@@ -0,0 +1,16 @@
+from collections import namedtuple
+from importlib import import_module
+from typing import Type, Union
+from spotty.commands.abstract_command import AbstractCommand
+
+
+LazyCommand = namedtuple('LazyCommand', ['name', 'module_name', 'class_name'])
+LazyCommand.__doc__ = """A reference to a sub-command class that is imported only when the sub-command is used."""
+
+
+def load_command_class(command: Union[LazyCommand, Type[AbstractCommand]]) -> Type[AbstractCommand]:
+    """Returns a command class, the module of a lazy command is imported at this point."""
+    if isinstance(command, LazyCommand):
+        return getattr(import_module(command.module_name), command.class_name)
+
+    return command
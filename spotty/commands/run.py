@@ -1,5 +1,5 @@
 from argparse import ArgumentParser, Namespace
-from spotty.commands.abstract_config_command import AbstractConfigCommand
+from spotty.commands.abstract_fleet_command import AbstractFleetCommand
 from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
 from spotty.deployment.utils.commands import get_script_command, get_log_command, get_tmux_session_command, get_bash_command
 from spotty.errors.instance_not_running import InstanceNotRunningError
@@ -8,7 +8,7 @@ from spotty.deployment.utils.user_scripts import parse_script_parameters, render
 from spotty.deployment.abstract_instance_manager import AbstractInstanceManager
 
 
-class RunCommand(AbstractConfigCommand):
+class RunCommand(AbstractFleetCommand):
 
     name = 'run'
     description = 'Run a custom script from the configuration file inside the container'
@@ -32,7 +32,12 @@ class RunCommand(AbstractConfigCommand):
         parser.epilog = 'The double dash (--) separates custom arguments that you can pass to the script ' \
                         'from the Spotty arguments.'
 
-    def _run(self, instance_manager: AbstractInstanceManager, args: Namespace, output: AbstractOutputWriter):
+    def _check_fleet_args(self, args: Namespace):
+        if args.session_name:
+            raise ValueError('The "--session-name" option cannot be used with several instances.')
+
+    def _run_instance(self, instance_manager: AbstractInstanceManager, args: Namespace, output: AbstractOutputWriter,
+                      fleet: bool) -> int:
         # check that the script exists
         script_name = args.script_name
         scripts = instance_manager.project_config.scripts
@@ -44,7 +49,7 @@ class RunCommand(AbstractConfigCommand):
         script_content = render_script(scripts[script_name], params)
 
         # check that the instance is started
-        if not instance_manager.is_running():
+        if not instance_manager.is_reachable():
             raise InstanceNotRunningError(instance_manager.instance_config.name)
 
         # sync the project with the instance
@@ -57,6 +62,11 @@ class RunCommand(AbstractConfigCommand):
         # get a command to run the script with "docker exec"
         script_command = get_script_command(script_name, script_content, script_args=args.custom_args,
                                             logging=args.logging)
+        if fleet:
+            # the script is run without a terminal, the output is streamed with the instance name as a prefix
+            command = instance_manager.container_commands.exec(script_command, user=args.user)
+            return instance_manager.exec(command, tty=False, output=output)
+
         command = instance_manager.container_commands.exec(script_command, interactive=True, tty=True,
                                                            user=args.user)
 
@@ -70,3 +80,5 @@ class RunCommand(AbstractConfigCommand):
 
         # execute command on the host OS
         instance_manager.exec(command)
+
+        return 0
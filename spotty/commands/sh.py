@@ -23,7 +23,7 @@ class ShCommand(AbstractConfigCommand):
 
     def _run(self, instance_manager: AbstractInstanceManager, args: Namespace, output: AbstractOutputWriter):
         # check that the instance is started
-        if not instance_manager.is_running():
+        if not instance_manager.is_reachable():
             raise InstanceNotRunningError(instance_manager.instance_config.name)
 
         if args.list_sessions:
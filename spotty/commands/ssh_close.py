@@ -0,0 +1,22 @@
+from argparse import Namespace
+from spotty.commands.abstract_config_command import AbstractConfigCommand
+from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
+from spotty.deployment.abstract_instance_manager import AbstractInstanceManager
+from spotty.deployment.abstract_ssh_instance_manager import AbstractSshInstanceManager
+
+
+class SshCloseCommand(AbstractConfigCommand):
+
+    name = 'ssh-close'
+    description = 'Close shared SSH connections to the instance'
+
+    def _run(self, instance_manager: AbstractInstanceManager, args: Namespace, output: AbstractOutputWriter):
+        if not isinstance(instance_manager, AbstractSshInstanceManager):
+            raise ValueError('The "%s" provider doesn\'t use SSH connections.'
+                             % instance_manager.instance_config.provider_name)
+
+        num_closed = instance_manager.close_ssh_connections()
+        if num_closed:
+            output.write('%d SSH connection(s) closed.' % num_closed)
+        else:
+            output.write('There are no open SSH connections.')
@@ -3,6 +3,8 @@ from spotty.commands.abstract_config_command import AbstractConfigCommand
 from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
 from spotty.errors.instance_not_running import InstanceNotRunningError
 from spotty.deployment.abstract_instance_manager import AbstractInstanceManager
+from spotty.deployment.abstract_ssh_instance_manager import AbstractSshInstanceManager
+from spotty.deployment.utils.jobs import get_running_jobs
 
 
 class StartCommand(AbstractConfigCommand):
@@ -21,6 +23,13 @@ class StartCommand(AbstractConfigCommand):
     def _run(self, instance_manager: AbstractInstanceManager, args: Namespace, output: AbstractOutputWriter):
         dry_run = args.dry_run
 
+        # volumes of the instance can still be used by a detached "spotty stop"
+        running_jobs = get_running_jobs(instance_manager.project_config.project_dir,
+                                        instance_manager.instance_config.name)
+        if running_jobs and not dry_run:
+            raise ValueError('The instance is still being stopped by the job "%s". Use the "spotty jobs" command '
+                             'to see its progress.' % running_jobs[0].job_id)
+
         if args.container:
             # check that the instance is started
             if not instance_manager.is_running():
@@ -43,6 +52,10 @@ class StartCommand(AbstractConfigCommand):
                 instance_manager.start(output, dry_run)
 
             if not dry_run:
+                # cache the SSH endpoint, so the next commands connect to the instance without API calls
+                if isinstance(instance_manager, AbstractSshInstanceManager):
+                    instance_manager.update_ssh_endpoint()
+
                 instance_name = ''
                 if len(instance_manager.project_config.instances) > 1:
                     instance_name = ' ' + instance_manager.instance_config.name
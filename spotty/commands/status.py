@@ -1,7 +1,11 @@
-from argparse import Namespace
+import json
+from argparse import Namespace, ArgumentParser
 from spotty.commands.abstract_config_command import AbstractConfigCommand
 from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
+from spotty.config.config_utils import load_config
 from spotty.deployment.abstract_instance_manager import AbstractInstanceManager
+from spotty.providers.instance_manager_factory import InstanceManagerFactory
+from spotty.utils import render_table
 
 
 class StatusCommand(AbstractConfigCommand):
@@ -9,5 +13,78 @@ class StatusCommand(AbstractConfigCommand):
     name = 'status'
     description = 'Print information about the instance'
 
+    def configure(self, parser: ArgumentParser):
+        super().configure(parser)
+        parser.add_argument('-a', '--all', action='store_true', help='Print information about all instances '
+                                                                     'from the configuration file')
+        parser.add_argument('--json', action='store_true', help='Print the information in the JSON format')
+
+    def run(self, args: Namespace, output: AbstractOutputWriter):
+        if not args.all:
+            super().run(args, output)
+            return
+
+        if args.instance_name:
+            raise ValueError('The instance name cannot be used with the "--all" option.')
+
+        # get project configuration
+        project_config = load_config(args.config, use_cache=(not args.no_config_cache))
+
+        # group the instances by providers, each provider gets information for all its instances at once
+        provider_configs = {}
+        for instance_config in project_config.instances:
+            provider_configs.setdefault(instance_config['provider'], []).append(instance_config)
+
+        status_infos = {}
+        for provider_name, instance_configs in provider_configs.items():
+            InstanceManagerClass = InstanceManagerFactory.get_class(provider_name)
+            provider_infos = InstanceManagerClass.get_instances_status_info(project_config, instance_configs)
+            for instance_config, status_info in zip(instance_configs, provider_infos):
+                status_infos[instance_config['name']] = dict(name=instance_config['name'], provider=provider_name,
+                                                             **status_info)
+
+        status_infos = [status_infos[instance_config['name']] for instance_config in project_config.instances]
+
+        if args.json:
+            output.write(json.dumps(status_infos, indent=2))
+        else:
+            output.write(_render_status_table(status_infos))
+
     def _run(self, instance_manager: AbstractInstanceManager, args: Namespace, output: AbstractOutputWriter):
-        output.write(instance_manager.get_status_text())
+        if args.json:
+            status_info = dict(name=instance_manager.instance_config.name,
+                               provider=instance_manager.instance_config.provider_name,
+                               **instance_manager.get_status_info())
+            output.write(json.dumps(status_info, indent=2))
+        else:
+            output.write(instance_manager.get_status_text())
+
+
+def _render_status_table(status_infos: list) -> str:
+    table = [('Instance', 'Provider', 'State', 'Location', 'Type', 'IP Address', 'Price')]
+    errors = []
+    for status_info in status_infos:
+        price = ''
+        if status_info.get('price') is not None:
+            price = '$%.04f' % status_info['price']
+            if status_info.get('purchasing_option'):
+                price += ' (%s)' % status_info['purchasing_option']
+
+        table.append((
+            status_info['name'],
+            status_info['provider'],
+            status_info['state'],
+            status_info.get('location') or '',
+            status_info.get('instance_type') or '',
+            status_info.get('ip_address') or '',
+            price,
+        ))
+
+        if status_info.get('error'):
+            errors.append('%s: %s' % (status_info['name'], status_info['error']))
+
+    res = render_table(table, separate_title=True)
+    if errors:
+        res += '\n\nErrors:\n' + '\n'.join(errors)
+
+    return res
@@ -1,7 +1,8 @@
-from argparse import Namespace
+from argparse import Namespace, ArgumentParser
 from spotty.commands.abstract_config_command import AbstractConfigCommand
 from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
 from spotty.deployment.abstract_instance_manager import AbstractInstanceManager
+from spotty.deployment.utils.jobs import Job
 
 
 class StopCommand(AbstractConfigCommand):
@@ -16,6 +17,30 @@ class StopCommand(AbstractConfigCommand):
     #                         help='Shutdown the instance without terminating it. Deletion policies for the volumes '
     #                              'won\'t be applied.')
 
+    def configure(self, parser: ArgumentParser):
+        super().configure(parser)
+        parser.add_argument('--detach', action='store_true', help='Start terminating the instance and return '
+                                                                  'immediately. Deletion policies for the volumes '
+                                                                  'will be applied by a background job, use the '
+                                                                  '"spotty jobs" command to see its progress')
+
     def _run(self, instance_manager: AbstractInstanceManager, args: Namespace, output: AbstractOutputWriter):
+        if not args.detach:
+            instance_manager.stop(only_shutdown=False, output=output)
+            return
+
+        instance_manager.stop_detached(output)
+
+        # finish the stop in a background process
+        instance_name = instance_manager.instance_config.name
+        job = Job.create(
+            name='stop',
+            description='stopping the "%s" instance' % instance_name,
+            config_path=args.config,
+            project_dir=instance_manager.project_config.project_dir,
+            instance_name=instance_name,
+        )
+        job.start_worker()
 
-        instance_manager.stop(only_shutdown=False, output=output)
+        output.write('\nThe job "%s" will finish stopping the instance in background.\n'
+                     'Use the "spotty jobs" command to see its progress.' % job.job_id)
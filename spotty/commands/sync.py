@@ -1,12 +1,12 @@
 from argparse import Namespace, ArgumentParser
-from spotty.commands.abstract_config_command import AbstractConfigCommand
+from spotty.commands.abstract_fleet_command import AbstractFleetCommand
 from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
 from spotty.errors.instance_not_running import InstanceNotRunningError
 from spotty.errors.nothing_to_do import NothingToDoError
 from spotty.deployment.abstract_instance_manager import AbstractInstanceManager
 
 
-class SyncCommand(AbstractConfigCommand):
+class SyncCommand(AbstractFleetCommand):
 
     name = 'sync'
     description = 'Synchronize the project with the running instance'
@@ -15,7 +15,8 @@ class SyncCommand(AbstractConfigCommand):
         super().configure(parser)
         parser.add_argument('--dry-run', action='store_true', help='Show files to be synced')
 
-    def _run(self, instance_manager: AbstractInstanceManager, args: Namespace, output: AbstractOutputWriter):
+    def _run_instance(self, instance_manager: AbstractInstanceManager, args: Namespace, output: AbstractOutputWriter,
+                      fleet: bool) -> int:
         # check that the instance is started
         if not instance_manager.is_running():
             raise InstanceNotRunningError(instance_manager.instance_config.name)
@@ -26,6 +27,8 @@ class SyncCommand(AbstractConfigCommand):
                 instance_manager.sync(output, dry_run)
             except NothingToDoError as e:
                 output.write(str(e))
-                return
+                return 0
 
         output.write('Done')
+
+        return 0
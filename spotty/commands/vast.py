@@ -1,6 +1,5 @@
 from spotty.commands.abstract_provider_command import AbstractProviderCommand
-from spotty.providers.vast.commands.search_offers import SearchOfferCommand
-from spotty.providers.vast.commands.set_api_key import SetApiKey
+from spotty.commands.lazy_command import LazyCommand
 
 
 class VastCommand(AbstractProviderCommand):
@@ -8,6 +7,6 @@ class VastCommand(AbstractProviderCommand):
     name = 'vast'
     description = 'Vast.ai related commands.'
     commands = [
-        SearchOfferCommand,
-        SetApiKey,
+        LazyCommand('search-offers', 'spotty.providers.vast.commands.search_offers', 'SearchOfferCommand'),
+        LazyCommand('set-api-key', 'spotty.providers.vast.commands.set_api_key', 'SetApiKey'),
     ]
@@ -0,0 +1,26 @@
+import threading
+from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
+
+
+class PrefixedOutputWriter(AbstractOutputWriter):
+    """Writes messages to another output writer adding a prefix to each line.
+
+    Incomplete lines are buffered until the end of the line, so several writers can share
+    the same output from different threads without mixing their lines.
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, output: AbstractOutputWriter, prefix: str):
+        super().__init__()
+        self._output = output
+        self._prefix = prefix
+        self._buffer = ''
+
+    def _write(self, msg: str, newline: bool = True):
+        self._buffer += msg
+        if newline:
+            with self._lock:
+                self._output.write(self._buffer)
+
+            self._buffer = ''
@@ -22,7 +22,10 @@ class AbstractInstanceConfig(ABC):
         # set instance parameters
         self._name = instance_config['name']
         self._provider_name = instance_config['provider']
-        self._params = self._validate_instance_params(instance_config['parameters'])
+        self._params = project_config.get_cached_instance_params(self._name)
+        if self._params is None:
+            self._params = self._validate_instance_params(instance_config['parameters'])
+            project_config.cache_instance_params(self._name, self._params)
 
         # get container config
         container_configs = filter_list(project_config.containers, 'name', self.container_name)
@@ -0,0 +1,99 @@
+import hashlib
+import json
+import logging
+import os
+from typing import List
+import spotty
+from spotty.configuration import get_spotty_cache_dir
+
+
+class ConfigCache(object):
+    """On-disk cache for a merged and validated project configuration.
+
+    The cache is keyed by the content of the configuration files and the Spotty version,
+    so any change in the files invalidates it. It contains the validated project config
+    and validated parameters of the instances that were used so far.
+    """
+
+    def __init__(self, config_paths: List[str]):
+        self._key = self._get_key(config_paths)
+        self._cache_path = os.path.join(get_spotty_cache_dir('config'),
+                                        hashlib.sha1(config_paths[0].encode('utf-8')).hexdigest() + '.json')
+        self._data = None
+
+    @staticmethod
+    def _get_key(config_paths: List[str]) -> str:
+        key_hash = hashlib.sha256(spotty.__version__.encode('utf-8'))
+        for config_path in config_paths:
+            key_hash.update(config_path.encode('utf-8'))
+            with open(config_path, 'rb') as f:
+                key_hash.update(hashlib.sha256(f.read()).digest())
+
+        return key_hash.hexdigest()
+
+    def get_config(self) -> dict:
+        """Returns a validated project config or None if the cache is missing or outdated."""
+        try:
+            with open(self._cache_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if data.get('key') != self._key:
+            return None
+
+        self._data = data
+
+        return self._copy(data['config'])
+
+    def set_config(self, config: dict):
+        """Saves a validated project config, previously cached instance parameters are discarded."""
+        try:
+            self._data = {
+                'key': self._key,
+                'config': self._copy(config),
+                'instance_params': {},
+            }
+        except (TypeError, ValueError) as e:
+            # the config contains values that cannot be serialized
+            logging.debug('Couldn\'t cache the config: ' + str(e))
+            self._data = None
+            return
+
+        self._save()
+
+    def get_instance_params(self, instance_name: str) -> dict:
+        """Returns validated instance parameters or None if they were not cached yet."""
+        if not self._data or (instance_name not in self._data['instance_params']):
+            return None
+
+        return self._copy(self._data['instance_params'][instance_name])
+
+    def set_instance_params(self, instance_name: str, params: dict):
+        """Saves validated parameters of the instance."""
+        if not self._data:
+            return
+
+        try:
+            self._data['instance_params'][instance_name] = self._copy(params)
+        except (TypeError, ValueError) as e:
+            logging.debug('Couldn\'t cache the instance parameters: ' + str(e))
+            return
+
+        self._save()
+
+    @staticmethod
+    def _copy(data):
+        return json.loads(json.dumps(data))
+
+    def _save(self):
+        tmp_path = '%s.%d.tmp' % (self._cache_path, os.getpid())
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(self._data, f)
+
+            os.replace(tmp_path, self._cache_path)
+        except OSError as e:
+            logging.debug('Couldn\'t save the config cache: ' + str(e))
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
@@ -1,6 +1,7 @@
 import os
 from collections import namedtuple
 import yaml
+from spotty.config.config_cache import ConfigCache
 from spotty.config.project_config import ProjectConfig
 from spotty.config.validation import DEFAULT_CONTAINER_NAME
 
@@ -9,7 +10,13 @@ DEFAULT_CONFIG_FILENAME = 'spotty.yaml'
 OVERRIDE_CONFIG_FILENAME = 'spotty.override.yaml'
 
 
-def load_config(config_path: str = None) -> ProjectConfig:
+def load_config(config_path: str = None, use_cache: bool = True) -> ProjectConfig:
+    """Reads, merges and validates the configuration files.
+
+    Args:
+        config_path: A path to the configuration file.
+        use_cache: Use the validated config from the cache if the configuration files didn't change.
+    """
     # get project directory
     if not config_path:
         config_path = DEFAULT_CONFIG_FILENAME
@@ -25,18 +32,30 @@ def load_config(config_path: str = None) -> ProjectConfig:
     # get the project directory
     project_dir = os.path.dirname(config_abs_path)
 
+    # get a path to the override config if it exists
+    config_paths = [config_abs_path]
+    if os.path.basename(config_abs_path) == DEFAULT_CONFIG_FILENAME:
+        override_config_abs_path = os.path.join(project_dir, OVERRIDE_CONFIG_FILENAME)
+        if os.path.isfile(override_config_abs_path):
+            config_paths.append(override_config_abs_path)
+
+    # use the validated config from the cache
+    config_cache = ConfigCache(config_paths) if use_cache else None
+    if config_cache:
+        config = config_cache.get_config()
+        if config is not None:
+            return ProjectConfig(config, project_dir, config_cache=config_cache, validated=True)
+
     # read the config
     config = _read_yaml(config_abs_path)
 
     # update the config if an override config exists
-    if os.path.basename(config_abs_path) == DEFAULT_CONFIG_FILENAME:
-        override_config_abs_path = os.path.join(project_dir, OVERRIDE_CONFIG_FILENAME)
-        if os.path.isfile(override_config_abs_path):
-            override_config = _read_yaml(override_config_abs_path)
-            config = _merge_configs(config, override_config)
+    if len(config_paths) > 1:
+        override_config = _read_yaml(config_paths[1])
+        config = _merge_configs(config, override_config)
 
     # get project configuration
-    project_config = ProjectConfig(config, project_dir)
+    project_config = ProjectConfig(config, project_dir, config_cache=config_cache)
 
     return project_config
 
@@ -27,6 +27,11 @@ class ContainerConfig(object):
     def file(self) -> str:
         return self._config['file']
 
+    @property
+    def image_registry(self) -> str:
+        """A repository in a Docker registry to cache images built from the Dockerfile."""
+        return self._config['imageRegistry']
+
     @property
     def run_as_host_user(self) -> str:
         return self._config['runAsHostUser']
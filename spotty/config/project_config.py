@@ -1,14 +1,19 @@
+from spotty.config.config_cache import ConfigCache
 from spotty.config.validation import validate_basic_config
 
 
 class ProjectConfig(object):
 
-    def __init__(self, config: dict, project_dir: str):
+    def __init__(self, config: dict, project_dir: str, config_cache: ConfigCache = None, validated: bool = False):
         # validate the config
-        config = validate_basic_config(config)
+        if not validated:
+            config = validate_basic_config(config)
+            if config_cache:
+                config_cache.set_config(config)
 
         self._project_dir = project_dir
         self._config = config
+        self._config_cache = config_cache
 
     @property
     def project_dir(self) -> str:
@@ -33,3 +38,15 @@ class ProjectConfig(object):
     @property
     def scripts(self) -> dict:
         return self._config['scripts']
+
+    def get_cached_instance_params(self, instance_name: str) -> dict:
+        """Returns validated instance parameters from the cache or None if they were not cached."""
+        if not self._config_cache:
+            return None
+
+        return self._config_cache.get_instance_params(instance_name)
+
+    def cache_instance_params(self, instance_name: str, params: dict):
+        """Saves validated instance parameters to the cache."""
+        if self._config_cache:
+            self._config_cache.set_instance_params(instance_name, params)
@@ -26,6 +26,8 @@ def validate_basic_config(data):
                                                   error='Path to the Dockerfile should be relative to the '
                                                         'project\'s root directory.'),
                                               ),
+            Optional('imageRegistry', default=''): And(str, Regex(r'^[\w\.\/:-]*$',
+                                                                  error='Invalid name for an image registry')),
             Optional('runAsHostUser', default=False): bool,
             Optional('volumeMounts', default=[]): (And(
                 [{
@@ -61,6 +63,8 @@ def validate_basic_config(data):
         },
         And(lambda x: x['image'] or x['file'], error='Either "image" or "file" should be specified.'),
         And(lambda x: not (x['image'] and x['file']), error='"image" and "file" cannot be specified together.'),
+        And(lambda x: not (x['imageRegistry'] and not x['file']),
+            error='"imageRegistry" can be used only together with the "file" parameter.'),
         And(lambda x: not (x['hostNetwork'] and x['ports']),
             error='Published ports and the host network mode cannot be used together.'),
     )
@@ -17,3 +17,42 @@ def get_spotty_keys_dir(provider_name: str):
         os.makedirs(path, mode=0o755, exist_ok=True)
 
     return path
+
+
+def get_spotty_cache_dir(subdir: str = ''):
+    """Spotty cache directory."""
+    path = os.path.join(get_spotty_config_dir(), 'cache')
+    if subdir:
+        path = os.path.join(path, subdir)
+
+    if not os.path.isdir(path):
+        os.makedirs(path, mode=0o755, exist_ok=True)
+
+    return path
+
+
+def get_spotty_ssh_dir():
+    """A directory for SSH ControlMaster sockets."""
+    path = os.path.join(get_spotty_config_dir(), 'ssh')
+    if not os.path.isdir(path):
+        os.makedirs(path, mode=0o700, exist_ok=True)
+
+    return path
+
+
+def get_spotty_jobs_dir():
+    """A directory for the records of the background jobs."""
+    path = os.path.join(get_spotty_config_dir(), 'jobs')
+    if not os.path.isdir(path):
+        os.makedirs(path, mode=0o755, exist_ok=True)
+
+    return path
+
+
+def get_spotty_state_dir():
+    """A directory for the local state of the instances."""
+    path = os.path.join(get_spotty_config_dir(), 'state')
+    if not os.path.isdir(path):
+        os.makedirs(path, mode=0o755, exist_ok=True)
+
+    return path
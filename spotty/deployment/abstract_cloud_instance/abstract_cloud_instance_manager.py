@@ -1,4 +1,5 @@
 import logging
+import subprocess
 from abc import ABC, abstractmethod
 from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
 from spotty.config.project_config import ProjectConfig
@@ -6,8 +7,18 @@ from spotty.deployment.abstract_cloud_instance.abstract_data_transfer import Abs
 from spotty.deployment.abstract_cloud_instance.abstract_instance_deployment import AbstractInstanceDeployment
 from spotty.deployment.abstract_cloud_instance.abstract_bucket_manager import AbstractBucketManager
 from spotty.deployment.abstract_cloud_instance.errors.bucket_not_found import BucketNotFoundError
+from spotty.deployment.abstract_cloud_instance.resources.abstract_instance import AbstractInstance
+from spotty.deployment.abstract_cloud_instance.sync_manifest import SyncManifest, get_changes, get_file_entries
+from spotty.deployment.utils.sync_filters import list_local_files
+from spotty.errors.nothing_to_do import NothingToDoError
 from spotty.errors.instance_not_running import InstanceNotRunningError
 from spotty.deployment.abstract_ssh_instance_manager import AbstractSshInstanceManager
+from spotty.providers.remote.helpers.rsync import check_rsync_installed, get_upload_command
+
+
+# maximum number of changed files that are synced with the instance one by one,
+# if more files were changed, the whole project is synced with the bucket
+MAX_PARTIAL_SYNC_FILES = 1000
 
 
 class AbstractCloudInstanceManager(AbstractSshInstanceManager, ABC):
@@ -18,6 +29,8 @@ class AbstractCloudInstanceManager(AbstractSshInstanceManager, ABC):
         self._bucket_manager = self._get_bucket_manager()
         self._data_transfer = self._get_data_transfer()
         self._instance_deployment = self._get_instance_deployment()
+        self._sync_manifest = SyncManifest(self.instance_config.provider_name, self.instance_config.name,
+                                           self.data_transfer.local_project_dir)
 
     @abstractmethod
     def _get_bucket_manager(self) -> AbstractBucketManager:
@@ -68,6 +81,12 @@ class AbstractCloudInstanceManager(AbstractSshInstanceManager, ABC):
                     if res != 'y':
                         raise ValueError('The operation was cancelled.')
 
+                    # apply the new configuration to the running instance if it can be kept
+                    if self._update_instance(output):
+                        output.write('The instance was updated, restarting the container...')
+                        self.start_container(output)
+                        return
+
                     # terminating the instance to make EBS volumes available (the stack will be deleted later)
                     output.write('Terminating the instance... ', newline=False)
                     instance.terminate()
@@ -77,6 +96,10 @@ class AbstractCloudInstanceManager(AbstractSshInstanceManager, ABC):
                     # TODO: restart the instance if it stopped
                     pass
 
+        # the new instance doesn't have the synced files
+        if not dry_run:
+            self._sync_manifest.delete()
+
         # create or get existing bucket for the project
         bucket_name = None
         try:
@@ -95,7 +118,25 @@ class AbstractCloudInstanceManager(AbstractSshInstanceManager, ABC):
             dry_run=dry_run,
         )
 
+    def _update_instance(self, output: AbstractOutputWriter) -> bool:
+        """Tries to update the running instance instead of recreating it."""
+        try:
+            bucket_name = self.bucket_manager.get_bucket().name
+        except BucketNotFoundError:
+            return False
+
+        return self.instance_deployment.update(
+            container_commands=self.container_commands,
+            bucket_name=bucket_name,
+            data_transfer=self.data_transfer,
+            output=output,
+        )
+
     def stop(self, only_shutdown: bool, output: AbstractOutputWriter):
+        self._sync_manifest.delete()
+        self.close_ssh_connections()
+        self.delete_ssh_endpoint()
+
         if only_shutdown:
             output.write('Shutting down the instance... ', newline=False)
             self.instance_deployment.get_instance().stop()
@@ -104,19 +145,56 @@ class AbstractCloudInstanceManager(AbstractSshInstanceManager, ABC):
             # delete the stack and apply deletion policies
             self.instance_deployment.delete(output)
 
+    def stop_detached(self, output: AbstractOutputWriter):
+        self._sync_manifest.delete()
+        self.close_ssh_connections()
+        self.delete_ssh_endpoint()
+
+        # start deleting the instance, deletion policies will be applied by a background job
+        self.instance_deployment.delete(output, wait=False)
+
+    def finish_stop(self, output: AbstractOutputWriter):
+        self.instance_deployment.finish_delete(output)
+
     def clean(self, output: AbstractOutputWriter):
         pass
 
     def sync(self, output: AbstractOutputWriter, dry_run=False):
+        if self.instance_config.sync_mode == 'direct':
+            # the bucket is updated only when the instance is started
+            self._sync_direct(output, dry_run)
+            return
+
         # get the project bucket name
         bucket_name = self.bucket_manager.get_bucket().name
 
-        # sync the project with the S3 bucket
+        # find the files that were changed since the last sync using the local manifest
+        manifest_args = (bucket_name, self.data_transfer.host_project_dir, self.data_transfer.sync_filters)
+        local_files = list_local_files(self.data_transfer.local_project_dir, self.data_transfer.sync_filters)
+        synced_files = self._sync_manifest.get_files(*manifest_args) if self.data_transfer.supports_partial_sync \
+            else None
+
+        if synced_files is not None:
+            changed_paths, deleted_paths, files = get_changes(local_files, synced_files)
+            if not changed_paths and not deleted_paths:
+                if not dry_run:
+                    self._sync_manifest.save(*manifest_args, files)
+
+                raise NothingToDoError('Nothing to sync. The project files were not changed since the last sync.')
+
+            if len(changed_paths) + len(deleted_paths) <= MAX_PARTIAL_SYNC_FILES:
+                self._sync_files(bucket_name, changed_paths, deleted_paths, output, dry_run)
+                if not dry_run:
+                    self._sync_manifest.save(*manifest_args, files)
+
+                return
+
+        # sync the project with the bucket
         output.write('Syncing the project with the bucket...')
-        self.data_transfer.upload_local_to_bucket(bucket_name, dry_run=dry_run)
+        self.data_transfer.upload_local_to_bucket(bucket_name, output=output, dry_run=dry_run)
 
         if not dry_run:
-            # sync the S3 bucket with the instance
+            # sync the bucket with the instance
             output.write('Syncing the bucket with the instance...')
             remote_cmd = self.data_transfer.get_download_bucket_to_instance_command(
                 bucket_name=bucket_name,
@@ -129,6 +207,64 @@ class AbstractCloudInstanceManager(AbstractSshInstanceManager, ABC):
             if exit_code != 0:
                 raise ValueError('Failed to download files from the bucket to the instance')
 
+            # the next sync will transfer only the files changed after this listing
+            self._sync_manifest.save(*manifest_args, get_file_entries(local_files))
+
+    def _sync_direct(self, output: AbstractOutputWriter, dry_run=False):
+        """Pushes the changed files straight to the instance using rsync over SSH."""
+        output.write('Syncing files with the instance...')
+
+        # check rsync is installed
+        check_rsync_installed()
+
+        # the files on the instance will differ from the ones in the manifest
+        if not dry_run:
+            self._sync_manifest.delete()
+
+        endpoint, control_path = self.get_ssh_connection()
+        rsync_cmd = get_upload_command(
+            local_dir=self.project_config.project_dir,
+            remote_dir=self.instance_config.host_project_dir,
+            ssh_user=endpoint['user'],
+            ssh_host=endpoint['host'],
+            ssh_key_path=self.ssh_key_path,
+            ssh_port=endpoint['port'],
+            filters=self.project_config.sync_filters,
+            use_sudo=(not self.instance_config.container_config.run_as_host_user),
+            dry_run=dry_run,
+            ssh_control_path=control_path,
+            # files deleted or renamed locally are deleted from the instance as in the other sync modes
+            delete=True,
+        )
+
+        # execute the command locally
+        logging.debug('rsync command: ' + rsync_cmd)
+        exit_code = subprocess.call(rsync_cmd, shell=True)
+        if exit_code != 0:
+            raise ValueError('Failed to upload files to the instance.')
+
+    def _sync_files(self, bucket_name: str, changed_paths: list, deleted_paths: list, output: AbstractOutputWriter,
+                    dry_run=False):
+        """Syncs only the specified files with the bucket and the instance."""
+        output.write('Syncing %d changed and %d deleted file(s) with the bucket...'
+                     % (len(changed_paths), len(deleted_paths)))
+        self.data_transfer.upload_files_to_bucket(bucket_name, changed_paths, deleted_paths, output=output,
+                                                  dry_run=dry_run)
+
+        if not dry_run:
+            output.write('Syncing the bucket with the instance...')
+            remote_cmd = self.data_transfer.get_download_files_to_instance_command(
+                bucket_name=bucket_name,
+                download_paths=changed_paths,
+                delete_paths=deleted_paths,
+                use_sudo=(not self.instance_config.container_config.run_as_host_user),
+            )
+            logging.debug('Remote sync command: ' + remote_cmd)
+
+            exit_code = self.exec(remote_cmd)
+            if exit_code != 0:
+                raise ValueError('Failed to download files from the bucket to the instance')
+
     def download(self, download_filters: list, output: AbstractOutputWriter, dry_run=False):
         # get the project bucket name
         bucket_name = self.bucket_manager.get_bucket().name
@@ -151,7 +287,8 @@ class AbstractCloudInstanceManager(AbstractSshInstanceManager, ABC):
         if not dry_run:
             # sync the project with the S3 bucket
             output.write('Downloading files from the bucket to local...')
-            self.data_transfer.download_bucket_to_local(bucket_name=bucket_name, download_filters=download_filters)
+            self.data_transfer.download_bucket_to_local(bucket_name=bucket_name, download_filters=download_filters,
+                                                        output=output)
 
     @property
     def ssh_host(self):
@@ -159,11 +296,36 @@ class AbstractCloudInstanceManager(AbstractSshInstanceManager, ABC):
         if self._instance_config.local_ssh_port:
             return '127.0.0.1'
 
-        # get a public IP address of the running instance
-        instance = self.instance_deployment.get_instance()
+        return self._get_instance_ip_address(self._get_running_instance())
+
+    def _get_ssh_endpoint(self, instance: AbstractInstance = None) -> dict:
+        if self._instance_config.local_ssh_port:
+            return super()._get_ssh_endpoint(instance)
+
+        # the instance is requested only once to get both its IP address and its ID
+        instance = self._get_running_instance(instance)
+
+        return {
+            'host': self._get_instance_ip_address(instance),
+            'port': self.ssh_port,
+            'user': self.ssh_user,
+            'instance_id': instance.instance_id,
+            'container_name': self.instance_config.full_container_name,
+        }
+
+    def _get_running_instance(self, instance: AbstractInstance = None) -> AbstractInstance:
+        """Requests the instance, unless it's provided, and checks that it's running."""
+        if not instance:
+            instance = self.instance_deployment.get_instance()
+
         if not instance or not instance.is_running:
             raise InstanceNotRunningError(self.instance_config.name)
 
+        return instance
+
+    @staticmethod
+    def _get_instance_ip_address(instance: AbstractInstance) -> str:
+        """Returns a public IP address of the instance or a private one if the instance doesn't have it."""
         instance_ip_address = instance.public_ip_address if instance.public_ip_address else instance.private_ip_address
         if not instance_ip_address:
             raise ValueError('Instance IP address not found')
@@ -1,4 +1,6 @@
 from abc import ABC, abstractmethod
+from typing import List
+from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
 
 
 class AbstractDataTransfer(ABC):
@@ -13,6 +15,18 @@ class AbstractDataTransfer(ABC):
     def instance_name(self):
         return self._instance_name
 
+    @property
+    def local_project_dir(self) -> str:
+        return self._local_project_dir
+
+    @property
+    def host_project_dir(self) -> str:
+        return self._host_project_dir
+
+    @property
+    def sync_filters(self) -> list:
+        return self._sync_filters
+
     @property
     @abstractmethod
     def scheme_name(self) -> str:
@@ -27,12 +41,29 @@ class AbstractDataTransfer(ABC):
         return '%s://%s/download/instance-%s' % (self.scheme_name, bucket_name, self.instance_name)
 
     @abstractmethod
-    def upload_local_to_bucket(self, bucket_name: str, dry_run: bool = False):
+    def upload_local_to_bucket(self, bucket_name: str, output: AbstractOutputWriter, dry_run: bool = False):
         """Uploads files from local to the bucket."""
         raise NotImplementedError
 
+    @property
+    def supports_partial_sync(self) -> bool:
+        """Whether the data transfer can sync only the specified files with the instance."""
+        return False
+
+    def upload_files_to_bucket(self, bucket_name: str, upload_paths: List[str], delete_paths: List[str],
+                               output: AbstractOutputWriter, dry_run: bool = False):
+        """Uploads the specified project files to the bucket and deletes the objects of the deleted files."""
+        raise NotImplementedError
+
+    def get_download_files_to_instance_command(self, bucket_name: str, download_paths: List[str],
+                                               delete_paths: List[str], use_sudo: bool = False) -> str:
+        """A remote command to download the specified files from the bucket to the instance
+        and to delete the deleted files.
+        """
+        raise NotImplementedError
+
     @abstractmethod
-    def download_bucket_to_local(self, bucket_name: str, download_filters: list):
+    def download_bucket_to_local(self, bucket_name: str, download_filters: list, output: AbstractOutputWriter):
         """Downloads files from the bucket to local."""
         raise NotImplementedError
 
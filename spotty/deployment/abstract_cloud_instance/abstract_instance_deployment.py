@@ -26,7 +26,24 @@ class AbstractInstanceDeployment(ABC):
         """Deploys or redeploys the instance."""
         raise NotImplementedError
 
+    def update(self, container_commands: AbstractContainerCommands, bucket_name: str,
+               data_transfer: AbstractDataTransfer, output: AbstractOutputWriter) -> bool:
+        """Applies the configuration to the running instance if it doesn't require to recreate it.
+
+        Returns:
+            True if the instance was updated, False if it should be redeployed.
+        """
+        return False
+
     @abstractmethod
-    def delete(self, output: AbstractOutputWriter):
-        """Deletes the stack with the instance and applies deletion policies for the volumes."""
+    def delete(self, output: AbstractOutputWriter, wait: bool = True):
+        """Deletes the stack with the instance and applies deletion policies for the volumes.
+
+        If "wait" is False, the method only starts deleting the instance, the rest of the work
+        should be done by the "finish_delete" method.
+        """
         raise NotImplementedError
+
+    def finish_delete(self, output: AbstractOutputWriter):
+        """Finishes the deletion started with the "wait=False" argument."""
+        pass
@@ -0,0 +1,15 @@
+import os
+import chevron
+from spotty.deployment.abstract_cloud_instance.file_structure import BOOTSTRAP_STEPS_DIR
+
+
+def get_bootstrap_steps_script() -> str:
+    """Returns a script with helper functions to run instance bootstrap steps concurrently.
+
+    Startup scripts source it to start slow independent steps (installing packages, pulling
+    the Docker image) in background and to wait for them only when their results are needed.
+    """
+    with open(os.path.join(os.path.dirname(__file__), 'data', 'bootstrap_steps.sh')) as f:
+        content = f.read()
+
+    return chevron.render(content, {'BOOTSTRAP_STEPS_DIR': BOOTSTRAP_STEPS_DIR})
@@ -0,0 +1,42 @@
+#!/bin/bash
+#
+# Helpers to run independent bootstrap steps in background:
+#   start_step NAME COMMAND - starts the command in background and returns immediately,
+#   wait_step NAME          - waits for the step to finish, prints its log and returns its exit code
+#                             (returns 0 immediately if the step was not started).
+
+BOOTSTRAP_STEPS_DIR='{{BOOTSTRAP_STEPS_DIR}}'
+
+start_step() {
+  local NAME=$1
+  local COMMAND=$2
+
+  mkdir -p "$BOOTSTRAP_STEPS_DIR"
+  rm -f "$BOOTSTRAP_STEPS_DIR/$NAME.exit"
+  touch "$BOOTSTRAP_STEPS_DIR/$NAME.started"
+
+  # the output is redirected, so the parent script doesn't wait for the step
+  (
+    EXIT_CODE=0
+    /bin/bash -xe -c "$COMMAND" > "$BOOTSTRAP_STEPS_DIR/$NAME.log" 2>&1 || EXIT_CODE=$?
+    echo $EXIT_CODE > "$BOOTSTRAP_STEPS_DIR/$NAME.exit.tmp"
+    mv "$BOOTSTRAP_STEPS_DIR/$NAME.exit.tmp" "$BOOTSTRAP_STEPS_DIR/$NAME.exit"
+  ) < /dev/null > /dev/null 2>&1 &
+}
+
+wait_step() {
+  local NAME=$1
+
+  if [ ! -f "$BOOTSTRAP_STEPS_DIR/$NAME.started" ]; then
+    return 0
+  fi
+
+  while [ ! -f "$BOOTSTRAP_STEPS_DIR/$NAME.exit" ]; do
+    sleep 1
+  done
+
+  echo "Output of the \"$NAME\" step:"
+  cat "$BOOTSTRAP_STEPS_DIR/$NAME.log"
+
+  return "$(cat "$BOOTSTRAP_STEPS_DIR/$NAME.exit")"
+}
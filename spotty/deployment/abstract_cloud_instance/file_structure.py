@@ -19,3 +19,9 @@ INSTANCE_STARTUP_SCRIPTS_DIR = INSTANCE_SCRIPTS_DIR + '/startup'
 
 # a path to the script that attaches user to the container
 CONTAINER_BASH_SCRIPT_PATH = INSTANCE_SCRIPTS_DIR + '/container_bash.sh'
+
+# a script with helper functions to run bootstrap steps in background
+BOOTSTRAP_STEPS_SCRIPT_PATH = INSTANCE_SCRIPTS_DIR + '/bootstrap_steps.sh'
+
+# a directory with logs and exit codes of the bootstrap steps
+BOOTSTRAP_STEPS_DIR = INSTANCE_DIR + '/steps'
@@ -3,6 +3,10 @@ from abc import ABC
 
 class AbstractInstance(ABC):
 
+    @property
+    def instance_id(self):
+        raise NotImplementedError
+
     @property
     def public_ip_address(self):
         raise NotImplementedError
@@ -0,0 +1,19 @@
+from spotty.deployment.abstract_cloud_instance.file_structure import BOOTSTRAP_STEPS_SCRIPT_PATH
+from spotty.deployment.container.docker.scripts.start_container_script import StartContainerScript
+
+
+class CloudStartContainerScript(StartContainerScript):
+    """Starts the container on a cloud instance.
+
+    The image is pulled in background by one of the previous bootstrap steps, so the script waits
+    for that step first: its output gets to the startup logs and, if it failed, the image is pulled
+    again before the container is started.
+    """
+
+    def _partials(self) -> dict:
+        return {
+            **super()._partials(),
+            'before_start': 'source "%s"\n'
+                            'wait_step pull_image || echo \'Failed to pull the image in background.\'\n'
+                            % BOOTSTRAP_STEPS_SCRIPT_PATH,
+        }
@@ -0,0 +1,116 @@
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, List
+from spotty.configuration import get_spotty_cache_dir
+from spotty.deployment.utils.sync_filters import LocalFile
+
+
+class SyncManifest(object):
+    """A local record of the project files that were synced with the instance.
+
+    For each file it keeps the size, the modification time and the MD5 hash of the content
+    (the hash is computed only for the files that were changed since the manifest was created).
+    It allows to find changed files using only "stat" calls and to sync only those files
+    with the instance instead of comparing the whole project with the bucket.
+
+    The manifest is bound to the project directory, the instance, the bucket and the sync
+    filters, if any of them changes, the manifest is ignored.
+    """
+
+    def __init__(self, provider_name: str, instance_name: str, local_project_dir: str):
+        manifest_id = '%s:%s:%s' % (provider_name, instance_name, os.path.abspath(local_project_dir))
+        self._manifest_path = os.path.join(get_spotty_cache_dir('sync'),
+                                           hashlib.sha1(manifest_id.encode('utf-8')).hexdigest() + '.json')
+
+    @staticmethod
+    def _get_key(bucket_name: str, host_project_dir: str, sync_filters: list) -> str:
+        return hashlib.sha256(json.dumps([bucket_name, host_project_dir, sync_filters]).encode('utf-8')).hexdigest()
+
+    def get_files(self, bucket_name: str, host_project_dir: str, sync_filters: list) -> Dict[str, dict]:
+        """Returns the synced files or None if the manifest doesn't exist or outdated.
+
+        Returns:
+            A dictionary where keys are paths relative to the project directory and
+            values are dictionaries with the "size", "mtime" and "md5" keys.
+        """
+        try:
+            with open(self._manifest_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if data.get('key') != self._get_key(bucket_name, host_project_dir, sync_filters):
+            return None
+
+        return data['files']
+
+    def save(self, bucket_name: str, host_project_dir: str, sync_filters: list, files: Dict[str, dict]):
+        """Saves the synced files."""
+        data = {
+            'key': self._get_key(bucket_name, host_project_dir, sync_filters),
+            'files': files,
+        }
+
+        tmp_path = '%s.%d.tmp' % (self._manifest_path, os.getpid())
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+
+            os.replace(tmp_path, self._manifest_path)
+        except OSError as e:
+            logging.debug('Couldn\'t save the sync manifest: ' + str(e))
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def delete(self):
+        """Deletes the manifest, so the next sync will compare all the files."""
+        if os.path.exists(self._manifest_path):
+            os.unlink(self._manifest_path)
+
+
+def get_file_entries(local_files: Dict[str, LocalFile]) -> Dict[str, dict]:
+    """Returns manifest entries for the local files (without hashes)."""
+    return {rel_path: {'size': local_file.size, 'mtime': local_file.mtime, 'md5': None}
+            for rel_path, local_file in local_files.items()}
+
+
+def get_changes(local_files: Dict[str, LocalFile], synced_files: Dict[str, dict]) \
+        -> (List[str], List[str], Dict[str, dict]):
+    """Compares the local files with the synced ones.
+
+    A file is unchanged if its size and modification time match the manifest. Otherwise,
+    if the hash of the synced file is known, the content of the file is compared with it.
+
+    Returns:
+        A tuple of changed (including new) paths, deleted paths and updated manifest entries.
+    """
+    changed_paths = []
+    files = {}
+    for rel_path, local_file in sorted(local_files.items()):
+        synced_file = synced_files.get(rel_path)
+        entry = {'size': local_file.size, 'mtime': local_file.mtime, 'md5': None}
+
+        if synced_file and (synced_file['size'] == local_file.size) and (synced_file['mtime'] == local_file.mtime):
+            # fast path: the file wasn't modified
+            entry['md5'] = synced_file['md5']
+        else:
+            entry['md5'] = _get_md5(local_file.path)
+            if not synced_file or (synced_file['size'] != local_file.size) or (synced_file['md5'] != entry['md5']):
+                changed_paths.append(rel_path)
+
+        files[rel_path] = entry
+
+    deleted_paths = sorted(set(synced_files) - set(local_files))
+
+    return changed_paths, deleted_paths, files
+
+
+def _get_md5(file_path: str) -> str:
+    md5 = hashlib.md5()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            md5.update(chunk)
+
+    return md5.hexdigest()
@@ -36,7 +36,7 @@ class AbstractDockerInstanceManager(AbstractInstanceManager, ABC):
             pass
 
         # generate a script that starts container
-        start_container_script = StartContainerScript(self.container_commands).render()
+        start_container_script = self._get_start_container_script().render()
         start_container_command = get_script_command('start-container', start_container_script)
 
         # start the container
@@ -44,6 +44,9 @@ class AbstractDockerInstanceManager(AbstractInstanceManager, ABC):
         if exit_code != 0:
             raise ValueError('Failed to start the container')
 
+    def _get_start_container_script(self) -> StartContainerScript:
+        return StartContainerScript(self.container_commands)
+
     def start(self, output: AbstractOutputWriter, dry_run=False):
         # start or restart container
         self.start_container(output, dry_run=dry_run)
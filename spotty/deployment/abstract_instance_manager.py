@@ -1,9 +1,12 @@
 import subprocess
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
 from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
 from spotty.config.abstract_instance_config import AbstractInstanceConfig
 from spotty.config.project_config import ProjectConfig
 from spotty.deployment.container.abstract_container_commands import AbstractContainerCommands
+from spotty.deployment.utils.cli import call_with_output
 
 
 class AbstractInstanceManager(ABC):
@@ -36,6 +39,11 @@ class AbstractInstanceManager(ABC):
         """Checks if the instance is running."""
         raise NotImplementedError
 
+    def is_reachable(self) -> bool:
+        """Checks if the instance is running before connecting to it. Instance managers can avoid
+        API calls here by using a cached state of the instance."""
+        return self.is_running()
+
     @abstractmethod
     def start(self, output: AbstractOutputWriter, dry_run=False):
         """Creates a stack with the instance."""
@@ -51,8 +59,24 @@ class AbstractInstanceManager(ABC):
         """Deletes the stack."""
         raise NotImplementedError
 
-    def exec(self, command: str, tty: bool = True) -> int:
-        """Executes a command on the host OS."""
+    def stop_detached(self, output: AbstractOutputWriter):
+        """Starts deleting the instance. The rest of the work is done by the "finish_stop" method
+        in a background job."""
+        raise ValueError('The "%s" provider doesn\'t support detached stopping.' % self.instance_config.provider_name)
+
+    def finish_stop(self, output: AbstractOutputWriter):
+        """Finishes the work started by the "stop_detached" method."""
+        raise NotImplementedError
+
+    def exec(self, command: str, tty: bool = True, output: AbstractOutputWriter = None) -> int:
+        """Executes a command on the host OS.
+
+        If an output writer is provided, the output of the command is written to it line by line
+        instead of the terminal.
+        """
+        if output:
+            return call_with_output(command, output)
+
         return subprocess.call(command, shell=True)
 
     @abstractmethod
@@ -78,6 +102,34 @@ class AbstractInstanceManager(ABC):
         """
         raise NotImplementedError
 
+    def get_status_info(self) -> dict:
+        """Returns information about the instance for the "spotty status --all" command.
+
+        Returns:
+            A dictionary with the "state" key and optional "location", "instance_type", "ip_address",
+            "purchasing_option" and "price" keys.
+        """
+        return {'state': 'running' if self.is_running() else 'not running'}
+
+    @classmethod
+    def get_instances_status_info(cls, project_config: ProjectConfig, instance_configs: List[dict]) -> List[dict]:
+        """Returns information about several instances of the provider.
+
+        Providers can override it to get the information for all the instances with batched API calls.
+        If the information for an instance can't be retrieved, its dictionary contains the "error" key.
+        """
+        # instance managers are created in the main thread, because creating boto3 clients is not thread-safe
+        instance_managers = [cls(project_config, instance_config) for instance_config in instance_configs]
+
+        def get_status_info(instance_manager: AbstractInstanceManager) -> dict:
+            try:
+                return instance_manager.get_status_info()
+            except Exception as e:
+                return {'state': 'unknown', 'error': str(e)}
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            return list(executor.map(get_status_info, instance_managers))
+
     @property
     def use_tmux(self) -> bool:
         """Use tmux when running a custom script or connecting to the instance."""
@@ -1,22 +1,142 @@
 import logging
 import os
 from abc import abstractmethod
+from typing import Tuple
+from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
 from spotty.deployment.utils.commands import get_ssh_command
+from spotty.deployment.utils.endpoint_cache import EndpointCache
+from spotty.deployment.utils.ssh_master import get_control_path, start_master, close_masters, \
+    is_control_master_supported
 from spotty.deployment.abstract_docker_instance_manager import AbstractDockerInstanceManager
+from spotty.errors.host_unreachable import HostUnreachableError
+from spotty.errors.instance_not_running import InstanceNotRunningError
 
 
 class AbstractSshInstanceManager(AbstractDockerInstanceManager):
 
-    def exec(self, command: str, tty: bool = True) -> int:
+    def exec(self, command: str, tty: bool = True, output: AbstractOutputWriter = None) -> int:
         """Executes a command on the host OS."""
         if not os.path.isfile(self.ssh_key_path):
             raise ValueError('SSH key doesn\'t exist: ' + self.ssh_key_path)
 
-        ssh_command = get_ssh_command(self.ssh_host, self.ssh_port, self.ssh_user, self.ssh_key_path,
-                                      command, env_vars=self.ssh_env_vars, tty=tty)
+        endpoint, control_path = self.get_ssh_connection()
+        ssh_command = get_ssh_command(endpoint['host'], endpoint['port'], endpoint['user'], self.ssh_key_path,
+                                      command, env_vars=self.ssh_env_vars, tty=tty, control_path=control_path)
         logging.debug('SSH command: ' + ssh_command)
 
-        return super().exec(ssh_command)
+        return super().exec(ssh_command, output=output)
+
+    def is_reachable(self) -> bool:
+        """Checks if the instance is running. An instance with a cached SSH endpoint is considered running,
+        if it's not, the endpoint is refreshed once the connection fails."""
+        if EndpointCache().get_endpoint(self._ssh_instance_key):
+            return True
+
+        return self.is_running()
+
+    def update_ssh_endpoint(self, instance=None) -> dict:
+        """Resolves the SSH endpoint of the instance using the provider's API and caches it.
+
+        Args:
+            instance: The instance if it was already requested from the provider's API.
+        """
+        endpoint = self._get_ssh_endpoint(instance)
+        EndpointCache().set_endpoint(self._ssh_instance_key, **endpoint)
+
+        return endpoint
+
+    def delete_ssh_endpoint(self):
+        EndpointCache().delete_endpoint(self._ssh_instance_key)
+
+    def refresh_ssh_endpoint(self, instance):
+        """Updates the cached SSH endpoint using the instance that was already requested from
+        the provider's API. The endpoint is deleted if the instance doesn't exist, is not running
+        or doesn't have an IP address yet.
+        """
+        if not instance:
+            self.delete_ssh_endpoint()
+            return
+
+        try:
+            self.update_ssh_endpoint(instance)
+        except (InstanceNotRunningError, ValueError):
+            self.delete_ssh_endpoint()
+
+    def _get_ssh_endpoint(self, instance=None) -> dict:
+        """Returns the SSH endpoint of the instance.
+
+        Args:
+            instance: The instance if it was already requested from the provider's API.
+
+        Returns:
+            A dictionary with the "host", "port", "user", "instance_id" and "container_name" keys.
+        """
+        return {
+            'host': self.ssh_host,
+            'port': self.ssh_port,
+            'user': self.ssh_user,
+            'instance_id': None,
+            'container_name': self.instance_config.full_container_name,
+        }
+
+    def get_ssh_connection(self) -> Tuple[dict, str]:
+        """Returns the SSH endpoint of the instance and a path to the control socket of the shared connection.
+
+        The cached endpoint is used if the connection to it can be established, otherwise the endpoint
+        is resolved again, as the instance could be restarted with a different IP address.
+
+        Raises:
+            HostUnreachableError: If the instance cannot be reached.
+        """
+        endpoint = EndpointCache().get_endpoint(self._ssh_instance_key)
+        if endpoint:
+            try:
+                control_path = self.get_ssh_control_path(endpoint)
+                if control_path or not is_control_master_supported():
+                    return endpoint, control_path
+            except HostUnreachableError as e:
+                logging.debug(str(e))
+
+            logging.debug('Couldn\'t connect to the cached SSH endpoint, refreshing it.')
+
+        endpoint = self.update_ssh_endpoint()
+
+        return endpoint, self.get_ssh_control_path(endpoint)
+
+    def get_ssh_control_path(self, endpoint: dict) -> str:
+        """Starts a shared SSH connection to the instance if it's not running yet and returns
+        a path to its control socket. All SSH commands and rsync reuse this connection.
+
+        Returns:
+            A path to the control socket or None if the connection cannot be shared.
+
+        Raises:
+            HostUnreachableError: If the instance cannot be reached, so a plain SSH connection
+                would fail as well.
+        """
+        if not is_control_master_supported():
+            return None
+
+        host, port, user = endpoint['host'], endpoint['port'], endpoint['user']
+        control_path = get_control_path(self._ssh_instance_key, user, host, port)
+        if not start_master(control_path, user, host, port, self.ssh_key_path):
+            logging.debug('Couldn\'t start an SSH master connection.')
+            return None
+
+        return control_path
+
+    def close_ssh_connections(self) -> int:
+        """Closes shared SSH connections to the instance.
+
+        Returns:
+            The number of closed connections.
+        """
+        return close_masters(self._ssh_instance_key)
+
+    @property
+    def _ssh_instance_key(self) -> str:
+        return '%s:%s:%s' % (self.instance_config.provider_name, self.project_config.project_name,
+                             self.instance_config.name)
 
     @property
     @abstractmethod
@@ -21,8 +21,23 @@ class DockerCommands(AbstractContainerCommands):
 
         return build_cmd
 
-    def pull(self) -> str:
-        return 'docker pull ' + self._instance_config.container_config.image
+    def pull(self, image_name: str = None) -> str:
+        image_name = image_name if image_name else self._instance_config.container_config.image
+
+        return 'docker pull ' + image_name
+
+    def push(self, image_name: str) -> str:
+        return 'docker push ' + image_name
+
+    def image_exists(self, image_name: str) -> str:
+        return 'docker image inspect %s > /dev/null 2>&1' % image_name
+
+    def remove_images(self, repository: str, tag_prefix: str, keep_image_name: str) -> str:
+        """Removes images of the repository which tags start with the prefix, except the specified one."""
+        list_cmd = 'docker images --format %s %s' % (shlex.quote('{{.Repository}}:{{.Tag}}'), repository)
+
+        return '%s | grep -F "%s:%s" | grep -vxF "%s" | xargs -r docker rmi > /dev/null 2>&1 || true' \
+               % (list_cmd, repository, tag_prefix, keep_image_name)
 
     def run(self, image_name: str = None) -> str:
         image_name = image_name if image_name else self._instance_config.container_config.image
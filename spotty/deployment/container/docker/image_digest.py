@@ -0,0 +1,184 @@
+import hashlib
+import json
+import logging
+import os
+import re
+from typing import List, Tuple
+from spotty.configuration import get_spotty_cache_dir
+from spotty.deployment.utils.sync_filters import is_path_included, is_dir_excluded
+
+
+def get_build_context_digest(project_dir: str, dockerfile_path: str, sync_filters: List[dict] = None) -> str:
+    """Returns a digest of the Docker build context.
+
+    The build context is the directory with the Dockerfile. The files excluded by the ".dockerignore"
+    file are not taken into account. If sync filters are provided, only the files that are synced
+    with the instance are taken into account, as the image is built from the synced copy of the project.
+    The Dockerfile itself is always included. Hashes of the files are cached locally and recomputed
+    only for the files which size or modification time changed.
+
+    Args:
+        project_dir: Local project directory.
+        dockerfile_path: Path to the Dockerfile relative to the project directory.
+        sync_filters: Project sync filters. If it's None, the files are not filtered.
+    """
+    dockerfile_path = dockerfile_path.strip('/')
+    context_rel_dir = os.path.dirname(dockerfile_path)
+    context_dir = os.path.join(project_dir, context_rel_dir)
+    context_prefix = (context_rel_dir + '/') if context_rel_dir else ''
+
+    ignore_patterns = read_dockerignore(context_dir)
+    has_exceptions = any(negate for _, negate in ignore_patterns)
+
+    file_hashes = _FileHashes(context_dir)
+    files = []
+    for root, dir_names, file_names in os.walk(context_dir, followlinks=True):
+        rel_root = os.path.relpath(root, context_dir).replace(os.sep, '/')
+        rel_root = '' if rel_root == '.' else rel_root + '/'
+
+        # skip directories that are not synced or ignored by Docker
+        dir_names[:] = sorted(dir_name for dir_name in dir_names
+                              if not is_dir_excluded(context_prefix + rel_root + dir_name, sync_filters)
+                              and (has_exceptions or not is_dockerignored(rel_root + dir_name, ignore_patterns)))
+
+        for file_name in sorted(file_names):
+            rel_path = rel_root + file_name
+            if (context_prefix + rel_path) != dockerfile_path:
+                if not is_path_included(context_prefix + rel_path, sync_filters) \
+                        or is_dockerignored(rel_path, ignore_patterns):
+                    continue
+
+            file_hash = file_hashes.get_hash(rel_path)
+            if file_hash is not None:
+                files.append((rel_path, file_hash))
+
+    file_hashes.save()
+
+    return hashlib.sha256(json.dumps([dockerfile_path, files]).encode('utf-8')).hexdigest()
+
+
+def read_dockerignore(context_dir: str) -> List[Tuple[str, bool]]:
+    """Reads patterns from the ".dockerignore" file.
+
+    Returns:
+        A list of tuples with a pattern and a flag if it's an exception (starts with "!").
+    """
+    patterns = []
+    try:
+        with open(os.path.join(context_dir, '.dockerignore'), 'r') as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return patterns
+
+    for line in lines:
+        pattern = line.strip()
+        if not pattern or pattern.startswith('#'):
+            continue
+
+        negate = pattern.startswith('!')
+        if negate:
+            pattern = pattern[1:].strip()
+
+        pattern = os.path.normpath(pattern.strip('/')).replace(os.sep, '/')
+        if pattern and (pattern != '.'):
+            patterns.append((pattern, negate))
+
+    return patterns
+
+
+def is_dockerignored(path: str, patterns: List[Tuple[str, bool]]) -> bool:
+    """Checks if a path is excluded from the build context by the ".dockerignore" patterns.
+
+    A pattern that matches a directory excludes all its content, the last matching pattern wins.
+    """
+    parts = path.split('/')
+    paths = ['/'.join(parts[:i]) for i in range(1, len(parts) + 1)]
+
+    ignored = False
+    for pattern, negate in patterns:
+        regex = _translate_pattern(pattern)
+        if any(regex.match(sub_path) for sub_path in paths):
+            ignored = not negate
+
+    return ignored
+
+
+def _translate_pattern(pattern: str):
+    """Translates a ".dockerignore" pattern to a regular expression: "*" and "?" don't match
+    the "/" character, "**" matches any number of directories."""
+    regex = ''
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith('**/', i):
+            regex += '(?:.*/)?'
+            i += 3
+        elif pattern.startswith('**', i):
+            regex += '.*'
+            i += 2
+        elif pattern[i] == '*':
+            regex += '[^/]*'
+            i += 1
+        elif pattern[i] == '?':
+            regex += '[^/]'
+            i += 1
+        else:
+            regex += re.escape(pattern[i])
+            i += 1
+
+    return re.compile(regex + '$')
+
+
+class _FileHashes(object):
+    """Local cache for the hashes of the build context files."""
+
+    def __init__(self, context_dir: str):
+        self._context_dir = context_dir
+        self._cache_path = os.path.join(get_spotty_cache_dir('docker'), hashlib.sha1(
+            os.path.abspath(context_dir).encode('utf-8')).hexdigest() + '.json')
+
+        try:
+            with open(self._cache_path, 'r') as f:
+                self._cached_hashes = json.load(f)
+        except (OSError, ValueError):
+            self._cached_hashes = {}
+
+        self._hashes = {}
+
+    def get_hash(self, rel_path: str) -> str:
+        """Returns a SHA-256 hash of the file or None if the file doesn't exist."""
+        file_path = os.path.join(self._context_dir, rel_path)
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            # broken symlink or the file was deleted
+            return None
+
+        cached_entry = self._cached_hashes.get(rel_path)
+        if cached_entry and (cached_entry[0] == stat.st_size) and (cached_entry[1] == stat.st_mtime):
+            file_hash = cached_entry[2]
+        else:
+            sha256 = hashlib.sha256()
+            with open(file_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    sha256.update(chunk)
+
+            file_hash = sha256.hexdigest()
+
+        self._hashes[rel_path] = [stat.st_size, stat.st_mtime, file_hash]
+
+        return file_hash
+
+    def save(self):
+        if self._hashes == self._cached_hashes:
+            return
+
+        tmp_path = '%s.%d.tmp' % (self._cache_path, os.getpid())
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(self._hashes, f)
+
+            os.replace(tmp_path, self._cache_path)
+        except OSError as e:
+            logging.debug('Couldn\'t save the build context hashes: ' + str(e))
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
@@ -2,6 +2,8 @@
 
 {{bash_flags}}
 
+{{> before_start}}
+
 if {{{is_created_cmd}}}; then
   printf 'Removing existing container... '
   {{{remove_cmd}}}
@@ -11,8 +13,22 @@ fi
 {{> before_image_build}}
 
 {{#build_image_cmd}}
-echo 'Building Docker image...'
-{{{build_image_cmd}}}
+if {{{image_exists_cmd}}}; then
+  echo 'Docker image is up to date.'
+{{#registry_pull_cmd}}
+elif {{{registry_pull_cmd}}} > /dev/null 2>&1; then
+  echo 'Docker image was pulled from the registry.'
+{{/registry_pull_cmd}}
+else
+  echo 'Building Docker image...'
+  {{{build_image_cmd}}}
+{{#registry_push_cmd}}
+  {{{registry_push_cmd}}} > /dev/null || echo 'Failed to push the image to the registry.'
+{{/registry_push_cmd}}
+fi
+
+# remove images built for the previous versions of the Dockerfile
+{{{remove_old_images_cmd}}}
 {{/build_image_cmd}}
 
 {{> before_container_run}}
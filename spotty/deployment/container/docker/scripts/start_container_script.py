@@ -1,14 +1,27 @@
 import os
-import time
 import chevron
+from spotty.deployment.container.docker.docker_commands import DockerCommands
+from spotty.deployment.container.docker.image_digest import get_build_context_digest
 from spotty.deployment.utils.commands import get_script_command
 from spotty.deployment.container.docker.scripts.abstract_docker_script import AbstractDockerScript
 
 
 class StartContainerScript(AbstractDockerScript):
 
+    def __init__(self, container_commands: DockerCommands, use_sync_filters: bool = True):
+        """
+        Args:
+            container_commands: Docker commands for the instance.
+            use_sync_filters: Whether the files excluded by the "syncFilters" parameter are excluded
+                from the build context digest. It should be False if the image is built from the
+                project directory itself, not from its synced copy.
+        """
+        super().__init__(container_commands)
+        self._use_sync_filters = use_sync_filters
+
     def _partials(self) -> dict:
         return {
+            'before_start': '',
             'before_image_build': '',
             'before_container_run': '',
             'before_startup_commands': '',
@@ -21,10 +34,20 @@ class StartContainerScript(AbstractDockerScript):
             template = f.read()
 
         # generate "docker build" command if necessary
+        image_exists_cmd = ''
+        registry_pull_cmd = ''
+        registry_push_cmd = ''
+        remove_old_images_cmd = ''
         if self.commands.instance_config.dockerfile_path:
-            image_name = '%s:%d' % (self.commands.instance_config.full_container_name, time.time())
+            repository, tag_prefix, image_name = self._get_image_name()
+            image_exists_cmd = self.commands.image_exists(image_name)
             build_image_cmd = self.commands.build(image_name)
             pull_image_cmd = ''
+            remove_old_images_cmd = self.commands.remove_images(repository, tag_prefix, image_name)
+
+            if self.commands.instance_config.container_config.image_registry:
+                registry_pull_cmd = self.commands.pull(image_name)
+                registry_push_cmd = self.commands.push(image_name)
         else:
             image_name = self.commands.instance_config.container_config.image
             build_image_cmd = ''
@@ -42,7 +65,11 @@ class StartContainerScript(AbstractDockerScript):
             'bash_flags': 'set -xe' if print_trace else 'set -e',
             'is_created_cmd': self.commands.is_created(),
             'remove_cmd': self.commands.remove(),
+            'image_exists_cmd': image_exists_cmd,
+            'registry_pull_cmd': registry_pull_cmd,
             'build_image_cmd': build_image_cmd,
+            'registry_push_cmd': registry_push_cmd,
+            'remove_old_images_cmd': remove_old_images_cmd,
             'pull_image_cmd': pull_image_cmd,
             'tmp_container_dir': self.commands.instance_config.host_container_dir,
             'start_container_cmd': self.commands.run(image_name),
@@ -50,3 +77,31 @@ class StartContainerScript(AbstractDockerScript):
         }, partials_dict=self._partials())
 
         return content
+
+    def _get_image_name(self) -> (str, str, str):
+        """Returns a repository, a tag prefix and a full name for the image built from the Dockerfile.
+
+        The tag is a digest of the Dockerfile and the build context, so the image is rebuilt
+        only if one of them changed.
+        """
+        instance_config = self.commands.instance_config
+        project_config = instance_config.project_config
+        sync_filters = project_config.sync_filters if self._use_sync_filters else None
+        digest = get_build_context_digest(project_config.project_dir, instance_config.container_config.file,
+                                          sync_filters)
+
+        # the same repository in a registry can be used by several containers
+        if instance_config.container_config.image_registry:
+            repository = instance_config.container_config.image_registry
+            tag_prefix = instance_config.full_container_name + '-'
+        else:
+            repository = instance_config.full_container_name
+            tag_prefix = ''
+
+        tag = tag_prefix + digest[:16]
+
+        # the image depends on the build arguments that are resolved on the host OS
+        if instance_config.container_config.run_as_host_user:
+            tag += '-$(id -u %s)-$(id -g %s)' % (instance_config.user, instance_config.user)
+
+        return repository, tag_prefix, '%s:%s' % (repository, tag)
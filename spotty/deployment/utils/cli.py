@@ -1,4 +1,6 @@
 import shlex
+import subprocess
+from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
 
 
 def shlex_join(split_command: list):
@@ -6,3 +8,17 @@ def shlex_join(split_command: list):
     Copy-pasted from the Python 3.8 code.
     """
     return ' '.join(shlex.quote(arg) for arg in split_command)
+
+
+def call_with_output(command: str, output: AbstractOutputWriter) -> int:
+    """Runs a shell command and writes its STDOUT and STDERR to the output writer line by line.
+
+    Returns:
+        The exit code of the command.
+    """
+    process = subprocess.Popen(command, shell=True, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                               stderr=subprocess.STDOUT)
+    for line in iter(process.stdout.readline, b''):
+        output.write(line.decode('utf-8', errors='replace').rstrip('\r\n'))
+
+    return process.wait()
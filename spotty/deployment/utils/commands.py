@@ -80,10 +80,18 @@ def get_tmux_session_command(command: str, session_name: str, window_name: str =
 
 
 def get_ssh_command(host: str, port: int, user: str, key_path: str, command: str, env_vars: dict = None,
-                    tty: bool = True, quiet: bool = False) -> str:
+                    tty: bool = True, quiet: bool = False, control_path: str = None, batch_mode: bool = False) -> str:
 
     ssh_command = 'ssh -i %s -o StrictHostKeyChecking=no -o ConnectTimeout=10' % shlex.quote(key_path)
 
+    # fail instead of asking for a password or a passphrase
+    if batch_mode:
+        ssh_command += ' -o BatchMode=yes'
+
+    # reuse the master connection (if the socket doesn't exist, SSH connects directly)
+    if control_path:
+        ssh_command += ' -o ControlPath=%s' % shlex.quote(control_path)
+
     if tty:
         ssh_command += ' -t'
 
@@ -0,0 +1,79 @@
+import json
+import logging
+import os
+import threading
+import time
+from spotty.configuration import get_spotty_state_dir
+
+
+# an endpoint is reused only for a short time, a failed connection refreshes it earlier
+ENDPOINT_CACHE_TTL = 600
+
+
+class EndpointCache(object):
+    """On-disk cache for the SSH endpoints of the running instances.
+
+    Each endpoint contains a host, a port, a user, an instance ID and a container name. Endpoints
+    are keyed by the instance and expire after the TTL. The cache is shared by all providers and
+    all Spotty commands, so commands that only connect to the instance don't make cloud API calls.
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, ttl: int = ENDPOINT_CACHE_TTL):
+        self._ttl = ttl
+        self._cache_path = os.path.join(get_spotty_state_dir(), 'endpoints.json')
+
+    def _load(self) -> dict:
+        try:
+            with open(self._cache_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, data: dict):
+        tmp_path = '%s.%d.tmp' % (self._cache_path, os.getpid())
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+
+            os.replace(tmp_path, self._cache_path)
+        except OSError as e:
+            logging.debug('Couldn\'t save the endpoints cache: ' + str(e))
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def get_endpoint(self, key: str) -> dict:
+        """Returns the endpoint or None if it's not cached or expired."""
+        with self._lock:
+            entry = self._load().get(key)
+
+        if not entry or (time.time() - entry['timestamp'] > self._ttl):
+            return None
+
+        return entry
+
+    def set_endpoint(self, key: str, host: str, port: int, user: str, instance_id=None, container_name: str = None):
+        with self._lock:
+            data = self._load()
+
+            # remove expired entries
+            now = time.time()
+            data = {key: entry for key, entry in data.items() if now - entry['timestamp'] <= self._ttl}
+            data[key] = {
+                'host': host,
+                'port': port,
+                'user': user,
+                'instance_id': instance_id,
+                'container_name': container_name,
+                'timestamp': now,
+            }
+
+            self._save(data)
+
+    def delete_endpoint(self, key: str):
+        with self._lock:
+            data = self._load()
+            if key in data:
+                del data[key]
+                self._save(data)
@@ -0,0 +1,76 @@
+import logging
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatchcase
+from typing import Callable, List
+from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
+from spotty.commands.writers.prefixed_output_writrer import PrefixedOutputWriter
+from spotty.deployment.abstract_instance_manager import AbstractInstanceManager
+
+
+def is_instance_pattern(instance_name: str) -> bool:
+    """Checks if the instance name is a glob pattern."""
+    return any(char in instance_name for char in '*?[')
+
+
+def select_instances(instances: List[dict], instance_names: List[str], select_all: bool = False) -> List[dict]:
+    """Returns configurations of the instances selected by names or glob patterns.
+
+    Args:
+        instances: Instance configurations from the configuration file.
+        instance_names: Instance names or glob patterns (for example, "worker-*").
+        select_all: Select all instances.
+    """
+    if select_all:
+        if instance_names:
+            raise ValueError('Instance names cannot be used with the "--all" option.')
+
+        return list(instances)
+
+    selected_names = set()
+    for instance_name in instance_names:
+        matched_names = {instance['name'] for instance in instances if fnmatchcase(instance['name'], instance_name)}
+        if not matched_names:
+            if is_instance_pattern(instance_name):
+                raise ValueError('No instances match the "%s" pattern.' % instance_name)
+
+            raise ValueError('Instance "%s" not found in the configuration file' % instance_name)
+
+        selected_names |= matched_names
+
+    # keep the order of the configuration file
+    return [instance for instance in instances if instance['name'] in selected_names]
+
+
+def run_on_instances(instance_managers: List[AbstractInstanceManager],
+                     func: Callable[[AbstractInstanceManager, AbstractOutputWriter], int],
+                     output: AbstractOutputWriter, max_workers: int = 8) -> List[int]:
+    """Runs a function for several instances concurrently.
+
+    The output of each instance is written to the output writer line by line with the instance name
+    as a prefix. If the function raises an error, the error is written to the output and the exit code
+    for the instance is 1.
+
+    Args:
+        instance_managers: Instance managers.
+        func: A function that accepts an instance manager and an output writer and returns an exit code.
+        output: Output writer.
+        max_workers: Maximum number of instances that are processed at the same time.
+
+    Returns:
+        Exit codes for the instances.
+    """
+    name_length = max(len(instance_manager.instance_config.name) for instance_manager in instance_managers)
+
+    def run(instance_manager: AbstractInstanceManager) -> int:
+        prefix = ('[%s]' % instance_manager.instance_config.name).ljust(name_length + 2) + ' '
+        instance_output = PrefixedOutputWriter(output, prefix)
+        try:
+            return func(instance_manager, instance_output)
+        except Exception as e:
+            logging.debug(traceback.format_exc())
+            instance_output.write('Error: ' + str(e))
+            return 1
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(run, instance_managers))
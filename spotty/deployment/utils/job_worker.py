@@ -0,0 +1,60 @@
+"""Runs a background job in a detached process: python -m spotty.deployment.utils.job_worker JOB_ID"""
+
+import logging
+import os
+import sys
+import traceback
+from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
+from spotty.commands.writers.output_writrer import OutputWriter
+from spotty.config.config_utils import load_config, DEFAULT_CONFIG_FILENAME
+from spotty.deployment.abstract_instance_manager import AbstractInstanceManager
+from spotty.deployment.utils.jobs import Job
+from spotty.providers.instance_manager_factory import InstanceManagerFactory
+
+
+def get_instance_manager(job: Job) -> AbstractInstanceManager:
+    """Creates an instance manager for the job's instance."""
+    config_path = job.config_path if job.config_path else os.path.join(job.project_dir, DEFAULT_CONFIG_FILENAME)
+    project_config = load_config(config_path)
+
+    instance_configs = [instance_config for instance_config in project_config.instances
+                        if instance_config['name'] == job.instance_name]
+    if not instance_configs:
+        raise ValueError('Instance "%s" not found in the configuration file' % job.instance_name)
+
+    return InstanceManagerFactory.get_instance(project_config, instance_configs[0])
+
+
+def run_job(job: Job, output: AbstractOutputWriter):
+    if job.name == 'stop':
+        get_instance_manager(job).finish_stop(output)
+    else:
+        raise ValueError('Unknown job: "%s".' % job.name)
+
+
+def main(job_id: str) -> int:
+    logging.basicConfig(level=logging.WARNING, format='[%(levelname)s] %(message)s')
+
+    job = Job.get(job_id)
+    if not job:
+        return 1
+
+    output = OutputWriter()
+    try:
+        run_job(job, output)
+    except Exception as e:
+        logging.debug(traceback.format_exc())
+        output.write('Error:\n'
+                     '------\n'
+                     '%s' % str(e))
+        job.set_status(Job.STATUS_FAILED, error=str(e))
+        return 1
+
+    output.write('The job is done.')
+    job.set_status(Job.STATUS_DONE)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1]))
@@ -0,0 +1,227 @@
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+import uuid
+from typing import List
+from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
+from spotty.configuration import get_spotty_jobs_dir
+
+
+# a job without a PID is considered starting during this time (in seconds)
+JOB_START_GRACE_PERIOD = 30
+
+
+class Job(object):
+    """A record of a background job.
+
+    A job is a part of a command that continues in a detached worker process after the command
+    returns (for example, applying deletion policies after "spotty stop --detach"). The record is
+    stored in the "~/.spotty/jobs" directory as a JSON file, the output of the worker is written
+    to a log file next to it. If the worker process dies, the job is resumed by the next Spotty
+    command that uses a project configuration.
+    """
+
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+
+    def __init__(self, job_data: dict):
+        self._data = job_data
+
+    @staticmethod
+    def create(name: str, description: str, config_path: str, project_dir: str, instance_name: str) -> 'Job':
+        """Creates a new job record in the "running" status."""
+        now = time.time()
+        job = Job({
+            'id': '%s-%s' % (time.strftime('%Y%m%d%H%M%S', time.localtime(now)), uuid.uuid4().hex[:6]),
+            'name': name,
+            'description': description,
+            'config_path': os.path.abspath(config_path) if config_path else None,
+            'project_dir': os.path.abspath(project_dir),
+            'instance_name': instance_name,
+            'status': Job.STATUS_RUNNING,
+            'error': None,
+            'pid': None,
+            'created_at': now,
+            'updated_at': now,
+        })
+        job.save()
+
+        return job
+
+    @staticmethod
+    def get(job_id: str) -> 'Job':
+        """Returns a job by its ID or None if the job doesn't exist."""
+        try:
+            with open(os.path.join(get_spotty_jobs_dir(), job_id + '.json'), 'r') as f:
+                return Job(json.load(f))
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def get_all() -> List['Job']:
+        """Returns all jobs sorted by the creation time."""
+        jobs = []
+        for file_name in os.listdir(get_spotty_jobs_dir()):
+            if file_name.endswith('.json'):
+                job = Job.get(file_name[:-len('.json')])
+                if job:
+                    jobs.append(job)
+
+        return sorted(jobs, key=lambda job: job.created_at)
+
+    @property
+    def job_id(self) -> str:
+        return self._data['id']
+
+    @property
+    def name(self) -> str:
+        return self._data['name']
+
+    @property
+    def description(self) -> str:
+        return self._data['description']
+
+    @property
+    def config_path(self) -> str:
+        return self._data['config_path']
+
+    @property
+    def project_dir(self) -> str:
+        return self._data['project_dir']
+
+    @property
+    def instance_name(self) -> str:
+        return self._data['instance_name']
+
+    @property
+    def status(self) -> str:
+        return self._data['status']
+
+    @property
+    def error(self) -> str:
+        return self._data['error']
+
+    @property
+    def pid(self) -> int:
+        return self._data['pid']
+
+    @property
+    def created_at(self) -> float:
+        return self._data['created_at']
+
+    @property
+    def updated_at(self) -> float:
+        return self._data['updated_at']
+
+    @property
+    def log_path(self) -> str:
+        return os.path.join(get_spotty_jobs_dir(), self.job_id + '.log')
+
+    @property
+    def is_running(self) -> bool:
+        return self.status == Job.STATUS_RUNNING
+
+    @property
+    def is_starting(self) -> bool:
+        """The worker process is being started, but its PID is not saved yet."""
+        return self.is_running and not self.pid and (time.time() - self.updated_at <= JOB_START_GRACE_PERIOD)
+
+    @property
+    def is_interrupted(self) -> bool:
+        """The job is not finished, but its worker process is not running anymore."""
+        return self.is_running and not self.is_starting and not (self.pid and _is_process_alive(self.pid))
+
+    def is_for_instance(self, project_dir: str, instance_name: str) -> bool:
+        return (self.project_dir == os.path.abspath(project_dir)) and (self.instance_name == instance_name)
+
+    def set_pid(self, pid: int):
+        # the worker could already update the record
+        job = Job.get(self.job_id)
+        if job:
+            self._data = job._data
+
+        self._data['pid'] = pid
+        self.save()
+
+    def set_status(self, status: str, error: str = None):
+        self._data['status'] = status
+        self._data['error'] = error
+        self.save()
+
+    def save(self):
+        self._data['updated_at'] = time.time()
+
+        job_path = os.path.join(get_spotty_jobs_dir(), self.job_id + '.json')
+        tmp_path = '%s.%d.tmp' % (job_path, os.getpid())
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(self._data, f)
+
+            os.replace(tmp_path, job_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def delete(self):
+        for path in [os.path.join(get_spotty_jobs_dir(), self.job_id + '.json'), self.log_path]:
+            if os.path.exists(path):
+                os.unlink(path)
+
+    def start_worker(self):
+        """Starts a detached process that runs the job."""
+        # reset the PID of the previous worker, so other commands don't resume the job in the meantime
+        self.set_pid(None)
+
+        with open(self.log_path, 'a') as log_file:
+            process = subprocess.Popen([sys.executable, '-m', 'spotty.deployment.utils.job_worker', self.job_id],
+                                       stdin=subprocess.DEVNULL, stdout=log_file, stderr=subprocess.STDOUT,
+                                       start_new_session=True)
+
+        self.set_pid(process.pid)
+
+    def get_log_tail(self, num_lines: int = 5) -> List[str]:
+        """Returns the last lines of the job's log."""
+        try:
+            with open(self.log_path, 'r') as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return []
+
+        return [line for line in lines if line.strip()][-num_lines:]
+
+
+def get_running_jobs(project_dir: str, instance_name: str) -> List[Job]:
+    """Returns unfinished jobs for the instance."""
+    return [job for job in Job.get_all() if job.is_running and job.is_for_instance(project_dir, instance_name)]
+
+
+def resume_interrupted_jobs(output: AbstractOutputWriter) -> List[Job]:
+    """Restarts workers of the jobs that were interrupted."""
+    jobs = [job for job in Job.get_all() if job.is_interrupted]
+    for job in jobs:
+        output.write('Resuming the job "%s" (%s)...' % (job.job_id, job.description))
+        try:
+            job.start_worker()
+        except OSError as e:
+            logging.debug('Couldn\'t start a worker for the job "%s": %s' % (job.job_id, str(e)))
+
+    return jobs
+
+
+def _is_process_alive(pid: int) -> bool:
+    if os.name == 'nt':
+        # "os.kill" terminates the process on Windows, so the worker is considered alive
+        return True
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+    return True
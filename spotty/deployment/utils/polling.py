@@ -0,0 +1,27 @@
+from time import sleep
+
+
+class AdaptiveDelay(object):
+    """Delay between polling requests that grows while nothing changes.
+
+    The first checks are made quickly, so short operations are detected as soon as they're finished,
+    then the delay grows up to the maximum value to not waste API requests on long operations.
+    Once a progress is detected, the delay should be reset.
+    """
+
+    def __init__(self, initial: float = 1, maximum: float = 10, factor: float = 1.5):
+        self._initial = initial
+        self._maximum = maximum
+        self._factor = factor
+        self._delay = initial
+
+    @property
+    def delay(self) -> float:
+        return self._delay
+
+    def sleep(self):
+        sleep(self._delay)
+        self._delay = min(self._delay * self._factor, self._maximum)
+
+    def reset(self):
+        self._delay = self._initial
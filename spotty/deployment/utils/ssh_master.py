@@ -0,0 +1,117 @@
+import glob
+import hashlib
+import logging
+import os
+import subprocess
+import sys
+from spotty.configuration import get_spotty_ssh_dir
+from spotty.errors.host_unreachable import HostUnreachableError
+
+
+# how long (in seconds) an idle master connection stays open
+CONTROL_PERSIST_SECS = 600
+
+# SSH errors meaning that the host cannot be reached, so a plain SSH connection would fail as well
+NETWORK_ERRORS = [
+    'Connection timed out',
+    'Operation timed out',
+    'Connection refused',
+    'No route to host',
+    'Network is unreachable',
+    'Host is down',
+    'Could not resolve hostname',
+]
+
+
+def is_control_master_supported() -> bool:
+    """OpenSSH for Windows doesn't support connection multiplexing."""
+    return sys.platform != 'win32'
+
+
+def get_control_path(instance_key: str, user: str, host: str, port: int) -> str:
+    """Returns a path to the ControlMaster socket for the instance.
+
+    The socket name consists of a hash of the instance key and a hash of the connection
+    parameters, so a new master connection is created if the instance IP address changes,
+    and all the sockets of the instance can be found by the prefix. The name is short
+    because the length of a Unix socket path is limited.
+    """
+    instance_hash = hashlib.sha1(instance_key.encode('utf-8')).hexdigest()[:12]
+    connection_hash = hashlib.sha1(('%s@%s:%d' % (user, host, port)).encode('utf-8')).hexdigest()[:8]
+
+    return os.path.join(get_spotty_ssh_dir(), '%s-%s' % (instance_hash, connection_hash))
+
+
+def start_master(control_path: str, user: str, host: str, port: int, key_path: str) -> bool:
+    """Starts a background master connection if it's not running yet.
+
+    Returns:
+        True if the master connection is running.
+
+    Raises:
+        HostUnreachableError: If the host cannot be reached.
+    """
+    if os.path.exists(control_path):
+        if _run_ssh(['-O', 'check', '-o', 'ControlPath=' + control_path, host]):
+            return True
+
+        # the master process is dead, remove the stale socket
+        os.unlink(control_path)
+
+    # the master is started explicitly with detached standard streams, otherwise a master
+    # process spawned by the first SSH command would keep the output of that command open
+    args = ['-i', key_path, '-p', str(port), '-o', 'StrictHostKeyChecking=no', '-o', 'ConnectTimeout=10',
+            '-o', 'ControlMaster=yes', '-o', 'ControlPath=' + control_path,
+            '-o', 'ControlPersist=%d' % CONTROL_PERSIST_SECS, '-N', '-f', '%s@%s' % (user, host)]
+
+    logging.debug('SSH master command: ' + ' '.join(['ssh'] + args))
+    try:
+        res = subprocess.run(['ssh'] + args, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                             stderr=subprocess.PIPE)
+    except OSError as e:
+        logging.debug('Failed to run SSH: ' + str(e))
+        return False
+
+    if res.returncode != 0:
+        error = res.stderr.decode('utf-8', errors='replace').strip()
+        logging.debug('SSH master connection failed: ' + error)
+
+        # don't let the command wait for the same timeout again without the master connection
+        network_error = next((network_error for network_error in NETWORK_ERRORS if network_error in error), None)
+        if network_error:
+            raise HostUnreachableError(host, port, network_error)
+
+        return False
+
+    return True
+
+
+def close_masters(instance_key: str) -> int:
+    """Closes all master connections of the instance.
+
+    Returns:
+        The number of closed connections.
+    """
+    instance_hash = hashlib.sha1(instance_key.encode('utf-8')).hexdigest()[:12]
+    socket_paths = glob.glob(os.path.join(get_spotty_ssh_dir(), instance_hash + '-*'))
+
+    closed = 0
+    for control_path in socket_paths:
+        if _run_ssh(['-O', 'exit', '-o', 'ControlPath=' + control_path, 'localhost']):
+            closed += 1
+        elif os.path.exists(control_path):
+            os.unlink(control_path)
+
+    return closed
+
+
+def _run_ssh(args: list) -> bool:
+    logging.debug('SSH master command: ' + ' '.join(['ssh'] + args))
+    try:
+        exit_code = subprocess.call(['ssh'] + args, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                    stderr=subprocess.DEVNULL)
+    except OSError as e:
+        logging.debug('Failed to run SSH: ' + str(e))
+        return False
+
+    return exit_code == 0
@@ -0,0 +1,77 @@
+import os
+from collections import namedtuple
+from fnmatch import fnmatchcase
+from typing import Dict, List
+
+
+LocalFile = namedtuple('LocalFile', ['path', 'size', 'mtime'])
+
+
+def is_path_included(path: str, filters: List[dict]) -> bool:
+    """Checks if a file should be synced using the "aws s3 sync" filter semantics: all files
+    are included by default, filters are applied in order and the last matching filter wins.
+    The "*" character matches any sequence of characters including the "/" character.
+
+    Args:
+        path: A path relative to the sync root directory (with "/" separators).
+        filters: A list of filters, for example: [{'exclude': ['*']}, {'include': ['data/*']}].
+    """
+    included = True
+    for sync_filter in (filters or []):
+        if 'exclude' in sync_filter:
+            if included and any(fnmatchcase(path, pattern) for pattern in sync_filter['exclude']):
+                included = False
+        elif 'include' in sync_filter:
+            if not included and any(fnmatchcase(path, pattern) for pattern in sync_filter['include']):
+                included = True
+
+    return included
+
+
+def is_dir_excluded(dir_path: str, filters: List[dict]) -> bool:
+    """Checks if all files in the directory are excluded, so the directory can be skipped.
+
+    It's the case if one of the exclude patterns ending with "*" matches the directory
+    path and there are no include filters after it.
+    """
+    dir_path = dir_path.rstrip('/') + '/'
+    excluded = False
+    for sync_filter in (filters or []):
+        if 'exclude' in sync_filter:
+            if any(pattern.endswith('*') and fnmatchcase(dir_path, pattern) for pattern in sync_filter['exclude']):
+                excluded = True
+        elif 'include' in sync_filter:
+            excluded = False
+
+    return excluded
+
+
+def list_local_files(local_dir: str, filters: List[dict] = None) -> Dict[str, LocalFile]:
+    """Returns files from the local directory that match the filters.
+
+    Returns:
+        A dictionary where keys are paths relative to the local directory (with "/" separators).
+    """
+    local_files = {}
+    for root, dir_names, file_names in os.walk(local_dir, followlinks=True):
+        rel_root = os.path.relpath(root, local_dir).replace(os.sep, '/')
+        rel_root = '' if rel_root == '.' else rel_root + '/'
+
+        # skip excluded directories
+        dir_names[:] = [dir_name for dir_name in dir_names if not is_dir_excluded(rel_root + dir_name, filters)]
+
+        for file_name in file_names:
+            rel_path = rel_root + file_name
+            if not is_path_included(rel_path, filters):
+                continue
+
+            file_path = os.path.join(root, file_name)
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                # broken symlink or the file was deleted
+                continue
+
+            local_files[rel_path] = LocalFile(path=file_path, size=stat.st_size, mtime=stat.st_mtime)
+
+    return local_files
@@ -0,0 +1,80 @@
+import logging
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, List
+
+
+GraphTask = namedtuple('GraphTask', ['name', 'func', 'dependencies'])
+
+
+def graph_task(name: str, func: Callable[[dict], object], dependencies: List[str] = None) -> GraphTask:
+    """Creates a task for the "run_task_graph" function.
+
+    Args:
+        name: A unique name of the task.
+        func: A function that accepts a dictionary with results of the finished tasks.
+        dependencies: Names of the tasks that should be finished before this task is started.
+    """
+    return GraphTask(name, func, dependencies or [])
+
+
+def run_task_graph(tasks: List[GraphTask], max_workers: int = 8) -> Dict[str, object]:
+    """Runs the tasks in a thread pool, each task is started as soon as all its dependencies are finished.
+
+    If a task fails, the tasks that were not started yet are skipped and the first error
+    is raised once the running tasks are finished. Time of each task is logged at the debug level.
+
+    Returns:
+        A dictionary with the results of the tasks.
+    """
+    task_names = {task.name for task in tasks}
+    for task in tasks:
+        unknown_dependencies = set(task.dependencies) - task_names
+        if unknown_dependencies:
+            raise ValueError('Task "%s" depends on unknown tasks: %s' % (task.name, ', '.join(unknown_dependencies)))
+
+    results = {}
+    pending_tasks = list(tasks)
+    running = {}
+    error = None
+    start_time = time.time()
+
+    def run_task(task: GraphTask, task_results: dict):
+        task_start_time = time.time()
+        try:
+            return task.func(task_results)
+        finally:
+            logging.debug('Step "%s" took %.2fs' % (task.name, time.time() - task_start_time))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while pending_tasks or running:
+            # start the tasks that have all dependencies finished
+            if not error:
+                for task in list(pending_tasks):
+                    if all(dependency in results for dependency in task.dependencies):
+                        future = executor.submit(run_task, task, dict(results))
+                        running[future] = task
+                        pending_tasks.remove(task)
+
+            if not running:
+                if not error:
+                    raise ValueError('Tasks have circular dependencies: %s'
+                                     % ', '.join(task.name for task in pending_tasks))
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                task = running.pop(future)
+                try:
+                    results[task.name] = future.result()
+                except Exception as e:
+                    if not error:
+                        error = e
+
+    logging.debug('All steps took %.2fs' % (time.time() - start_time))
+
+    if error:
+        raise error
+
+    return results
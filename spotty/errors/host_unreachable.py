@@ -0,0 +1,3 @@
+class HostUnreachableError(Exception):
+    def __init__(self, host: str, port: int, reason: str):
+        super().__init__('Couldn\'t connect to the instance (%s:%d): %s' % (host, port, reason))
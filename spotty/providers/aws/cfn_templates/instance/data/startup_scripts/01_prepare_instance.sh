@@ -2,14 +2,20 @@
 
 cfn-signal -e 0 --stack ${AWS::StackName} --region ${AWS::Region} --resource PreparingInstanceSignal
 
-# install AWS CLI
+source {{BOOTSTRAP_STEPS_SCRIPT_PATH}}
+
+# install AWS CLI and jq in background, the volumes are mounted in the meantime
+# (the tools are preinstalled on the AMI created by the "spotty aws bake-ami" command)
 update-locale LANG=en_US.UTF-8 LC_ALL=en_US.UTF-8
-apt-get update && apt-get install -y python3-pip
+if [ "$(cat '{{BAKED_AMI_VERSION_FILE}}' 2> /dev/null)" == '{{BAKED_AMI_VERSION}}' ]; then
+  aws configure set default.region ${AWS::Region}
+else
+  start_step install_packages '
+apt-get update && apt-get install -y python3-pip jq
 pip3 install -U awscli
 aws configure set default.region ${AWS::Region}
-
-# install jq
-apt-get install -y jq
+'
+fi
 
 # create an alias to connect to the docker container
 CONTAINER_BASH_ALIAS=container
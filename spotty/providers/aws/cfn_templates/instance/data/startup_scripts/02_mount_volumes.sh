@@ -14,7 +14,7 @@ do
   # NVMe EBS volume (see: https://docs.aws.amazon.com/AWSEC2/latest/UserGuide/nvme-ebs-volumes.html)
   if [ ! -b $DEVICE ]; then
     VOLUME_ID=$(cfn-get-metadata --stack ${AWS::StackName} --region ${AWS::Region} --resource VolumeAttachment${!DEVICE_LETTERS[$i]^} -k VolumeId)
-    DEVICE=$(lsblk -o NAME,SERIAL -dpJ | jq -rc ".blockdevices[] | select(.serial == \"${!VOLUME_ID//-}\") | .name")
+    DEVICE=$(lsblk -o NAME,SERIAL -dpn | awk -v serial="${!VOLUME_ID//-}" '$2 == serial {print $1}')
     if [ -z "$DEVICE" ]; then
       echo "Device for the volume $VOLUME_ID not found"
       exit 1
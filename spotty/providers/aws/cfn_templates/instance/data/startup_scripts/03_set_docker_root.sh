@@ -4,7 +4,17 @@ cfn-signal -e 0 --stack ${AWS::StackName} --region ${AWS::Region} --resource Set
 
 # change docker data root directory
 if [ -n "${DockerDataRootDirectory}" ]; then
-  jq '. + { "data-root": "${DockerDataRootDirectory}" }' /etc/docker/daemon.json > /tmp/docker_daemon.json \
-    && mv /tmp/docker_daemon.json /etc/docker/daemon.json
+  python3 - /etc/docker/daemon.json "${DockerDataRootDirectory}" <<'EOF2'
+import json
+import sys
+
+with open(sys.argv[1]) as f:
+    config = json.load(f)
+
+config['data-root'] = sys.argv[2]
+
+with open(sys.argv[1], 'w') as f:
+    json.dump(config, f, indent=2)
+EOF2
   service docker restart
 fi
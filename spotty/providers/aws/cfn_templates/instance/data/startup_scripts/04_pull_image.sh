@@ -0,0 +1,8 @@
+#!/bin/bash -xe
+
+source {{BOOTSTRAP_STEPS_SCRIPT_PATH}}
+
+# start pulling the image in background, the project is synced in the meantime
+{{#PULL_IMAGE_CMD}}
+start_step pull_image '{{{PULL_IMAGE_CMD}}}'
+{{/PULL_IMAGE_CMD}}
@@ -12,5 +12,9 @@ if [ -n "${HostProjectDirectory}" ]; then
   fi
 fi
 
+# wait for AWS CLI to be installed
+source {{BOOTSTRAP_STEPS_SCRIPT_PATH}}
+wait_step install_packages
+
 # sync project files from S3 bucket to the instance
 {{{SYNC_PROJECT_CMD}}}
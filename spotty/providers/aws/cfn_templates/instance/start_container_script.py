@@ -1,7 +1,7 @@
-from spotty.deployment.container.docker.scripts.start_container_script import StartContainerScript
+from spotty.deployment.abstract_cloud_instance.start_container_script import CloudStartContainerScript
 
 
-class StartContainerScriptWithCfnSignals(StartContainerScript):
+class StartContainerScriptWithCfnSignals(CloudStartContainerScript):
 
     @staticmethod
     def _get_signal_command(resource_name: str):
@@ -9,6 +9,7 @@ class StartContainerScriptWithCfnSignals(StartContainerScript):
 
     def _partials(self) -> dict:
         return {
+            **super()._partials(),
             'before_image_build': self._get_signal_command('BuildingDockerImageSignal'),
             'before_container_run': self._get_signal_command('StartingContainerSignal'),
             'before_startup_commands': self._get_signal_command('RunningContainerStartupCommandsSignal'),
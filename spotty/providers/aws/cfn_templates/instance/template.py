@@ -1,4 +1,5 @@
-from typing import List
+from typing import Dict, List
+import copy
 import os
 import chevron
 import yaml
@@ -9,32 +10,45 @@ from spotty.config.validation import is_subdir
 from spotty.config.abstract_instance_volume import AbstractInstanceVolume
 from spotty.deployment.container.docker.docker_commands import DockerCommands
 from spotty.deployment.container.docker.scripts.container_bash_script import ContainerBashScript
+from spotty.deployment.abstract_cloud_instance.bootstrap_steps import get_bootstrap_steps_script
 from spotty.deployment.abstract_cloud_instance.file_structure import INSTANCE_SPOTTY_TMP_DIR, \
     CONTAINER_BASH_SCRIPT_PATH, \
-    INSTANCE_STARTUP_SCRIPTS_DIR, CONTAINERS_TMP_DIR
+    INSTANCE_STARTUP_SCRIPTS_DIR, CONTAINERS_TMP_DIR, BOOTSTRAP_STEPS_SCRIPT_PATH
 from spotty.providers.aws.cfn_templates.instance.start_container_script import StartContainerScriptWithCfnSignals
-from spotty.providers.aws.helpers.ami import get_ami
-from spotty.providers.aws.helpers.vpc import get_vpc_id
+from spotty.providers.aws.resources.image import Image
 from spotty.providers.aws.resources.snapshot import Snapshot
 from spotty.providers.aws.resources.volume import Volume
 from spotty.providers.aws.config.instance_config import InstanceConfig
 from spotty.providers.aws.config.ebs_volume import EbsVolume
+from spotty.providers.aws.helpers.bake_ami import BAKED_AMI_VERSION, BAKED_AMI_VERSION_FILE
 from spotty.providers.aws.helpers.logs import get_logs_s3_path
 
 
-def prepare_instance_template(ec2, instance_config: InstanceConfig, docker_commands: DockerCommands,
-                              availability_zone: str, sync_project_cmd: str, output: AbstractOutputWriter):
-    """Prepares CloudFormation template to run a Spot Instance."""
+# cfn-init configs that depend only on the container configuration
+CONTAINER_CFN_INIT_CONFIGS = ['pull_image', 'start_container']
+
+
+def prepare_instance_template(instance_config: InstanceConfig, docker_commands: DockerCommands,
+                              availability_zone: str, sync_project_cmd: str, ec2_volumes: Dict[str, Volume],
+                              snapshots: Dict[str, Snapshot], output: AbstractOutputWriter,
+                              include_volumes: bool = True):
+    """Prepares CloudFormation template to run a Spot Instance.
+
+    Args:
+        ec2_volumes: Existing EC2 volumes by their names.
+        snapshots: Existing snapshots by their names.
+        include_volumes: Add volume resources to the template. The template without volumes is used
+            only to compare it with the template of the running instance.
+    """
 
     # read and update CF template
     with open(os.path.join(os.path.dirname(__file__), 'data', 'template.yaml')) as f:
         template = yaml.load(f, Loader=CfnYamlLoader)
 
-    # get volume resources and updated availability zone
-    volume_resources = _get_volume_resources(ec2, instance_config.volumes, output)
-
     # add volume resources to the template
-    template['Resources'].update(volume_resources)
+    if include_volumes:
+        volume_resources = _get_volume_resources(instance_config.volumes, ec2_volumes, snapshots, output)
+        template['Resources'].update(volume_resources)
 
     # set availability zone
     if availability_zone:
@@ -110,12 +124,21 @@ def prepare_instance_template(ec2, instance_config: InstanceConfig, docker_comma
                     'mode': '000755',
                     'content': {
                         'Fn::Sub': _read_template_file(os.path.join('startup_scripts', '01_prepare_instance.sh'), {
+                            'BOOTSTRAP_STEPS_SCRIPT_PATH': BOOTSTRAP_STEPS_SCRIPT_PATH,
+                            'BAKED_AMI_VERSION': BAKED_AMI_VERSION,
+                            'BAKED_AMI_VERSION_FILE': BAKED_AMI_VERSION_FILE,
                             'CONTAINER_BASH_SCRIPT_PATH': CONTAINER_BASH_SCRIPT_PATH,
                             'SPOTTY_TMP_DIR': INSTANCE_SPOTTY_TMP_DIR,
                             'CONTAINERS_TMP_DIR': CONTAINERS_TMP_DIR,
                         }),
                     },
                 },
+                BOOTSTRAP_STEPS_SCRIPT_PATH: {
+                    'owner': 'ubuntu',
+                    'group': 'ubuntu',
+                    'mode': '000644',
+                    'content': get_bootstrap_steps_script(),
+                },
                 CONTAINER_BASH_SCRIPT_PATH: {
                     'owner': 'ubuntu',
                     'group': 'ubuntu',
@@ -165,32 +188,50 @@ def prepare_instance_template(ec2, instance_config: InstanceConfig, docker_comma
             },
             'command': INSTANCE_STARTUP_SCRIPTS_DIR + '/03_set_docker_root.sh',
         },
+        {
+            'name': 'pull_image',
+            'files': {
+                INSTANCE_STARTUP_SCRIPTS_DIR + '/04_pull_image.sh': {
+                    'owner': 'ubuntu',
+                    'group': 'ubuntu',
+                    'mode': '000755',
+                    'content': {
+                        'Fn::Sub': _read_template_file(os.path.join('startup_scripts', '04_pull_image.sh'), {
+                            'BOOTSTRAP_STEPS_SCRIPT_PATH': BOOTSTRAP_STEPS_SCRIPT_PATH,
+                            'PULL_IMAGE_CMD': '' if instance_config.dockerfile_path else docker_commands.pull(),
+                        }),
+                    },
+                },
+            },
+            'command': INSTANCE_STARTUP_SCRIPTS_DIR + '/04_pull_image.sh',
+        },
         {
             'name': 'sync_project',
             'files': {
-                INSTANCE_STARTUP_SCRIPTS_DIR + '/04_sync_project.sh': {
+                INSTANCE_STARTUP_SCRIPTS_DIR + '/05_sync_project.sh': {
                     'owner': 'ubuntu',
                     'group': 'ubuntu',
                     'mode': '000755',
                     'content': {
-                        'Fn::Sub': _read_template_file(os.path.join('startup_scripts', '04_sync_project.sh'), {
+                        'Fn::Sub': _read_template_file(os.path.join('startup_scripts', '05_sync_project.sh'), {
+                            'BOOTSTRAP_STEPS_SCRIPT_PATH': BOOTSTRAP_STEPS_SCRIPT_PATH,
                             'SYNC_PROJECT_CMD': sync_project_cmd,
                         }),
                     },
                 },
             },
-            'command': INSTANCE_STARTUP_SCRIPTS_DIR + '/04_sync_project.sh',
+            'command': INSTANCE_STARTUP_SCRIPTS_DIR + '/05_sync_project.sh',
         },
         {
             'name': 'run_instance_startup_commands',
             'files': {
-                INSTANCE_STARTUP_SCRIPTS_DIR + '/05_run_instance_startup_commands.sh': {
+                INSTANCE_STARTUP_SCRIPTS_DIR + '/06_run_instance_startup_commands.sh': {
                     'owner': 'ubuntu',
                     'group': 'ubuntu',
                     'mode': '000755',
                     'content': {
                         'Fn::Sub': _read_template_file(
-                            os.path.join('startup_scripts', '05_run_instance_startup_commands.sh'), {
+                            os.path.join('startup_scripts', '06_run_instance_startup_commands.sh'), {
                                 'INSTANCE_STARTUP_SCRIPTS_DIR': INSTANCE_STARTUP_SCRIPTS_DIR,
                             }),
                     },
@@ -202,12 +243,12 @@ def prepare_instance_template(ec2, instance_config: InstanceConfig, docker_comma
                     'content': instance_config.commands or '#',
                 },
             },
-            'command': INSTANCE_STARTUP_SCRIPTS_DIR + '/05_run_instance_startup_commands.sh',
+            'command': INSTANCE_STARTUP_SCRIPTS_DIR + '/06_run_instance_startup_commands.sh',
         },
         {
             'name': 'start_container',
             'files': {
-                INSTANCE_STARTUP_SCRIPTS_DIR + '/06_start_container.sh': {
+                INSTANCE_STARTUP_SCRIPTS_DIR + '/07_start_container.sh': {
                     'owner': 'ubuntu',
                     'group': 'ubuntu',
                     'mode': '000755',
@@ -216,7 +257,7 @@ def prepare_instance_template(ec2, instance_config: InstanceConfig, docker_comma
                     },
                 },
             },
-            'command': INSTANCE_STARTUP_SCRIPTS_DIR + '/06_start_container.sh',
+            'command': INSTANCE_STARTUP_SCRIPTS_DIR + '/07_start_container.sh',
         },
     ]
 
@@ -264,7 +305,7 @@ def _get_volume_attachment_resource(volume_id, device_name):
     return attachment_resource
 
 
-def _get_volume_resource(ec2, volume: EbsVolume, output: AbstractOutputWriter):
+def _get_volume_resource(volume: EbsVolume, snapshot: Snapshot, output: AbstractOutputWriter):
     # new volume will be created
     volume_resource = {
         'Type': 'AWS::EC2::Volume',
@@ -280,7 +321,6 @@ def _get_volume_resource(ec2, volume: EbsVolume, output: AbstractOutputWriter):
     }
 
     # check if the snapshot exists and restore the volume from it
-    snapshot = Snapshot.get_by_name(ec2, volume.ec2_volume_name)
     if snapshot:
         # volume will be restored from the snapshot
         # check size of the volume
@@ -311,7 +351,8 @@ def _get_volume_resource(ec2, volume: EbsVolume, output: AbstractOutputWriter):
     return volume_resource
 
 
-def _get_volume_resources(ec2, volumes: List[AbstractInstanceVolume], output: AbstractOutputWriter):
+def _get_volume_resources(volumes: List[AbstractInstanceVolume], ec2_volumes: Dict[str, Volume],
+                          snapshots: Dict[str, Snapshot], output: AbstractOutputWriter):
     resources = {}
 
     # ending letters for the devices (see: https://docs.aws.amazon.com/AWSEC2/latest/UserGuide/device_naming.html)
@@ -322,7 +363,7 @@ def _get_volume_resources(ec2, volumes: List[AbstractInstanceVolume], output: Ab
         if isinstance(volume, EbsVolume):
             device_letter = device_letters[i]
 
-            ec2_volume = Volume.get_by_name(ec2, volume.ec2_volume_name)
+            ec2_volume = ec2_volumes.get(volume.ec2_volume_name)
             if ec2_volume:
                 # check if the volume is available
                 if not ec2_volume.is_available():
@@ -340,7 +381,7 @@ def _get_volume_resources(ec2, volumes: List[AbstractInstanceVolume], output: Ab
             else:
                 # create Volume resource
                 vol_resource_name = 'Volume' + device_letter.upper()
-                vol_resource = _get_volume_resource(ec2, volume, output)
+                vol_resource = _get_volume_resource(volume, snapshots.get(volume.ec2_volume_name), output)
                 resources[vol_resource_name] = vol_resource
 
                 volume_id = {'Ref': vol_resource_name}
@@ -354,10 +395,8 @@ def _get_volume_resources(ec2, volumes: List[AbstractInstanceVolume], output: Ab
     return resources
 
 
-def get_template_parameters(ec2, instance_config: InstanceConfig, instance_profile_arn: str, bucket_name: str,
-                            key_pair_name: str, output: AbstractOutputWriter):
-    # get AMI
-    ami = get_ami(ec2, instance_config.ami_id, instance_config.ami_name)
+def get_template_parameters(instance_config: InstanceConfig, instance_profile_arn: str, bucket_name: str,
+                            key_pair_name: str, ami: Image, vpc_id: str, output: AbstractOutputWriter):
     output.write('- AMI: "%s" (%s)' % (ami.name, ami.image_id))
 
     # check root volume size
@@ -377,7 +416,7 @@ def get_template_parameters(ec2, instance_config: InstanceConfig, instance_profi
 
     # create stack
     parameters = {
-        'VpcId': get_vpc_id(ec2, instance_config.subnet_id),
+        'VpcId': vpc_id,
         'InstanceProfileArn': instance_profile_arn,
         'InstanceType': instance_config.instance_type,
         'KeyName': key_pair_name,
@@ -390,3 +429,61 @@ def get_template_parameters(ec2, instance_config: InstanceConfig, instance_profi
     }
 
     return parameters
+
+
+def can_update_instance_stack(live_template, live_parameters: dict, template: str, parameters: dict) -> bool:
+    """Checks if the running instance can be kept when the stack is updated with the new template.
+
+    It's the case if only the container configuration (it's applied by restarting the container)
+    or the security group ports were changed. Any other change, for example, in the launch template
+    properties or in the instance startup scripts, requires to recreate the instance.
+
+    Volume resources and the placement of the instance are not compared, as they describe
+    the volumes that are already attached to the instance. Changes in the volumes configuration
+    are detected through the script that mounts the volumes.
+    """
+    if {key: str(value) for key, value in parameters.items()} != live_parameters:
+        return False
+
+    return _get_instance_resources(live_template) == _get_instance_resources(template)
+
+
+def get_updated_instance_template(live_template, template: str) -> str:
+    """Returns the live template with the container configuration and the security group
+    taken from the new template."""
+    live_template = _load_template(live_template)
+    template = _load_template(template)
+
+    live_template['Resources']['InstanceSecurityGroup'] = template['Resources']['InstanceSecurityGroup']
+    for config_name in CONTAINER_CFN_INIT_CONFIGS:
+        if config_name in _get_cfn_init(template):
+            _get_cfn_init(live_template)[config_name] = _get_cfn_init(template)[config_name]
+
+    return yaml.dump(live_template, Dumper=CfnYamlDumper)
+
+
+def _load_template(template) -> dict:
+    # a template body can be returned by the API as a string or as a parsed JSON
+    if isinstance(template, str):
+        template = yaml.load(template, Loader=CfnYamlLoader)
+
+    return template
+
+
+def _get_cfn_init(template: dict) -> dict:
+    return template['Resources']['InstanceLaunchTemplate']['Metadata']['AWS::CloudFormation::Init']
+
+
+def _get_instance_resources(template) -> dict:
+    """Returns the template resources without the parts that can be changed for the running instance."""
+    template = copy.deepcopy(_load_template(template))
+
+    resources = {name: resource for name, resource in template['Resources'].items()
+                 if resource['Type'] not in ['AWS::EC2::Volume', 'AWS::EC2::VolumeAttachment']}
+    resources.pop('InstanceSecurityGroup', None)
+
+    resources['InstanceLaunchTemplate']['Properties']['LaunchTemplateData'].pop('Placement', None)
+    for config_name in CONTAINER_CFN_INIT_CONFIGS:
+        _get_cfn_init(template).pop(config_name, None)
+
+    return resources
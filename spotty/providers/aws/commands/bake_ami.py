@@ -0,0 +1,52 @@
+from argparse import ArgumentParser, Namespace
+import boto3
+from spotty.commands.abstract_command import AbstractCommand
+from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
+from spotty.config.config_utils import load_config
+from spotty.providers.aws.config.instance_config import DEFAULT_AMI_NAME
+from spotty.providers.aws.helpers.ami import get_deep_learning_ami
+from spotty.providers.aws.helpers.bake_ami import bake_ami
+from spotty.providers.aws.resources.image import Image
+
+
+class BakeAmiCommand(AbstractCommand):
+
+    name = 'bake-ami'
+    description = 'Create an AMI with preinstalled tools to speed up instance startup'
+
+    def configure(self, parser: ArgumentParser):
+        super().configure(parser)
+        parser.add_argument('-r', '--region', type=str, required=True, help='AWS region')
+        parser.add_argument('-n', '--ami-name', type=str, default=DEFAULT_AMI_NAME, help='AMI name')
+        parser.add_argument('-t', '--instance-type', type=str, default='m5.large',
+                            help='Instance type of the builder instance')
+        parser.add_argument('-s', '--subnet-id', type=str, help='Subnet ID for the builder instance')
+        parser.add_argument('--docker-image', type=str, action='append', default=[],
+                            help='Docker image to pre-pull (the option can be used several times)')
+        parser.add_argument('--project-images', action='store_true',
+                            help='Pre-pull Docker images of the project containers')
+        parser.add_argument('-c', '--config', type=str, default=None, help='Path to the configuration file')
+        parser.add_argument('--replace', action='store_true', help='Replace the existing AMI with the same name')
+
+    def run(self, args: Namespace, output: AbstractOutputWriter):
+        ec2 = boto3.client('ec2', region_name=args.region)
+
+        # check that the AMI doesn't exist yet
+        existing_image = Image.get_by_name(ec2, args.ami_name)
+        if existing_image and not args.replace:
+            raise ValueError('AMI with the name "%s" already exists. Use the "--replace" flag to replace it.'
+                             % args.ami_name)
+
+        docker_images = list(args.docker_image)
+        if args.project_images:
+            project_config = load_config(args.config)
+            docker_images += [container['image'] for container in project_config.containers if container['image']]
+
+        docker_images = list(dict.fromkeys(docker_images))
+
+        base_image = get_deep_learning_ami(ec2)
+
+        ami_id = bake_ami(ec2, base_image, args.ami_name, args.instance_type, docker_images, args.subnet_id, output,
+                          replace_image=existing_image)
+
+        output.write('AMI "%s" (%s) was created.' % (args.ami_name, ami_id))
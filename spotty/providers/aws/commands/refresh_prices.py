@@ -0,0 +1,45 @@
+from argparse import ArgumentParser, Namespace
+from concurrent.futures import ThreadPoolExecutor
+import boto3
+from spotty.commands.abstract_command import AbstractCommand
+from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
+from spotty.providers.aws.helpers.price_index import OnDemandPriceIndex, get_on_demand_prices_from_api
+
+
+class RefreshPricesCommand(AbstractCommand):
+
+    name = 'refresh-prices'
+    description = 'Download On-Demand Instance prices to the local price index'
+
+    def configure(self, parser: ArgumentParser):
+        super().configure(parser)
+        parser.add_argument('-r', '--region', type=str, action='append',
+                            help='AWS region (the option can be used several times). By default, prices for all '
+                                 'regions are downloaded.')
+
+    def run(self, args: Namespace, output: AbstractOutputWriter):
+        # get all regions
+        if not args.region:
+            ec2 = boto3.client('ec2')
+            res = ec2.describe_regions()
+            regions = [row['RegionName'] for row in res['Regions']]
+        else:
+            regions = list(dict.fromkeys(args.region))
+
+        output.write('Downloading On-Demand prices...')
+
+        pricing = boto3.client('pricing', region_name='us-east-1')  # the API available only in "us-east-1"
+        price_index = OnDemandPriceIndex()
+
+        # the Pricing API is throttled, so only a few regions are requested at the same time
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [(region, executor.submit(get_on_demand_prices_from_api, pricing, region))
+                       for region in regions]
+
+            with output.prefix('  '):
+                for region, future in futures:
+                    prices = future.result()
+                    price_index.update_region(region, prices)
+                    output.write('%s: %d prices' % (region, len(prices)))
+
+        output.write('Done')
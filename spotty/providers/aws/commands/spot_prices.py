@@ -2,18 +2,20 @@ from argparse import ArgumentParser, Namespace
 import boto3
 from spotty.commands.abstract_command import AbstractCommand
 from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
-from spotty.providers.aws.helpers.instance_prices import get_spot_prices
+from spotty.providers.aws.helpers.instance_prices import get_spot_prices_for_regions
 
 
 class SpotPricesCommand(AbstractCommand):
 
     name = 'spot-prices'
-    description = 'Get Spot Instance prices for an instance type across all AWS regions or within a specific region.'
+    description = 'Get Spot Instance prices for instance types across all AWS regions or within a specific region.'
 
     def configure(self, parser: ArgumentParser):
         super().configure(parser)
-        parser.add_argument('-i', '--instance-type', type=str, required=True, help='Instance type')
+        parser.add_argument('-i', '--instance-type', type=str, action='append', required=True,
+                            help='Instance type (the option can be used several times)')
         parser.add_argument('-r', '--region', type=str, help='AWS region')
+        parser.add_argument('--no-cache', action='store_true', help='Don\'t use cached prices')
 
     def run(self, args: Namespace, output: AbstractOutputWriter):
         # get all regions
@@ -24,22 +26,28 @@ class SpotPricesCommand(AbstractCommand):
         else:
             regions = [args.region]
 
-        instance_type = args.instance_type
+        instance_types = list(dict.fromkeys(args.instance_type))
 
-        output.write('Getting spot instance prices for "%s"...\n' % instance_type)
+        output.write('Getting spot instance prices for %s...\n'
+                     % ', '.join('"%s"' % instance_type for instance_type in instance_types))
+
+        res = get_spot_prices_for_regions(regions, instance_types, use_cache=(not args.no_cache))
 
         prices = []
-        for region in regions:
-            ec2 = boto3.client('ec2', region_name=region)
-            res = get_spot_prices(ec2, instance_type)
-            prices += [(price, zone) for zone, price in res.items()]
+        for (_, instance_type), zone_prices in res.items():
+            prices += [(price, zone, instance_type) for zone, price in zone_prices.items()]
 
         # sort availability zones by price
         prices.sort(key=lambda x: x[0])
 
         if prices:
-            output.write('Price  Zone')
-            for price, zone in prices:
-                output.write('%.04f %s' % (price, zone))
+            if len(instance_types) > 1:
+                output.write('Price  Zone             Instance Type')
+                for price, zone, instance_type in prices:
+                    output.write('%.04f %-16s %s' % (price, zone, instance_type))
+            else:
+                output.write('Price  Zone')
+                for price, zone, _ in prices:
+                    output.write('%.04f %s' % (price, zone))
         else:
             output.write('Spot instances of this type are not available.')
@@ -22,6 +22,8 @@ def validate_instance_parameters(params: dict):
                                                              'not be specified.'),
                                                    ),
         Optional('ports', default=[]): [And(int, lambda x: 0 < x < 65536)],
+        Optional('syncMode', default='bucket'): And(str, lambda x: x in ['bucket', 'direct'],
+                                                    error='"syncMode" must be "bucket" or "direct".'),
         Optional('maxPrice', default=0): And(Or(float, int, str), Use(str),
                                              Regex(r'^\d+(\.\d{1,6})?$', error='Incorrect value for "maxPrice".'),
                                              Use(float),
@@ -1,7 +1,11 @@
-import logging
-import subprocess
+import shlex
+from typing import List
+import boto3
+from botocore.config import Config
+from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
 from spotty.deployment.abstract_cloud_instance.abstract_data_transfer import AbstractDataTransfer
-from spotty.providers.aws.helpers.s3_sync import get_s3_sync_command, check_aws_installed
+from spotty.providers.aws.helpers.s3_sync import get_s3_sync_command, sync_local_to_s3, sync_s3_to_local, \
+    upload_files_to_s3, get_s3_download_files_command, DEFAULT_MAX_CONCURRENCY
 
 
 class DataTransfer(AbstractDataTransfer):
@@ -11,40 +15,42 @@ class DataTransfer(AbstractDataTransfer):
         super().__init__(local_project_dir, host_project_dir, sync_filters, instance_name)
 
         self._region = region
+        self._s3 = boto3.client('s3', region_name=region,
+                                config=Config(max_pool_connections=DEFAULT_MAX_CONCURRENCY))
 
     @property
     def scheme_name(self) -> str:
         return 's3'
 
-    def upload_local_to_bucket(self, bucket_name: str, dry_run: bool = False):
+    def upload_local_to_bucket(self, bucket_name: str, output: AbstractOutputWriter, dry_run: bool = False):
         """Uploads files from local to the bucket."""
-        # check AWS CLI is installed
-        check_aws_installed()
-
         # sync the project with S3, deleted files will be deleted from S3
-        local_cmd = get_s3_sync_command(self._local_project_dir, self._get_bucket_project_path(bucket_name),
-                                        region=self._region, filters=self._sync_filters, delete=True, dry_run=dry_run)
-
-        # execute the command locally
-        logging.debug('Local sync command: ' + local_cmd)
-        exit_code = subprocess.call(local_cmd, shell=True)
-        if exit_code != 0:
-            raise ValueError('Failed to upload the project files to the S3 bucket.')
+        try:
+            sync_local_to_s3(self._s3, self._local_project_dir, self._get_bucket_project_path(bucket_name), output,
+                             filters=self._sync_filters, delete=True, dry_run=dry_run)
+        except Exception as e:
+            raise ValueError('Failed to upload the project files to the S3 bucket.\n' + str(e))
 
-    def download_bucket_to_local(self, bucket_name: str, download_filters: list):
+    @property
+    def supports_partial_sync(self) -> bool:
+        return True
+
+    def upload_files_to_bucket(self, bucket_name: str, upload_paths: List[str], delete_paths: List[str],
+                               output: AbstractOutputWriter, dry_run: bool = False):
+        """Uploads the specified project files to the bucket and deletes the objects of the deleted files."""
+        try:
+            upload_files_to_s3(self._s3, self._local_project_dir, self._get_bucket_project_path(bucket_name),
+                               upload_paths, output, delete_paths=delete_paths, dry_run=dry_run)
+        except Exception as e:
+            raise ValueError('Failed to upload the project files to the S3 bucket.\n' + str(e))
+
+    def download_bucket_to_local(self, bucket_name: str, download_filters: list, output: AbstractOutputWriter):
         """Downloads files from the bucket to local."""
-        # check AWS CLI is installed
-        check_aws_installed()
-
-        # download files from S3 bucket to local
-        local_cmd = get_s3_sync_command(self._get_bucket_downloads_path(bucket_name), self._local_project_dir,
-                                        region=self._region, filters=download_filters, exact_timestamp=True)
-
-        # execute the command locally
-        logging.debug('Local sync command: ' + local_cmd)
-        exit_code = subprocess.call(local_cmd, shell=True)
-        if exit_code != 0:
-            raise ValueError('Failed to download files from the S3 bucket to local')
+        try:
+            sync_s3_to_local(self._s3, self._get_bucket_downloads_path(bucket_name), self._local_project_dir, output,
+                             filters=download_filters, exact_timestamp=True)
+        except Exception as e:
+            raise ValueError('Failed to download files from the S3 bucket to local.\n' + str(e))
 
     def get_download_bucket_to_instance_command(self, bucket_name: str, use_sudo: bool = False) -> str:
         """A remote command to download files from the bucket to the instance."""
@@ -55,6 +61,18 @@ class DataTransfer(AbstractDataTransfer):
 
         return remote_cmd
 
+    def get_download_files_to_instance_command(self, bucket_name: str, download_paths: List[str],
+                                               delete_paths: List[str], use_sudo: bool = False) -> str:
+        """A remote command to download the specified files from the bucket to the instance
+        and to delete the deleted files.
+        """
+        remote_cmd = get_s3_download_files_command(self._get_bucket_project_path(bucket_name), self._host_project_dir,
+                                                   download_paths, delete_paths=delete_paths, region=self._region)
+        if use_sudo:
+            remote_cmd = 'sudo sh -c ' + shlex.quote(remote_cmd)
+
+        return remote_cmd
+
     def get_upload_instance_to_bucket_command(self, bucket_name: str, download_filters: list, use_sudo: bool = False,
                                               dry_run: bool = False) -> str:
         """A remote command to upload files from the instance to the bucket.
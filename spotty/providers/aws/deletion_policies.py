@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
 from spotty.config.abstract_instance_volume import AbstractInstanceVolume
@@ -6,8 +7,20 @@ from spotty.providers.aws.resources.volume import Volume
 from spotty.providers.aws.config.ebs_volume import EbsVolume
 
 
-def apply_deletion_policies(ec2, volumes: List[AbstractInstanceVolume], output: AbstractOutputWriter):
-    """Applies deletion policies to the EBS volumes."""
+def apply_deletion_policies(ec2, volumes: List[AbstractInstanceVolume], output: AbstractOutputWriter,
+                            wait_volumes: bool = False, max_workers: int = 8):
+    """Applies deletion policies to the EBS volumes.
+
+    Volumes are processed concurrently: snapshots for all the volumes are created at the same time
+    and each volume is deleted as soon as its snapshot is completed.
+
+    Args:
+        ec2: EC2 client.
+        volumes: Instance volumes.
+        output: Output writer.
+        wait_volumes: Wait until the volumes that are still attached to a terminating instance become available.
+        max_workers: Maximum number of volumes that are processed at the same time.
+    """
 
     # get volumes
     ebs_volumes = [volume for volume in volumes if isinstance(volume, EbsVolume)]
@@ -17,76 +30,100 @@ def apply_deletion_policies(ec2, volumes: List[AbstractInstanceVolume], output:
         output.write('- no EBS volumes configured')
         return
 
+    # get EC2 volumes and previous snapshots
+    volume_names = [volume.ec2_volume_name for volume in ebs_volumes]
+    snapshot_names = [volume.ec2_volume_name for volume in ebs_volumes
+                      if volume.deletion_policy in [EbsVolume.DP_CREATE_SNAPSHOT, EbsVolume.DP_UPDATE_SNAPSHOT]]
+    try:
+        ec2_volumes = Volume.group_by_names(ec2, volume_names)
+        prev_snapshots = Snapshot.group_by_names(ec2, snapshot_names)
+    except Exception as e:
+        for volume_name in volume_names:
+            output.write('- volume "%s" not found. Error: %s' % (volume_name, str(e)))
+        return
+
+    # apply deletion policies, a duplicated name affects only its own volume
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_apply_deletion_policy, volume, ec2_volumes.get(volume.ec2_volume_name, []),
+                                   prev_snapshots.get(volume.ec2_volume_name, []), wait_volumes, output)
+                   for volume in ebs_volumes]
+
+    # raise an unexpected error if there is one
+    for future in futures:
+        future.result()
+
+
+def _apply_deletion_policy(volume: EbsVolume, ec2_volumes: List[Volume], prev_snapshots: List[Snapshot],
+                           wait_volume: bool, output: AbstractOutputWriter):
+    if not ec2_volumes:
+        output.write('- volume "%s" not found' % volume.ec2_volume_name)
+        return
+
+    if len(ec2_volumes) > 1:
+        output.write('- volume "%s" not found. Error: Several volumes with Name=%s found.'
+                     % (volume.ec2_volume_name, volume.ec2_volume_name))
+        return
+
+    ec2_volume = ec2_volumes[0]
+
+    if wait_volume and (ec2_volume.state == 'in-use'):
+        try:
+            ec2_volume.wait_volume_available()
+        except Exception as e:
+            output.write('- volume "%s" is not available. Error: %s' % (volume.ec2_volume_name, str(e)))
+            return
+
+    if not ec2_volume.is_available():
+        output.write('- volume "%s" is not available (state: %s)'
+                     % (volume.ec2_volume_name, ec2_volume.state))
+        return
+
     # apply deletion policies
-    wait_snapshots = []
-    for volume in ebs_volumes:
-        # get EC2 volume
+    if volume.deletion_policy == EbsVolume.DP_RETAIN:
+        # do nothing
+        output.write('- volume "%s" is retained' % ec2_volume.name)
+
+    elif volume.deletion_policy == EbsVolume.DP_DELETE:
+        # delete EBS volume
+        _delete_ec2_volume(ec2_volume, output)
+
+    elif volume.deletion_policy == EbsVolume.DP_CREATE_SNAPSHOT \
+            or volume.deletion_policy == EbsVolume.DP_UPDATE_SNAPSHOT:
         try:
-            ec2_volume = Volume.get_by_name(ec2, volume.ec2_volume_name)
+            if len(prev_snapshots) > 1:
+                raise ValueError('Several snapshots with Name=%s found.' % volume.ec2_volume_name)
+
+            # rename a previous snapshot
+            prev_snapshot = prev_snapshots[0] if prev_snapshots else None
+            if prev_snapshot:
+                prev_snapshot.rename('%s-%d' % (prev_snapshot.name, prev_snapshot.creation_time))
+
+            output.write('- creating a snapshot for the volume "%s"...' % ec2_volume.name)
+
+            # create a new snapshot
+            new_snapshot = ec2_volume.create_snapshot()
         except Exception as e:
-            output.write('- volume "%s" not found. Error: %s' % (volume.ec2_volume_name, str(e)))
-            continue
-
-        if not ec2_volume:
-            output.write('- volume "%s" not found' % volume.ec2_volume_name)
-            continue
-
-        if not ec2_volume.is_available():
-            output.write('- volume "%s" is not available (state: %s)'
-                         % (volume.ec2_volume_name, ec2_volume.state))
-            continue
-
-        # apply deletion policies
-        if volume.deletion_policy == EbsVolume.DP_RETAIN:
-            # do nothing
-            output.write('- volume "%s" is retained' % ec2_volume.name)
-
-        elif volume.deletion_policy == EbsVolume.DP_DELETE:
-            # delete EBS volume
-            _delete_ec2_volume(ec2_volume, output)
-
-        elif volume.deletion_policy == EbsVolume.DP_CREATE_SNAPSHOT \
-                or volume.deletion_policy == EbsVolume.DP_UPDATE_SNAPSHOT:
-            try:
-                # rename a previous snapshot
-                prev_snapshot = Snapshot.get_by_name(ec2, volume.ec2_volume_name)
-                if prev_snapshot:
-                    prev_snapshot.rename('%s-%d' % (prev_snapshot.name, prev_snapshot.creation_time))
-
-                output.write('- creating a snapshot for the volume "%s"...' % ec2_volume.name)
-
-                # create a new snapshot
-                new_snapshot = ec2_volume.create_snapshot()
-
-                # delete the EBS volume and a previous snapshot only after a new snapshot will be created
-                wait_snapshots.append({
-                    'new_snapshot': new_snapshot,
-                    'prev_snapshot': prev_snapshot,
-                    'ec2_volume': ec2_volume,
-                    'deletion_policy': volume.deletion_policy,
-                })
-            except Exception as e:
-                output.write('- snapshot for the volume "%s" was not created. Error: %s'
-                             % (volume.ec2_volume_name, str(e)))
-
-        else:
-            raise ValueError('Unsupported deletion policy: "%s".' % volume.deletion_policy)
-
-    # wait until all snapshots will be created
-    for resources in wait_snapshots:
+            output.write('- snapshot for the volume "%s" was not created. Error: %s'
+                         % (volume.ec2_volume_name, str(e)))
+            return
+
+        # delete the EBS volume and a previous snapshot only after a new snapshot will be created
         try:
-            resources['new_snapshot'].wait_snapshot_completed()
-            output.write('- snapshot for the volume "%s" was created' % resources['new_snapshot'].name)
+            new_snapshot.wait_snapshot_completed()
+            output.write('- snapshot for the volume "%s" was created' % new_snapshot.name)
         except Exception as e:
-            output.write('- snapshot "%s" was not created. Error: %s' % (resources['new_snapshot'].name, str(e)))
-            continue
+            output.write('- snapshot "%s" was not created. Error: %s' % (new_snapshot.name, str(e)))
+            return
 
         # delete a previous snapshot if it's the "update_snapshot" deletion policy
-        if (resources['deletion_policy'] == EbsVolume.DP_UPDATE_SNAPSHOT) and resources['prev_snapshot']:
-            _delete_snapshot(resources['prev_snapshot'], output)
+        if (volume.deletion_policy == EbsVolume.DP_UPDATE_SNAPSHOT) and prev_snapshot:
+            _delete_snapshot(prev_snapshot, output)
 
         # delete the EBS volume
-        _delete_ec2_volume(resources['ec2_volume'], output)
+        _delete_ec2_volume(ec2_volume, output)
+
+    else:
+        raise ValueError('Unsupported deletion policy: "%s".' % volume.deletion_policy)
 
 
 def _delete_ec2_volume(ec2_volume: Volume, output: AbstractOutputWriter):
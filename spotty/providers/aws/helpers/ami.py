@@ -23,17 +23,26 @@ def get_ami(ec2, ami_id: str = None, ami_name: str = None) -> Image:
         # if the "amiName" parameter is not specified, try to use the default AMI name
         image = Image.get_by_name(ec2, DEFAULT_AMI_NAME)
         if not image:
-            # get the latest "Deep Learning Base AMI"
-            res = ec2.describe_images(
-                Owners=['amazon'],
-                Filters=[{'Name': 'name', 'Values': ['Deep Learning AMI (Ubuntu 16.04) Version*']}],
-            )
+            image = get_deep_learning_ami(ec2)
 
-            if not len(res['Images']):
-                raise ValueError('AWS Deep Learning AMI not found.\n'
-                                 'Use the "spotty aws create-ami" command to create an AMI with NVIDIA Docker.')
+    return image
 
-            image_info = sorted(res['Images'], key=lambda x: x['CreationDate'], reverse=True)[0]
-            image = Image(ec2, image_info)
 
-    return image
+def get_deep_learning_ami(ec2) -> Image:
+    """Returns the latest "Deep Learning AMI".
+
+    Raises:
+        ValueError: If the AMI not found.
+    """
+    res = ec2.describe_images(
+        Owners=['amazon'],
+        Filters=[{'Name': 'name', 'Values': ['Deep Learning AMI (Ubuntu 16.04) Version*']}],
+    )
+
+    if not len(res['Images']):
+        raise ValueError('AWS Deep Learning AMI not found.\n'
+                         'Use the "spotty aws bake-ami" command to create an AMI with NVIDIA Docker.')
+
+    image_info = sorted(res['Images'], key=lambda x: x['CreationDate'], reverse=True)[0]
+
+    return Image(ec2, image_info)
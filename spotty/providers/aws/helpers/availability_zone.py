@@ -1,17 +1,18 @@
-from typing import List
+from typing import Dict, List
 from spotty.config.abstract_instance_volume import AbstractInstanceVolume
 from spotty.providers.aws.config.ebs_volume import EbsVolume
 from spotty.providers.aws.resources.volume import Volume
 
 
-def update_availability_zone(ec2, availability_zone: str, volumes: List[AbstractInstanceVolume]):
+def update_availability_zone(availability_zone: str, volumes: List[AbstractInstanceVolume],
+                             ec2_volumes: Dict[str, Volume]):
     """Checks that existing volumes located in the same AZ and the AZ from the
     config file matches volumes AZ.
 
     Args:
-        ec2: EC2 boto3 client
         availability_zone: Availability Zone from the configuration.
         volumes: List of volume objects.
+        ec2_volumes: Existing EC2 volumes by their names.
 
     Returns:
         The final AZ where the instance should be run or an empty string if
@@ -24,7 +25,7 @@ def update_availability_zone(ec2, availability_zone: str, volumes: List[Abstract
     availability_zone = availability_zone
     for volume in volumes:
         if isinstance(volume, EbsVolume):
-            ec2_volume = Volume.get_by_name(ec2, volume.ec2_volume_name)
+            ec2_volume = ec2_volumes.get(volume.ec2_volume_name)
             if ec2_volume:
                 if availability_zone and (availability_zone != ec2_volume.availability_zone):
                     raise ValueError(
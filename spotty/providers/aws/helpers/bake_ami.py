@@ -0,0 +1,99 @@
+import os
+from typing import List
+import chevron
+from botocore.exceptions import WaiterError
+from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
+from spotty.providers.aws.resources.image import Image
+
+
+# a version of the tools installed on a baked AMI, the startup scripts skip
+# the installation steps only if the AMI has the same version
+BAKED_AMI_VERSION = '1'
+
+# a file on a baked AMI that contains its version
+BAKED_AMI_VERSION_FILE = '/etc/spotty/ami-version'
+
+# maximum time to wait for the builder instance to install the tools
+BUILDER_TIMEOUT_SECS = 3600
+
+
+def bake_ami(ec2, base_image: Image, ami_name: str, instance_type: str, docker_images: List[str], subnet_id: str,
+             output: AbstractOutputWriter, replace_image: Image = None) -> str:
+    """Creates an AMI with preinstalled tools and pulled Docker images.
+
+    A builder instance is launched from the base AMI, installs the tools using a user data script
+    and stops itself. Then the AMI is created from the stopped instance and the instance is terminated.
+
+    Args:
+        replace_image: An existing AMI with the same name. It's deregistered only once the builder
+            instance is ready.
+
+    Returns:
+        ID of the new AMI.
+    """
+    params = {
+        'ImageId': base_image.image_id,
+        'InstanceType': instance_type,
+        'MinCount': 1,
+        'MaxCount': 1,
+        'UserData': _get_user_data(docker_images),
+        'InstanceInitiatedShutdownBehavior': 'stop',
+        'TagSpecifications': [{
+            'ResourceType': 'instance',
+            'Tags': [{'Key': 'Name', 'Value': 'spotty-ami-builder'}],
+        }],
+    }
+
+    if subnet_id:
+        params['SubnetId'] = subnet_id
+
+    output.write('Launching a builder instance from the "%s" AMI...' % base_image.name)
+    instance_id = ec2.run_instances(**params)['Instances'][0]['InstanceId']
+
+    try:
+        output.write('Waiting for the builder instance "%s" to install the tools...' % instance_id)
+        try:
+            ec2.get_waiter('instance_stopped').wait(InstanceIds=[instance_id], WaiterConfig={
+                'Delay': 15,
+                'MaxAttempts': BUILDER_TIMEOUT_SECS // 15,
+            })
+        except WaiterError:
+            raise ValueError('The builder instance was not stopped in %d minutes, the installation probably '
+                             'failed. Check the system log of the instance "%s" in the AWS Console.'
+                             % (BUILDER_TIMEOUT_SECS // 60, instance_id))
+
+        if replace_image:
+            output.write('Deregistering the existing "%s" AMI...' % ami_name)
+            replace_image.deregister()
+
+        output.write('Creating the "%s" AMI...' % ami_name)
+        ami_id = ec2.create_image(
+            InstanceId=instance_id,
+            Name=ami_name,
+            Description='Spotty AMI with preinstalled tools (version %s)' % BAKED_AMI_VERSION,
+            TagSpecifications=[{
+                'ResourceType': 'image',
+                'Tags': [
+                    {'Key': 'spotty:ami-version', 'Value': BAKED_AMI_VERSION},
+                    {'Key': 'spotty:base-ami-id', 'Value': base_image.image_id},
+                ],
+            }],
+        )['ImageId']
+
+        ec2.get_waiter('image_available').wait(ImageIds=[ami_id], WaiterConfig={'Delay': 15, 'MaxAttempts': 240})
+    finally:
+        output.write('Terminating the builder instance...')
+        ec2.terminate_instances(InstanceIds=[instance_id])
+
+    return ami_id
+
+
+def _get_user_data(docker_images: List[str]) -> str:
+    with open(os.path.join(os.path.dirname(__file__), 'data', 'bake_ami_user_data.sh')) as f:
+        template = f.read()
+
+    return chevron.render(template, {
+        'DOCKER_IMAGES': docker_images,
+        'BAKED_AMI_VERSION': BAKED_AMI_VERSION,
+        'BAKED_AMI_VERSION_FILE': BAKED_AMI_VERSION_FILE,
+    })
@@ -0,0 +1,33 @@
+#!/bin/bash -xe
+
+export DEBIAN_FRONTEND=noninteractive
+
+# install AWS CLI, jq and tmux
+update-locale LANG=en_US.UTF-8 LC_ALL=en_US.UTF-8
+apt-get update
+apt-get install -y python3-pip python-setuptools jq tmux curl
+pip3 install -U awscli
+
+# install CloudFormation tools
+if [ ! -e /usr/local/bin/cfn-init ]; then
+  mkdir -p /root/aws-cfn-bootstrap-latest
+  curl https://s3.amazonaws.com/cloudformation-examples/aws-cfn-bootstrap-latest.tar.gz | tar xz -C /root/aws-cfn-bootstrap-latest --strip-components 1
+  python2 -m easy_install /root/aws-cfn-bootstrap-latest
+fi
+
+# install Docker if it's not installed
+if ! command -v docker &> /dev/null; then
+  curl -fsSL https://get.docker.com | sh
+fi
+
+# pre-pull Docker images
+{{#DOCKER_IMAGES}}
+docker pull {{{.}}}
+{{/DOCKER_IMAGES}}
+
+# mark the image as baked, so the startup scripts skip the installation steps
+mkdir -p "$(dirname '{{BAKED_AMI_VERSION_FILE}}')"
+echo '{{BAKED_AMI_VERSION}}' > '{{BAKED_AMI_VERSION_FILE}}'
+
+# stop the instance, so the AMI can be created (the instance keeps running if any of the steps failed)
+shutdown -h now
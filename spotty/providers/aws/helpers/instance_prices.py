@@ -1,24 +1,114 @@
 import datetime
-import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
 import boto3
-from pkg_resources import resource_filename
+from spotty.providers.aws.helpers.price_index import OnDemandPriceIndex, get_on_demand_prices_from_api
+from spotty.providers.aws.helpers.spot_price_cache import SpotPriceCache
 
 
-def get_spot_prices(ec2, instance_type: str):
+def get_spot_prices(ec2, instance_type: str, use_cache: bool = True) -> Dict[str, float]:
     """Returns current Spot Instance prices for all availability zones for particular instance type and region.
     AWS region specified implicitly in the "ec2" object.
     """
+    return get_spot_prices_for_types(ec2, [instance_type], use_cache).get(instance_type, {})
+
+
+def get_spot_prices_for_types(ec2, instance_types: List[str], use_cache: bool = True) -> Dict[str, Dict[str, float]]:
+    """Returns current Spot Instance prices for several instance types in the region of the "ec2" object.
+    Prices that are not cached are fetched using a single request.
+
+    Returns:
+        Prices by availability zones for each instance type.
+    """
+    region = ec2.meta.region_name
+    cache = SpotPriceCache()
+    prices = {}
+    for instance_type in set(instance_types):
+        cached_prices = cache.get_prices(region, instance_type) if use_cache else None
+        if cached_prices is not None:
+            prices[instance_type] = cached_prices
+
+    missing_types = sorted(set(instance_types) - set(prices))
+    if missing_types:
+        fetched_prices = _fetch_spot_prices(ec2, missing_types)
+        for instance_type in missing_types:
+            prices[instance_type] = fetched_prices.get(instance_type, {})
+
+        cache.set_prices({(region, instance_type): prices[instance_type] for instance_type in missing_types})
+
+    return prices
+
+
+def get_spot_prices_for_regions(regions: List[str], instance_types: List[str], use_cache: bool = True,
+                                max_workers: int = 16) -> Dict[tuple, Dict[str, float]]:
+    """Returns current Spot Instance prices for several regions and instance types.
+
+    Prices that are not cached are fetched concurrently, one request per region.
+
+    Returns:
+        Prices by availability zones for each (region, instance type) pair.
+    """
+    cache = SpotPriceCache()
+    prices = {}
+    missing_types = {}
+    for region in regions:
+        for instance_type in instance_types:
+            cached_prices = cache.get_prices(region, instance_type) if use_cache else None
+            if cached_prices is not None:
+                prices[(region, instance_type)] = cached_prices
+            else:
+                missing_types.setdefault(region, []).append(instance_type)
+
+    if missing_types:
+        # boto3 clients are created in the main thread, because creating them is not thread-safe
+        clients = {region: _get_ec2_client(region) for region in missing_types}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {region: executor.submit(_fetch_spot_prices, clients[region], region_types)
+                       for region, region_types in missing_types.items()}
+
+        fetched_prices = {}
+        for region, future in futures.items():
+            region_prices = future.result()
+            for instance_type in missing_types[region]:
+                fetched_prices[(region, instance_type)] = region_prices.get(instance_type, {})
+
+        cache.set_prices(fetched_prices)
+        prices.update(fetched_prices)
+
+    return prices
+
+
+def _fetch_spot_prices(ec2, instance_types: List[str]) -> Dict[str, Dict[str, float]]:
+    """Fetches current Spot prices for the instance types.
+
+    Returns:
+        Prices by availability zones for each instance type.
+    """
     tomorrow_date = datetime.datetime.today() + datetime.timedelta(days=1)
-    res = ec2.describe_spot_price_history(InstanceTypes=[instance_type],
-                                          StartTime=tomorrow_date,
-                                          ProductDescriptions=['Linux/UNIX'])
+    paginator = ec2.get_paginator('describe_spot_price_history')
+    pages = paginator.paginate(InstanceTypes=instance_types,
+                               StartTime=tomorrow_date,
+                               ProductDescriptions=['Linux/UNIX'])
+
+    prices = {}
+    for page in pages:
+        for row in page['SpotPriceHistory']:
+            prices.setdefault(row['InstanceType'], {})[row['AvailabilityZone']] = float(row['SpotPrice'])
+
+    return prices
+
 
-    prices_by_zone = {}
-    for row in res['SpotPriceHistory']:
-        prices_by_zone[row['AvailabilityZone']] = float(row['SpotPrice'])
+_ec2_clients = {}
 
-    return prices_by_zone
+
+def _get_ec2_client(region: str):
+    """Returns an EC2 client for the region, the clients are reused across the calls."""
+    if region not in _ec2_clients:
+        _ec2_clients[region] = boto3.client('ec2', region_name=region)
+
+    return _ec2_clients[region]
 
 
 def get_current_spot_price(ec2, instance_type, availability_zone=''):
@@ -26,6 +116,9 @@ def get_current_spot_price(ec2, instance_type, availability_zone=''):
     If an availability zone is not specified, returns the minimum price for the region.
     """
     spot_prices = get_spot_prices(ec2, instance_type)
+    if not spot_prices:
+        raise ValueError('Spot prices for the "%s" instance type not found.' % instance_type)
+
     if availability_zone:
         if availability_zone not in spot_prices:
             raise ValueError('Spot price for the "%s" availability zone not found.' % availability_zone)
@@ -37,41 +130,33 @@ def get_current_spot_price(ec2, instance_type, availability_zone=''):
     return current_price
 
 
-def get_on_demand_price(instance_type: str, region: str):
-    client = boto3.client('pricing', region_name='us-east-1')  # the API available only in "us-east-1"
+def get_pricing_client():
+    return boto3.client('pricing', region_name='us-east-1')  # the API available only in "us-east-1"
 
-    try:
-        response = client.get_products(
-            ServiceCode='AmazonEC2',
-            Filters=[
-                {'Type': 'TERM_MATCH', 'Field': 'location', 'Value': _get_region_name(region)},
-                {'Type': 'TERM_MATCH', 'Field': 'instanceType', 'Value': instance_type},
-                {'Type': 'TERM_MATCH', 'Field': 'operatingSystem', 'Value': 'Linux'},
-                {'Type': 'TERM_MATCH', 'Field': 'tenancy', 'Value': 'shared'},
-                {'Type': 'TERM_MATCH', 'Field': 'capacitystatus', 'Value': 'Used'},
-            ],
-        )
-
-        prices = json.loads(response['PriceList'][0])['terms']['OnDemand']
-        price = float(list(list(prices.values())[0]['priceDimensions'].values())[0]['pricePerUnit']['USD'])
-    except Exception as e:
-        logging.debug('Couldn\'t find a price for the instance: ' + str(e))
-        price = None
 
-    return price
+def get_on_demand_price(instance_type: str, region: str, os_name: str = 'Linux', pricing=None):
+    """Returns an On-Demand price for the instance type in the region.
 
+    The price is taken from the local price index (see the "spotty aws refresh-prices" command),
+    if the index is missing or expired, the price is requested from the Pricing API.
+
+    Args:
+        pricing: Pricing API client. If it's not provided, a new client is created.
+    """
+    price = OnDemandPriceIndex().get_price(region, instance_type, os_name)
+    if price is not None:
+        return price
+
+    client = pricing if pricing else get_pricing_client()
 
-def _get_region_name(region: str):
-    endpoint_file = resource_filename('botocore', 'data/endpoints.json')
     try:
-        with open(endpoint_file, 'r') as f:
-            data = json.load(f)
-            region_name = data['partitions'][0]['regions'][region]['description']
+        prices = get_on_demand_prices_from_api(client, region, instance_type)
+        price = prices[(instance_type, os_name)]
     except Exception as e:
-        logging.debug('Couldn\'t obtain the region name: ' + str(e))
-        region_name = None
+        logging.debug('Couldn\'t find a price for the instance: ' + str(e))
+        price = None
 
-    return region_name
+    return price
 
 
 def check_max_spot_price(ec2, instance_type: str, is_spot_instance: bool, max_price: float,
@@ -0,0 +1,88 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+import boto3
+from spotty.providers.aws.config.instance_config import InstanceConfig
+from spotty.providers.aws.helpers.instance_prices import get_spot_prices_for_types, get_pricing_client
+from spotty.providers.aws.resource_managers.instance_stack_manager import InstanceStackManager
+from spotty.providers.aws.resources.instance import Instance
+
+
+def get_instance_status_info(instance: Instance, spot_prices: Dict[str, float] = None, pricing=None) -> dict:
+    """Returns information about a running instance.
+
+    Args:
+        instance: Running instance.
+        spot_prices: Spot prices by availability zones for the instance type. If they're not provided,
+            the price is requested separately.
+        pricing: Pricing API client to request an On-Demand price if it's not in the local price index.
+    """
+    info = {
+        'state': instance.state,
+        'location': instance.availability_zone,
+        'instance_type': instance.instance_type,
+        'ip_address': instance.public_ip_address or instance.private_ip_address,
+    }
+
+    if instance.lifecycle == 'spot':
+        info['purchasing_option'] = 'spot'
+        info['price'] = spot_prices.get(instance.availability_zone) if spot_prices is not None \
+            else instance.get_spot_price()
+    else:
+        info['purchasing_option'] = 'on-demand'
+        info['price'] = instance.get_on_demand_price(pricing=pricing)
+
+    return info
+
+
+def get_instances_status_info(instance_configs: List[InstanceConfig], max_workers: int = 8) -> List[dict]:
+    """Returns information about several instances.
+
+    Instances are grouped by regions. For each region, the instances are requested with a single
+    "describe_instances" call and Spot prices for all their types are requested with a single call.
+    Regions are processed concurrently.
+    """
+    region_configs = {}
+    for instance_config in instance_configs:
+        region_configs.setdefault(instance_config.region, []).append(instance_config)
+
+    # boto3 clients are created in the main thread, because creating them is not thread-safe
+    clients = {region: boto3.client('ec2', region_name=region) for region in region_configs}
+    pricing = get_pricing_client()  # On-Demand prices are requested if the local price index is missing
+
+    def get_region_status_info(region: str) -> Dict[str, dict]:
+        ec2 = clients[region]
+        stack_names = {instance_config.name: InstanceStackManager.get_stack_name(
+            instance_config.project_config.project_name, instance_config.name)
+            for instance_config in region_configs[region]}
+
+        try:
+            instances = Instance.get_by_stack_names(ec2, list(stack_names.values()))
+            spot_types = [instance.instance_type for instance in instances.values() if instance.lifecycle == 'spot']
+            spot_prices = get_spot_prices_for_types(ec2, spot_types) if spot_types else {}
+        except Exception as e:
+            return {instance_name: {'state': 'unknown', 'location': region, 'error': str(e)}
+                    for instance_name in stack_names}
+
+        res = {}
+        for instance_name, stack_name in stack_names.items():
+            instance = instances.get(stack_name)
+            if not instance:
+                res[instance_name] = {'state': 'not running', 'location': region}
+                continue
+
+            try:
+                instance_spot_prices = spot_prices.get(instance.instance_type, {})
+                res[instance_name] = get_instance_status_info(instance, instance_spot_prices, pricing=pricing)
+            except Exception as e:
+                res[instance_name] = {'state': instance.state, 'location': region, 'error': str(e)}
+
+        return res
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        region_results = list(executor.map(get_region_status_info, region_configs))
+
+    results = {}
+    for region_result in region_results:
+        results.update(region_result)
+
+    return [results[instance_config.name] for instance_config in instance_configs]
@@ -1,8 +1,9 @@
 import os
-import subprocess
 import tempfile
 from glob import glob
-from spotty.providers.aws.helpers.s3_sync import get_s3_sync_command
+import boto3
+from spotty.commands.writers.null_output_writrer import NullOutputWriter
+from spotty.providers.aws.helpers.s3_sync import sync_s3_to_local
 
 
 def get_logs_s3_path(bucket_name: str, instance_name: str) -> str:
@@ -15,8 +16,8 @@ def download_logs(bucket_name: str, instance_name: str, stack_uuid: str, region:
     local_logs_dir = tempfile.mkdtemp()
 
     # download logs
-    download_cmd = get_s3_sync_command(logs_s3_path, local_logs_dir, region=region, exact_timestamp=True, quiet=True)
-    subprocess.call(download_cmd, shell=True)
+    s3 = boto3.client('s3', region_name=region)
+    sync_s3_to_local(s3, logs_s3_path, local_logs_dir, NullOutputWriter(), exact_timestamp=True)
 
     # get paths to the downloaded files
     log_paths = glob(os.path.join(local_logs_dir, '**', '*'), recursive=True)
@@ -0,0 +1,125 @@
+import json
+import logging
+import os
+import sqlite3
+import time
+from typing import Dict, Iterable
+from spotty.configuration import get_spotty_cache_dir
+
+
+# On-Demand prices are updated by AWS rarely, so the index is valid for a week
+ON_DEMAND_PRICES_TTL = 7 * 24 * 3600
+
+
+class OnDemandPriceIndex(object):
+    """Local index of the On-Demand Instance prices: region x instance type x OS -> $/hour.
+
+    The index is stored in an SQLite database and is filled region by region by the
+    "spotty aws refresh-prices" command. Prices of a region are used only until the TTL expires.
+    """
+
+    def __init__(self, ttl: int = ON_DEMAND_PRICES_TTL):
+        self._ttl = ttl
+        self._db_path = os.path.join(get_spotty_cache_dir('aws'), 'on_demand_prices.sqlite')
+
+    def _connect(self):
+        conn = sqlite3.connect(self._db_path)
+        conn.execute('CREATE TABLE IF NOT EXISTS regions (region TEXT PRIMARY KEY, updated_at REAL NOT NULL)')
+        conn.execute('CREATE TABLE IF NOT EXISTS prices (region TEXT NOT NULL, instance_type TEXT NOT NULL, '
+                     'os TEXT NOT NULL, price REAL NOT NULL, PRIMARY KEY (region, instance_type, os)) '
+                     'WITHOUT ROWID')
+
+        return conn
+
+    def get_price(self, region: str, instance_type: str, os_name: str = 'Linux') -> float:
+        """Returns a price or None if the region is not indexed, the index is expired or the price
+        is not found."""
+        try:
+            conn = self._connect()
+        except sqlite3.Error as e:
+            logging.debug('Couldn\'t open the price index: ' + str(e))
+            return None
+
+        try:
+            row = conn.execute('SELECT updated_at FROM regions WHERE region = ?', (region,)).fetchone()
+            if not row or (time.time() - row[0] > self._ttl):
+                return None
+
+            row = conn.execute('SELECT price FROM prices WHERE region = ? AND instance_type = ? AND os = ?',
+                               (region, instance_type, os_name)).fetchone()
+        except sqlite3.Error as e:
+            logging.debug('Couldn\'t read the price index: ' + str(e))
+            return None
+        finally:
+            conn.close()
+
+        return row[0] if row else None
+
+    def update_region(self, region: str, prices: Dict[tuple, float]):
+        """Replaces all prices of the region.
+
+        Args:
+            region: AWS region.
+            prices: Prices for each (instance type, OS) pair.
+        """
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute('DELETE FROM prices WHERE region = ?', (region,))
+                conn.executemany('INSERT INTO prices (region, instance_type, os, price) VALUES (?, ?, ?, ?)',
+                                 [(region, instance_type, os_name, price)
+                                  for (instance_type, os_name), price in prices.items()])
+                conn.execute('INSERT OR REPLACE INTO regions (region, updated_at) VALUES (?, ?)',
+                             (region, time.time()))
+        finally:
+            conn.close()
+
+
+def get_on_demand_prices_from_api(pricing, region: str, instance_type: str = None) -> Dict[tuple, float]:
+    """Requests On-Demand prices for the region from the Pricing API.
+
+    Args:
+        pricing: Pricing API client (the API available only in "us-east-1").
+        region: AWS region.
+        instance_type: Instance type. If it's not specified, returns prices for all instance types.
+
+    Returns:
+        Prices for each (instance type, OS) pair.
+    """
+    filters = [
+        {'Type': 'TERM_MATCH', 'Field': 'regionCode', 'Value': region},
+        {'Type': 'TERM_MATCH', 'Field': 'tenancy', 'Value': 'Shared'},
+        {'Type': 'TERM_MATCH', 'Field': 'capacitystatus', 'Value': 'Used'},
+        {'Type': 'TERM_MATCH', 'Field': 'preInstalledSw', 'Value': 'NA'},
+        {'Type': 'TERM_MATCH', 'Field': 'licenseModel', 'Value': 'No License required'},
+    ]
+
+    if instance_type:
+        filters.append({'Type': 'TERM_MATCH', 'Field': 'instanceType', 'Value': instance_type})
+
+    paginator = pricing.get_paginator('get_products')
+    pages = paginator.paginate(ServiceCode='AmazonEC2', Filters=filters)
+
+    return parse_price_list(price_item for page in pages for price_item in page['PriceList'])
+
+
+def parse_price_list(price_list: Iterable[str]) -> Dict[tuple, float]:
+    """Parses products returned by the Pricing API.
+
+    Returns:
+        Prices for each (instance type, OS) pair.
+    """
+    prices = {}
+    for price_item in price_list:
+        product = json.loads(price_item)
+        attributes = product['product']['attributes']
+        if ('instanceType' not in attributes) or ('operatingSystem' not in attributes):
+            continue
+
+        for term in product['terms'].get('OnDemand', {}).values():
+            for price_dimension in term['priceDimensions'].values():
+                price = float(price_dimension['pricePerUnit'].get('USD', 0))
+                if price:
+                    prices[(attributes['instanceType'], attributes['operatingSystem'])] = price
+
+    return prices
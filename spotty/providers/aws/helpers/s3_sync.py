@@ -1,11 +1,21 @@
-from shutil import which
+import hashlib
+import os
+import time
+from collections import namedtuple
+from typing import Dict, List
+from boto3.s3.transfer import TransferConfig, create_transfer_manager
+from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
 from spotty.deployment.utils.cli import shlex_join
+from spotty.deployment.utils.sync_filters import list_local_files, is_path_included, LocalFile
 
 
-def check_aws_installed():
-    """Checks that AWS CLI is installed."""
-    if which('aws') is None:
-        raise ValueError('AWS CLI is not installed.')
+# maximum number of threads that transfer files between S3 and local
+DEFAULT_MAX_CONCURRENCY = 10
+
+# maximum number of "aws s3 cp" commands to download the changed files one by one
+MAX_SINGLE_COPY_COMMANDS = 5
+
+S3Object = namedtuple('S3Object', ['key', 'size', 'mtime', 'etag'])
 
 
 def get_s3_sync_command(from_path: str, to_path: str, profile: str = None, region: str = None, filters: list = None,
@@ -51,3 +61,256 @@ def get_s3_sync_command(from_path: str, to_path: str, profile: str = None, regio
     command = shlex_join(args)
 
     return command
+
+
+def get_s3_download_files_command(s3_path: str, local_dir: str, download_paths: List[str],
+                                  delete_paths: List[str] = None, region: str = None):
+    """Builds a shell command that downloads only the specified objects from S3 and deletes the
+    specified local files. Unlike "aws s3 sync", it doesn't compare the whole directory with the bucket.
+
+    Args:
+        s3_path: S3 path in the "s3://<bucket>/<prefix>" format.
+        local_dir: Local directory.
+        download_paths: Paths of the objects relative to the S3 path (with "/" separators).
+        delete_paths: Paths of the files relative to the local directory.
+        region: AWS region.
+    """
+    s3_path = s3_path.rstrip('/')
+    local_dir = local_dir.rstrip('/')
+    region_args = ['--region', region] if region else []
+
+    commands = []
+    if delete_paths:
+        commands.append(shlex_join(['rm', '-f'] + [local_dir + '/' + rel_path for rel_path in delete_paths]))
+
+    if len(download_paths) <= MAX_SINGLE_COPY_COMMANDS:
+        # copy a few objects one by one, so the bucket won't be listed
+        for rel_path in download_paths:
+            commands.append(shlex_join(['aws'] + region_args + ['s3', 'cp', s3_path + '/' + rel_path,
+                                                                local_dir + '/' + rel_path]))
+    else:
+        # copy all the objects with a single command, it lists the bucket but not the local directory
+        args = ['aws'] + region_args + ['s3', 'cp', s3_path, local_dir, '--recursive', '--exclude', '*']
+        for rel_path in download_paths:
+            args += ['--include', rel_path]
+
+        commands.append(shlex_join(args))
+
+    return ' && '.join(commands)
+
+
+def sync_local_to_s3(s3, local_dir: str, s3_path: str, output: AbstractOutputWriter, filters: list = None,
+                     delete: bool = False, dry_run: bool = False, max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
+    """Uploads new and changed files from a local directory to S3 in parallel.
+
+    It's an in-process replacement for the "aws s3 sync" command: a file is uploaded if it doesn't exist
+    in the bucket, if its size is different, or if the local file was modified after the S3 object
+    and its content doesn't match the ETag of the object.
+
+    Args:
+        s3: S3 boto3 client.
+        local_dir: Local directory.
+        s3_path: S3 path in the "s3://<bucket>/<prefix>" format.
+        output: Output writer.
+        filters: Sync filters with the "aws s3 sync" semantics.
+        delete: Delete S3 objects that don't exist locally.
+        dry_run: Only display the operations that would be performed.
+        max_concurrency: Maximum number of threads that upload files.
+    """
+    bucket_name, prefix = _parse_s3_path(s3_path)
+
+    local_files = list_local_files(local_dir, filters)
+    s3_objects = list_s3_objects(s3, bucket_name, prefix, filters)
+
+    # get new and changed files
+    upload_paths = [rel_path for rel_path, local_file in sorted(local_files.items())
+                    if _is_upload_required(local_file, s3_objects.get(rel_path))]
+
+    # get deleted files
+    delete_paths = sorted(set(s3_objects) - set(local_files)) if delete else []
+
+    upload_files_to_s3(s3, local_dir, s3_path, upload_paths, output, delete_paths=delete_paths, dry_run=dry_run,
+                       max_concurrency=max_concurrency)
+
+
+def upload_files_to_s3(s3, local_dir: str, s3_path: str, upload_paths: List[str], output: AbstractOutputWriter,
+                       delete_paths: List[str] = None, dry_run: bool = False,
+                       max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
+    """Uploads the specified files to S3 in parallel and deletes S3 objects for the deleted files.
+    The bucket is not listed, so the caller is responsible for finding changed files.
+
+    Args:
+        upload_paths: Paths of the files relative to the local directory (with "/" separators).
+        delete_paths: Paths of the deleted files relative to the local directory.
+    """
+    bucket_name, prefix = _parse_s3_path(s3_path)
+
+    transfers = []
+    for rel_path in upload_paths:
+        local_path = os.path.join(local_dir, *rel_path.split('/'))
+        transfers.append((local_path, bucket_name, prefix + rel_path, os.path.getsize(local_path),
+                          'upload: ./%s to s3://%s/%s' % (rel_path, bucket_name, prefix + rel_path)))
+
+    _run_transfers(s3, transfers, output, upload=True, dry_run=dry_run, max_concurrency=max_concurrency)
+
+    # delete objects in batches
+    delete_keys = [prefix + rel_path for rel_path in (delete_paths or [])]
+    for key in delete_keys:
+        output.write('%sdelete: s3://%s/%s' % ('(dryrun) ' if dry_run else '', bucket_name, key))
+
+    if not dry_run:
+        for i in range(0, len(delete_keys), 1000):
+            s3.delete_objects(Bucket=bucket_name, Delete={
+                'Objects': [{'Key': key} for key in delete_keys[i:i + 1000]],
+                'Quiet': True,
+            })
+
+
+def sync_s3_to_local(s3, s3_path: str, local_dir: str, output: AbstractOutputWriter, filters: list = None,
+                     exact_timestamp: bool = False, dry_run: bool = False,
+                     max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
+    """Downloads new and changed objects from S3 to a local directory in parallel.
+
+    An object is downloaded if the local file doesn't exist, if its size is different, or if the S3 object was
+    modified after the local file (or its modification time is different if "exact_timestamp" is True).
+    Modification times of the downloaded files are set to the modification times of the S3 objects.
+    """
+    bucket_name, prefix = _parse_s3_path(s3_path)
+
+    s3_objects = list_s3_objects(s3, bucket_name, prefix, filters)
+    local_files = list_local_files(local_dir, filters) if os.path.isdir(local_dir) else {}
+
+    def is_changed(s3_object: S3Object, local_file: LocalFile):
+        if exact_timestamp:
+            return int(s3_object.mtime) != int(local_file.mtime)
+
+        return s3_object.mtime > local_file.mtime
+
+    download_paths = [rel_path for rel_path, s3_object in sorted(s3_objects.items())
+                      if (rel_path not in local_files)
+                      or (s3_object.size != local_files[rel_path].size)
+                      or is_changed(s3_object, local_files[rel_path])]
+
+    transfers = [(os.path.join(local_dir, *rel_path.split('/')), bucket_name, s3_objects[rel_path].key,
+                  s3_objects[rel_path].size,
+                  'download: s3://%s/%s to %s' % (bucket_name, s3_objects[rel_path].key, rel_path))
+                 for rel_path in download_paths]
+
+    _run_transfers(s3, transfers, output, upload=False, dry_run=dry_run, max_concurrency=max_concurrency)
+
+    # keep modification times of the objects, so the files won't be downloaded again
+    if not dry_run:
+        for rel_path in download_paths:
+            mtime = s3_objects[rel_path].mtime
+            os.utime(os.path.join(local_dir, *rel_path.split('/')), (mtime, mtime))
+
+
+def list_s3_objects(s3, bucket_name: str, prefix: str, filters: list = None) -> Dict[str, S3Object]:
+    """Returns S3 objects under the prefix that match the filters.
+
+    Returns:
+        A dictionary where keys are object keys relative to the prefix.
+    """
+    s3_objects = {}
+    paginator = s3.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix):
+        for row in page.get('Contents', []):
+            rel_path = row['Key'][len(prefix):]
+            if not rel_path or rel_path.endswith('/') or not is_path_included(rel_path, filters):
+                continue
+
+            s3_objects[rel_path] = S3Object(key=row['Key'], size=row['Size'],
+                                            mtime=row['LastModified'].timestamp(), etag=row['ETag'].strip('"'))
+
+    return s3_objects
+
+
+def _is_upload_required(local_file: LocalFile, s3_object: S3Object) -> bool:
+    if not s3_object or (local_file.size != s3_object.size):
+        return True
+
+    if local_file.mtime <= s3_object.mtime:
+        return False
+
+    # the file was touched, compare its content with the ETag if it's an MD5 hash (not a multipart upload)
+    if '-' in s3_object.etag:
+        return True
+
+    md5 = hashlib.md5()
+    with open(local_file.path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            md5.update(chunk)
+
+    return md5.hexdigest() != s3_object.etag
+
+
+def _run_transfers(s3, transfers: list, output: AbstractOutputWriter, upload: bool, dry_run: bool,
+                   max_concurrency: int):
+    """Uploads or downloads files using the boto3 transfer manager.
+
+    Args:
+        transfers: A list of tuples: (local path, bucket name, key, size, message).
+    """
+    if dry_run:
+        for _, _, _, _, msg in transfers:
+            output.write('(dryrun) ' + msg)
+
+        return
+
+    if not transfers:
+        return
+
+    start_time = time.time()
+    transfer_config = TransferConfig(max_concurrency=max_concurrency)
+    failed_msgs = []
+    with create_transfer_manager(s3, transfer_config) as manager:
+        futures = []
+        for local_path, bucket_name, key, _, _ in transfers:
+            if upload:
+                future = manager.upload(local_path, bucket_name, key)
+            else:
+                os.makedirs(os.path.dirname(local_path), exist_ok=True)
+                future = manager.download(bucket_name, key, local_path)
+
+            futures.append(future)
+
+        for future, (_, _, _, _, msg) in zip(futures, transfers):
+            try:
+                future.result()
+                output.write(msg)
+            except Exception as e:
+                failed_msgs.append('%s (%s)' % (msg, str(e)))
+
+    if failed_msgs:
+        raise ValueError('Failed to %s the files:\n  %s' % ('upload' if upload else 'download',
+                                                            '\n  '.join(failed_msgs)))
+
+    # display the throughput
+    total_secs = max(time.time() - start_time, 0.001)
+    total_bytes = sum(size for _, _, _, size, _ in transfers)
+    output.write('%s %d file(s), %s in %.1fs (%s/s)' % ('Uploaded' if upload else 'Downloaded', len(transfers),
+                                                       _format_size(total_bytes), total_secs,
+                                                       _format_size(total_bytes / total_secs)))
+
+
+def _parse_s3_path(s3_path: str) -> (str, str):
+    """Splits an S3 path into a bucket name and a key prefix (with a trailing slash)."""
+    if not s3_path.startswith('s3://'):
+        raise ValueError('Invalid S3 path: "%s".' % s3_path)
+
+    bucket_name, _, prefix = s3_path[len('s3://'):].partition('/')
+    prefix = prefix.strip('/')
+    if prefix:
+        prefix += '/'
+
+    return bucket_name, prefix
+
+
+def _format_size(size: float) -> str:
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if size < 1024:
+            return '%.1f %s' % (size, unit)
+
+        size /= 1024
+
+    return '%.1f TB' % size
@@ -0,0 +1,74 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict
+from spotty.configuration import get_spotty_cache_dir
+
+
+# Spot prices change rarely, so they can be reused for a few minutes
+SPOT_PRICES_CACHE_TTL = 300
+
+
+class SpotPriceCache(object):
+    """On-disk cache for the Spot Instance prices.
+
+    Prices are keyed by a region and an instance type, each entry expires after
+    the TTL. The cache is shared by all Spotty commands, so the prices fetched by one
+    command can be reused by the next one.
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, ttl: int = SPOT_PRICES_CACHE_TTL):
+        self._ttl = ttl
+        self._cache_path = os.path.join(get_spotty_cache_dir('aws'), 'spot_prices.json')
+
+    @staticmethod
+    def _get_key(region: str, instance_type: str) -> str:
+        return '%s:%s' % (region, instance_type)
+
+    def _load(self) -> dict:
+        try:
+            with open(self._cache_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def get_prices(self, region: str, instance_type: str) -> Dict[str, float]:
+        """Returns prices by availability zones or None if the prices are not cached or expired."""
+        with self._lock:
+            entry = self._load().get(self._get_key(region, instance_type))
+
+        if not entry or (time.time() - entry['timestamp'] > self._ttl):
+            return None
+
+        return entry['prices']
+
+    def set_prices(self, prices: Dict[tuple, Dict[str, float]]):
+        """Saves the prices.
+
+        Args:
+            prices: Prices by availability zones for each (region, instance type) pair.
+        """
+        with self._lock:
+            data = self._load()
+
+            # remove expired entries
+            now = time.time()
+            data = {key: entry for key, entry in data.items() if now - entry['timestamp'] <= self._ttl}
+
+            for (region, instance_type), zone_prices in prices.items():
+                data[self._get_key(region, instance_type)] = {'timestamp': now, 'prices': zone_prices}
+
+            tmp_path = '%s.%d.tmp' % (self._cache_path, os.getpid())
+            try:
+                with open(tmp_path, 'w') as f:
+                    json.dump(data, f)
+
+                os.replace(tmp_path, self._cache_path)
+            except OSError as e:
+                logging.debug('Couldn\'t save the Spot prices cache: ' + str(e))
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
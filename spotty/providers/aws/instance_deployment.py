@@ -1,15 +1,23 @@
 import boto3
 from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
+from spotty.commands.writers.null_output_writrer import NullOutputWriter
+from spotty.commands.writers.prefixed_output_writrer import PrefixedOutputWriter
 from spotty.deployment.abstract_cloud_instance.abstract_instance_deployment import AbstractInstanceDeployment
 from spotty.deployment.container.docker.docker_commands import DockerCommands
 from spotty.providers.aws.cfn_templates.instance.template import prepare_instance_template, get_template_parameters
+from spotty.providers.aws.config.ebs_volume import EbsVolume
 from spotty.providers.aws.data_transfer import DataTransfer
+from spotty.providers.aws.helpers.ami import get_ami
 from spotty.providers.aws.helpers.availability_zone import update_availability_zone
 from spotty.providers.aws.helpers.instance_prices import check_max_spot_price
 from spotty.providers.aws.helpers.subnet import check_az_and_subnet
+from spotty.providers.aws.helpers.vpc import get_vpc_id
 from spotty.providers.aws.resource_managers.key_pair_manager import KeyPairManager
 from spotty.deployment.utils.print_info import render_volumes_info_table
+from spotty.deployment.utils.task_graph import run_task_graph, graph_task
 from spotty.providers.aws.resources.instance import Instance
+from spotty.providers.aws.resources.snapshot import Snapshot
+from spotty.providers.aws.resources.volume import Volume
 from spotty.providers.aws.config.instance_config import InstanceConfig
 from spotty.providers.aws.deletion_policies import apply_deletion_policies
 from spotty.providers.aws.resource_managers.instance_profile_stack_manager import InstanceProfileStackManager
@@ -40,58 +48,98 @@ class InstanceDeployment(AbstractInstanceDeployment):
 
     def deploy(self, container_commands: DockerCommands, bucket_name: str,
                data_transfer: DataTransfer, output: AbstractOutputWriter, dry_run: bool = False):
-        # get deployment availability zone
-        availability_zone = update_availability_zone(self._ec2, self.instance_config.availability_zone,
-                                                     self.instance_config.volumes)
-
-        # check availability zone and subnet configuration
-        check_az_and_subnet(self._ec2, self.instance_config.region, availability_zone, self.instance_config.subnet_id)
-
-        # check the maximum price for a spot instance
-        check_max_spot_price(self._ec2, self.instance_config.instance_type, self.instance_config.is_spot_instance,
-                             self.instance_config.max_price, availability_zone)
-
-        # sync the project with the S3 bucket
-        if bucket_name is not None:
-            output.write('Syncing the project with the S3 bucket...')
-            data_transfer.upload_local_to_bucket(bucket_name, dry_run=dry_run)
-
-        # create or update instance profile
-        if not dry_run:
-            instance_profile_stack_manager = InstanceProfileStackManager(
-                self._project_name, self.instance_config.name, self.instance_config.region)
-            if not self.instance_config.instance_profile_arn:
-                instance_profile_arn = instance_profile_stack_manager.create_or_update_stack(
-                    self.instance_config.managed_policy_arns, output=output)
-            else:
-                instance_profile_arn = self.instance_config.instance_profile_arn
-        else:
-            instance_profile_arn = None
-
-        # create a key pair if it doesn't exist
-        if not dry_run:
-            self.key_pair_manager.maybe_create_key()
+        # names of the EBS volumes and their snapshots
+        ebs_volume_names = [volume.ec2_volume_name for volume in self.instance_config.volumes
+                            if isinstance(volume, EbsVolume)]
+
+        # boto3 clients are created in the main thread, because creating them is not thread-safe
+        instance_profile_stack_manager = InstanceProfileStackManager(
+            self._project_name, self.instance_config.name, self.instance_config.region)
+        key_pair_manager = self.key_pair_manager
+
+        # the steps write to the output concurrently, so their lines are written only once they're complete
+        profile_output = PrefixedOutputWriter(output, '')
+        upload_output = PrefixedOutputWriter(output, '')
+
+        def create_or_update_instance_profile(_):
+            if dry_run:
+                return None
+
+            if self.instance_config.instance_profile_arn:
+                return self.instance_config.instance_profile_arn
+
+            return instance_profile_stack_manager.create_or_update_stack(self.instance_config.managed_policy_arns,
+                                                                         output=profile_output)
+
+        def upload_project(_):
+            if bucket_name is not None:
+                upload_output.write('Syncing the project with the S3 bucket...')
+                data_transfer.upload_local_to_bucket(bucket_name, output=upload_output, dry_run=dry_run)
+
+        # run independent preflight steps concurrently
+        res = run_task_graph([
+            # get existing volumes and snapshots
+            graph_task('get_volumes', lambda _: Volume.get_by_names(self._ec2, ebs_volume_names)),
+            graph_task('get_snapshots', lambda _: Snapshot.get_by_names(self._ec2, ebs_volume_names)),
+
+            # get deployment availability zone
+            graph_task('get_availability_zone', lambda res: update_availability_zone(
+                self.instance_config.availability_zone, self.instance_config.volumes, res['get_volumes']),
+                ['get_volumes']),
+
+            # check availability zone and subnet configuration
+            graph_task('check_az_and_subnet', lambda res: check_az_and_subnet(
+                self._ec2, self.instance_config.region, res['get_availability_zone'], self.instance_config.subnet_id),
+                ['get_availability_zone']),
+
+            # check the maximum price for a spot instance
+            graph_task('check_max_spot_price', lambda res: check_max_spot_price(
+                self._ec2, self.instance_config.instance_type, self.instance_config.is_spot_instance,
+                self.instance_config.max_price, res['get_availability_zone']),
+                ['get_availability_zone']),
+
+            # get an AMI and a VPC
+            graph_task('get_ami', lambda _: get_ami(self._ec2, self.instance_config.ami_id,
+                                                    self.instance_config.ami_name)),
+            graph_task('get_vpc_id', lambda _: get_vpc_id(self._ec2, self.instance_config.subnet_id)),
+
+            # create a key pair if it doesn't exist and the configuration is checked
+            graph_task('create_key_pair', lambda _: None if dry_run else key_pair_manager.maybe_create_key(),
+                       ['check_az_and_subnet', 'check_max_spot_price']),
+
+            # create or update instance profile once the configuration is checked
+            graph_task('create_instance_profile', create_or_update_instance_profile,
+                       ['check_az_and_subnet', 'check_max_spot_price']),
+
+            # sync the project with the S3 bucket once the configuration is checked
+            graph_task('upload_project', upload_project, ['check_az_and_subnet', 'check_max_spot_price']),
+        ])
+
+        availability_zone = res['get_availability_zone']
+        instance_profile_arn = res['create_instance_profile']
 
         output.write('Preparing CloudFormation template...')
 
         # prepare CloudFormation template
         with output.prefix('  '):
             template = prepare_instance_template(
-                ec2=self._ec2,
                 instance_config=self.instance_config,
                 docker_commands=container_commands,
                 availability_zone=availability_zone,
                 sync_project_cmd=data_transfer.get_download_bucket_to_instance_command(bucket_name=bucket_name),
+                ec2_volumes=res['get_volumes'],
+                snapshots=res['get_snapshots'],
                 output=output,
             )
 
             # get parameters for the template
             parameters = get_template_parameters(
-                ec2=self._ec2,
                 instance_config=self.instance_config,
                 instance_profile_arn=instance_profile_arn,
                 bucket_name=bucket_name,
-                key_pair_name=self.key_pair_manager.key_name,
+                key_pair_name=key_pair_manager.key_name,
+                ami=res['get_ami'],
+                vpc_id=res['get_vpc_id'],
                 output=output,
             )
 
@@ -119,21 +167,76 @@ class InstanceDeployment(AbstractInstanceDeployment):
 
                 raise ValueError('Stack "%s" was not created.\n%s' % (stack.name, logs_str))
 
-    def delete(self, output: AbstractOutputWriter):
+    def update(self, container_commands: DockerCommands, bucket_name: str, data_transfer: DataTransfer,
+               output: AbstractOutputWriter) -> bool:
+        instance = self.get_instance()
+        if not instance or not instance.is_running:
+            return False
+
+        instance_profile_stack_manager = InstanceProfileStackManager(
+            self._project_name, self.instance_config.name, self.instance_config.region)
+
+        def create_or_update_instance_profile(_):
+            if self.instance_config.instance_profile_arn:
+                return self.instance_config.instance_profile_arn
+
+            return instance_profile_stack_manager.create_or_update_stack(self.instance_config.managed_policy_arns,
+                                                                         output=NullOutputWriter())
+
+        res = run_task_graph([
+            graph_task('get_ami', lambda _: get_ami(self._ec2, self.instance_config.ami_id,
+                                                    self.instance_config.ami_name)),
+            graph_task('get_vpc_id', lambda _: get_vpc_id(self._ec2, self.instance_config.subnet_id)),
+            graph_task('create_instance_profile', create_or_update_instance_profile),
+        ])
+
+        # the template is rendered without volumes, they are taken from the template of the running instance
+        template = prepare_instance_template(
+            instance_config=self.instance_config,
+            docker_commands=container_commands,
+            availability_zone=instance.availability_zone,
+            sync_project_cmd=data_transfer.get_download_bucket_to_instance_command(bucket_name=bucket_name),
+            ec2_volumes={},
+            snapshots={},
+            output=NullOutputWriter(),
+            include_volumes=False,
+        )
+
+        parameters = get_template_parameters(
+            instance_config=self.instance_config,
+            instance_profile_arn=res['create_instance_profile'],
+            bucket_name=bucket_name,
+            key_pair_name=self.key_pair_manager.key_name,
+            ami=res['get_ami'],
+            vpc_id=res['get_vpc_id'],
+            output=NullOutputWriter(),
+        )
+
+        return self.stack_manager.update_stack(template, parameters, output)
+
+    def delete(self, output: AbstractOutputWriter, wait: bool = True):
         # terminate the instance
         instance = self.get_instance()
         if instance:
             output.write('Terminating the instance... ', newline=False)
-            instance.terminate()
-            output.write('DONE')
+            instance.terminate(wait=wait)
+            output.write('DONE' if wait else 'STARTED')
         else:
             output.write('The instance was already terminated.')
 
         # delete the stack in background if it exists
         self.stack_manager.delete_stack(output, no_wait=True)
 
+        if wait:
+            self._apply_deletion_policies(output)
+
+    def finish_delete(self, output: AbstractOutputWriter):
+        # volumes become available once the instance is terminated
+        self._apply_deletion_policies(output, wait_volumes=True)
+
+    def _apply_deletion_policies(self, output: AbstractOutputWriter, wait_volumes: bool = False):
         output.write('Applying deletion policies for the volumes...')
 
         # apply deletion policies for the volumes
         with output.prefix('  '):
-            apply_deletion_policies(self._ec2, self.instance_config.volumes, output)
+            apply_deletion_policies(self._ec2, self.instance_config.volumes, output, wait_volumes=wait_volumes)
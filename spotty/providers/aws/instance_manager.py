@@ -1,8 +1,11 @@
+from typing import List
+from spotty.config.project_config import ProjectConfig
 from spotty.errors.instance_not_running import InstanceNotRunningError
 from spotty.deployment.abstract_cloud_instance.abstract_cloud_instance_manager import AbstractCloudInstanceManager
 from spotty.providers.aws.resource_managers.bucket_manager import BucketManager
 from spotty.providers.aws.config.instance_config import InstanceConfig
 from spotty.providers.aws.data_transfer import DataTransfer
+from spotty.providers.aws.helpers.instance_status import get_instance_status_info, get_instances_status_info
 from spotty.providers.aws.instance_deployment import InstanceDeployment
 from spotty.utils import render_table
 
@@ -38,6 +41,7 @@ class InstanceManager(AbstractCloudInstanceManager):
 
     def get_status_text(self):
         instance = self.instance_deployment.get_instance()
+        self.refresh_ssh_endpoint(instance)
         if not instance:
             raise InstanceNotRunningError(self.instance_config.name)
 
@@ -59,10 +63,24 @@ class InstanceManager(AbstractCloudInstanceManager):
         else:
             on_demand_price = instance.get_on_demand_price()
             table.append(('Purchasing Option', 'On-Demand Instance'))
-            table.append(('Instance Price', ('$%.04f (us-east-1)' % on_demand_price) if on_demand_price else 'Unknown'))
+            table.append(('Instance Price', ('$%.04f' % on_demand_price) if on_demand_price else 'Unknown'))
 
         return render_table(table)
 
+    def get_status_info(self) -> dict:
+        instance = self.instance_deployment.get_instance()
+        self.refresh_ssh_endpoint(instance)
+        if not instance:
+            return {'state': 'not running', 'location': self.instance_config.region}
+
+        return get_instance_status_info(instance)
+
+    @classmethod
+    def get_instances_status_info(cls, project_config: ProjectConfig, instance_configs: List[dict]) -> List[dict]:
+        # instance managers are not created to avoid creating boto3 clients for each instance
+        return get_instances_status_info([InstanceConfig(instance_config, project_config)
+                                          for instance_config in instance_configs])
+
     @property
     def ssh_key_path(self):
         return self.instance_deployment.key_pair_manager.key_path
@@ -1,5 +1,5 @@
 import boto3
-from botocore.exceptions import ClientError, WaiterError
+from botocore.exceptions import ClientError
 from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
 from spotty.providers.aws.cfn_templates.instance_profile.template import prepare_instance_profile_template
 from spotty.providers.aws.resources.stack import Stack
@@ -34,8 +34,8 @@ class InstanceProfileStackManager(object):
                 self._create_stack(template, output)
 
             stack = Stack.get_by_name(self._cf, self._stack_name)
-        except WaiterError:
-            stack = None
+        except ValueError as e:
+            raise ValueError('Stack "%s" was not created.\n%s' % (self._stack_name, str(e)))
 
         if not stack or stack.status not in ['CREATE_COMPLETE', 'UPDATE_COMPLETE']:
             raise ValueError('Stack "%s" was not created.\n'
@@ -58,7 +58,7 @@ class InstanceProfileStackManager(object):
         )
 
         # wait for the stack to be created
-        stack.wait_stack_created(delay_secs=15)
+        stack.wait_stack_created()
 
     def _update_stack(self, template: str, output: AbstractOutputWriter):
         """Updates the stack and waits until it will be updated."""
@@ -79,4 +79,4 @@ class InstanceProfileStackManager(object):
         if updated_stack:
             # wait for the stack to be updated
             output.write('Updating IAM role for the instance...')
-            updated_stack.wait_stack_updated(delay=15)
+            updated_stack.wait_stack_updated()
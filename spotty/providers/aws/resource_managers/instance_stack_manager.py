@@ -1,5 +1,9 @@
+import logging
+import time
 import boto3
 from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
+from spotty.providers.aws.cfn_templates.instance.template import can_update_instance_stack, \
+    get_updated_instance_template
 from spotty.providers.aws.resources.stack import Stack, Task
 from spotty.providers.aws.config.instance_config import InstanceConfig
 
@@ -10,7 +14,11 @@ class InstanceStackManager(object):
         self._cf = boto3.client('cloudformation', region_name=region)
         self._ec2 = boto3.client('ec2', region_name=region)
         self._region = region
-        self._stack_name = 'spotty-instance-%s-%s' % (project_name.lower(), instance_name.lower())
+        self._stack_name = self.get_stack_name(project_name, instance_name)
+
+    @staticmethod
+    def get_stack_name(project_name: str, instance_name: str) -> str:
+        return 'spotty-instance-%s-%s' % (project_name.lower(), instance_name.lower())
 
     @property
     def name(self):
@@ -96,12 +104,57 @@ class InstanceStackManager(object):
 
         # wait for the stack to be created
         with output.prefix('  '):
-            stack.wait_tasks(tasks, resource_success_status='CREATE_COMPLETE', resource_fail_status='CREATE_FAILED',
-                             output=output)
+            stack.wait_tasks(tasks, resource_success_status='CREATE_COMPLETE', output=output)
             stack = stack.wait_status_changed(stack_waiting_status='CREATE_IN_PROGRESS', output=output)
 
         return stack
 
+    def update_stack(self, template: str, parameters: dict, output: AbstractOutputWriter) -> bool:
+        """Applies the container configuration and the ports from the template to the existing
+        stack using a change set if the running instance can be kept.
+
+        Returns:
+            False if the instance cannot be kept and the stack should be recreated.
+        """
+        stack = Stack.get_by_name(self._cf, self._stack_name)
+        if not stack or (stack.status not in ['CREATE_COMPLETE', 'UPDATE_COMPLETE']):
+            return False
+
+        live_template = stack.get_template_body()
+        if not can_update_instance_stack(live_template, stack.parameters, template, parameters):
+            return False
+
+        output.write('Updating the stack...')
+
+        change_set_name = '%s-%d' % (self._stack_name, time.time())
+        changes = stack.create_change_set(
+            change_set_name,
+            TemplateBody=get_updated_instance_template(live_template, template),
+            Parameters=[{'ParameterKey': key, 'UsePreviousValue': True} for key in stack.parameters],
+            Capabilities=['CAPABILITY_IAM'],
+        )
+
+        if changes is None:
+            # nothing to update
+            return True
+
+        # make sure that the resources are not going to be replaced
+        for change in changes:
+            resource_change = change['ResourceChange']
+            if (resource_change['Action'] != 'Modify') or (resource_change.get('Replacement', 'False') != 'False'):
+                logging.debug('Change set requires to recreate the stack: %s' % resource_change)
+                stack.delete_change_set(change_set_name)
+                return False
+
+        stack.execute_change_set(change_set_name)
+        try:
+            stack.wait_stack_updated()
+        except Exception as e:
+            raise ValueError('Stack "%s" was not updated. Error: %s\n'
+                             'See CloudFormation logs for details.' % (self._stack_name, str(e)))
+
+        return True
+
     def delete_stack(self, output: AbstractOutputWriter, no_wait=False):
         stack = Stack.get_by_name(self._cf, self._stack_name)
         if not stack:
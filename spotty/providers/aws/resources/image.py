@@ -42,8 +42,19 @@ class Image(object):
         return self._ami_info['BlockDeviceMappings'][0]['Ebs']['VolumeSize']
 
     def get_tag_value(self, tag_name):
-        tag_values = [tag['Value'] for tag in self._ami_info['Tags'] if tag['Key'] == tag_name]
+        tag_values = [tag['Value'] for tag in self._ami_info.get('Tags', []) if tag['Key'] == tag_name]
         if not tag_values:
             return None
 
         return tag_values[0]
+
+    def deregister(self, delete_snapshots: bool = True):
+        """Deregisters the AMI and deletes its snapshots."""
+        snapshot_ids = [mapping['Ebs']['SnapshotId'] for mapping in self._ami_info.get('BlockDeviceMappings', [])
+                        if 'SnapshotId' in mapping.get('Ebs', {})]
+
+        self._ec2.deregister_image(ImageId=self.image_id)
+
+        if delete_snapshots:
+            for snapshot_id in snapshot_ids:
+                self._ec2.delete_snapshot(SnapshotId=snapshot_id)
@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Dict, List
 from spotty.deployment.abstract_cloud_instance.resources.abstract_instance import AbstractInstance
 from spotty.providers.aws.helpers.instance_prices import get_current_spot_price, get_on_demand_price
 
@@ -27,6 +28,31 @@ class Instance(AbstractInstance):
 
         return Instance(ec2, res['Reservations'][0]['Instances'][0])
 
+    @staticmethod
+    def get_by_stack_names(ec2, stack_names: List[str]) -> Dict[str, 'Instance']:
+        """Returns running instances by their stack names using a single API call."""
+        if not stack_names:
+            return {}
+
+        paginator = ec2.get_paginator('describe_instances')
+        pages = paginator.paginate(Filters=[
+            {'Name': 'tag:aws:cloudformation:stack-name', 'Values': list(stack_names)},
+            {'Name': 'instance-state-name', 'Values': ['running']},
+        ])
+
+        instances = {}
+        for page in pages:
+            for reservation in page['Reservations']:
+                for instance_info in reservation['Instances']:
+                    stack_name = [tag['Value'] for tag in instance_info.get('Tags', [])
+                                  if tag['Key'] == 'aws:cloudformation:stack-name'][0]
+                    if stack_name in instances:
+                        raise ValueError('Several running instances for the stack "%s" are found.' % stack_name)
+
+                    instances[stack_name] = Instance(ec2, instance_info)
+
+        return instances
+
     @property
     def instance_id(self):
         return self._data['InstanceId']
@@ -71,9 +97,9 @@ class Instance(AbstractInstance):
         """Get current Spot Instance price for this instance."""
         return get_current_spot_price(self._ec2, self.instance_type, self.availability_zone)
 
-    def get_on_demand_price(self):
-        """Get On-demand Instance price for the same instance in the us-east-1 region."""
-        return get_on_demand_price(self.instance_type, 'us-east-1')
+    def get_on_demand_price(self, pricing=None):
+        """Get On-demand Instance price for this instance."""
+        return get_on_demand_price(self.instance_type, self._ec2.meta.region_name, pricing=pricing)
 
     def terminate(self, wait: bool = True):
         self._ec2.terminate_instances(InstanceIds=[self.instance_id])
@@ -1,4 +1,5 @@
 import time
+from typing import Dict, List
 
 
 class Snapshot(object):
@@ -22,6 +23,36 @@ class Snapshot(object):
 
         return Snapshot(ec2, res['Snapshots'][0])
 
+    @staticmethod
+    def get_by_names(ec2, snapshot_names: List[str]) -> Dict[str, 'Snapshot']:
+        """Returns snapshots by their names using a single API call."""
+        snapshots = {}
+        for name, named_snapshots in Snapshot.group_by_names(ec2, snapshot_names).items():
+            if len(named_snapshots) > 1:
+                raise ValueError('Several snapshots with Name=%s found.' % name)
+
+            snapshots[name] = named_snapshots[0]
+
+        return snapshots
+
+    @staticmethod
+    def group_by_names(ec2, snapshot_names: List[str]) -> Dict[str, List['Snapshot']]:
+        """Returns all snapshots with the names using a single API call, grouped by the names.
+        Unlike the "get_by_names" method, it doesn't fail if several snapshots have the same name."""
+        if not snapshot_names:
+            return {}
+
+        res = ec2.describe_snapshots(Filters=[
+            {'Name': 'tag:Name', 'Values': list(snapshot_names)},
+        ])
+
+        snapshots = {}
+        for snapshot_info in res['Snapshots']:
+            snapshot = Snapshot(ec2, snapshot_info)
+            snapshots.setdefault(snapshot.name, []).append(snapshot)
+
+        return snapshots
+
     @property
     def name(self) -> str:
         snapshot_name = [tag['Value'] for tag in self._snapshot_info['Tags'] if tag['Key'] == 'Name']
@@ -51,4 +82,5 @@ class Snapshot(object):
 
     def wait_snapshot_completed(self):
         waiter = self._ec2.get_waiter('snapshot_completed')
-        waiter.wait(SnapshotIds=[self.snapshot_id])
+        # snapshots of large volumes can take much longer than the default 10 minutes
+        waiter.wait(SnapshotIds=[self.snapshot_id], WaiterConfig={'Delay': 15, 'MaxAttempts': 480})
@@ -1,8 +1,9 @@
 from collections import namedtuple
-from time import sleep
-from typing import List, Dict
+from time import sleep, time
+from typing import List
 from botocore.exceptions import EndpointConnectionError, ClientError
 from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
+from spotty.deployment.utils.polling import AdaptiveDelay
 import logging
 
 
@@ -14,6 +15,7 @@ class Stack(object):
     def __init__(self, cf, stack_info):
         self._cf = cf
         self._stack_info = stack_info
+        self._events = None
 
     @staticmethod
     def get_by_name(cf, stack_name: str):
@@ -40,8 +42,14 @@ class Stack(object):
 
     @staticmethod
     def update_stack(cf, *args, **kwargs):
+        # skip the events of the previous operations
+        events = StackEvents(cf, kwargs['StackName'], skip_existing=True)
+
         res = cf.update_stack(*args, **kwargs)
-        return Stack(cf, res)
+        stack = Stack(cf, res)
+        stack._events = events
+
+        return stack
 
     @property
     def stack_id(self) -> str:
@@ -63,78 +71,260 @@ class Stack(object):
     def outputs(self) -> str:
         return self._stack_info['Outputs']
 
+    @property
+    def parameters(self) -> dict:
+        return {row['ParameterKey']: row['ParameterValue'] for row in self._stack_info.get('Parameters', [])}
+
+    def get_template_body(self) -> str:
+        """Returns the original template of the stack."""
+        res = self._cf.get_template(StackName=self.stack_id, TemplateStage='Original')
+
+        return res['TemplateBody']
+
+    def create_change_set(self, change_set_name: str, **kwargs) -> List[dict]:
+        """Creates a change set for the stack and waits until it's created.
+
+        Returns:
+            A list of changes or None if the change set doesn't contain any changes.
+
+        Raises:
+            ValueError: If the change set cannot be created.
+        """
+        self._cf.create_change_set(StackName=self.stack_id, ChangeSetName=change_set_name, ChangeSetType='UPDATE',
+                                   **kwargs)
+
+        delay = AdaptiveDelay()
+        while True:
+            res = self._cf.describe_change_set(StackName=self.stack_id, ChangeSetName=change_set_name)
+            if res['Status'] == 'CREATE_COMPLETE':
+                break
+
+            if res['Status'] == 'FAILED':
+                self.delete_change_set(change_set_name)
+
+                reason = res.get('StatusReason', '')
+                if ('didn\'t contain changes' in reason) or ('No updates are to be performed' in reason):
+                    return None
+
+                raise ValueError('Change set for the stack "%s" was not created: %s' % (self.name, reason))
+
+            delay.sleep()
+
+        changes = res['Changes']
+        while res.get('NextToken'):
+            res = self._cf.describe_change_set(StackName=self.stack_id, ChangeSetName=change_set_name,
+                                               NextToken=res['NextToken'])
+            changes += res['Changes']
+
+        return changes
+
+    def execute_change_set(self, change_set_name: str):
+        # skip the events of the previous operations
+        self._events = StackEvents(self._cf, self.stack_id, skip_existing=True)
+
+        return self._cf.execute_change_set(StackName=self.stack_id, ChangeSetName=change_set_name)
+
+    def delete_change_set(self, change_set_name: str):
+        return self._cf.delete_change_set(StackName=self.stack_id, ChangeSetName=change_set_name)
+
     def delete(self):
+        # skip the events of the previous operations
+        self._events = StackEvents(self._cf, self.stack_id, skip_existing=True)
+
         return self._cf.delete_stack(StackName=self.stack_id)
 
-    def wait_stack_created(self, delay_secs: int = 30):
-        waiter = self._cf.get_waiter('stack_create_complete')
-        waiter.wait(StackName=self.stack_id, WaiterConfig={'Delay': delay_secs})
+    @property
+    def events(self) -> 'StackEvents':
+        """Events of the current stack operation."""
+        if not self._events:
+            self._events = StackEvents(self._cf, self.stack_id)
+
+        return self._events
+
+    def wait_stack_created(self, timeout_secs: int = 3600):
+        self._wait_stack_status('CREATE_COMPLETE', timeout_secs)
 
-    def wait_stack_updated(self, delay_secs: int = 30):
-        waiter = self._cf.get_waiter('stack_update_complete')
-        waiter.wait(StackName=self.stack_id, WaiterConfig={'Delay': delay_secs})
+    def wait_stack_updated(self, timeout_secs: int = 3600):
+        self._wait_stack_status('UPDATE_COMPLETE', timeout_secs)
 
-    def wait_stack_deleted(self, delay_secs: int = 30):
-        waiter = self._cf.get_waiter('stack_delete_complete')
-        waiter.wait(StackName=self.stack_id, WaiterConfig={'Delay': delay_secs})
+    def wait_stack_deleted(self, timeout_secs: int = 3600):
+        self._wait_stack_status('DELETE_COMPLETE', timeout_secs)
 
-    def wait_status_changed(self, stack_waiting_status: str, output: AbstractOutputWriter, delay_secs: int = 5):
-        stack = None
+    def _wait_stack_status(self, final_status: str, timeout_secs: int):
+        """Tails the stack events until the stack gets the final status.
+
+        Raises:
+            ValueError: If one of the resources or the stack itself failed.
+        """
+        start_time = time()
+        delay = AdaptiveDelay()
         while True:
-            # get the latest status of the stack
-            try:
-                stack = self.get_by_name(self._cf, self.stack_id)
-            except EndpointConnectionError as e:
-                output.write(str(e))
-                continue
+            events = self.events.get_new_events()
+            if self.events.failed_event:
+                raise ValueError(get_event_error(self.events.failed_event))
+
+            if self.events.stack_status and ('ROLLBACK' in self.events.stack_status):
+                raise ValueError('The stack is rolling back (status: %s).' % self.events.stack_status)
+
+            if self.events.stack_status == final_status:
+                return
 
-            if stack.status != stack_waiting_status:
+            if time() - start_time > timeout_secs:
+                raise ValueError('Timed out waiting for the "%s" status of the stack.' % final_status)
+
+            if events:
+                delay.reset()
+
+            delay.sleep()
+
+    def wait_status_changed(self, stack_waiting_status: str, output: AbstractOutputWriter):
+        """Waits until the stack status changes or one of the resources fails and returns the updated stack."""
+        delay = AdaptiveDelay()
+        while True:
+            events = self.events.get_new_events()
+            if self.events.failed_event or (self.events.stack_status not in [None, stack_waiting_status]):
                 break
 
-            sleep(delay_secs)
+            if events:
+                delay.reset()
 
-        return stack
+            delay.sleep()
 
-    def wait_tasks(self, tasks: List[Task], resource_success_status: str, resource_fail_status: str,
-                   output: AbstractOutputWriter, delay_secs: int = 5):
-        resource_statuses = self._get_resource_statuses()
+        # get the latest status of the stack
+        while True:
+            try:
+                stack = self.get_by_name(self._cf, self.stack_id)
+                break
+            except EndpointConnectionError as e:
+                output.write(str(e))
+                sleep(5)
 
-        for task in tasks:
-            if not task.enabled:
-                continue
+        stack._events = self._events
 
-            task_started = task_finished = False
-            while not task_finished:
-                start_status = resource_statuses.get(task.start_resource)
-                finish_status = resource_statuses.get(task.finish_resource)
+        return stack
 
-                if not task_started and (not task.start_resource or (start_status == resource_success_status)):
+    def wait_tasks(self, tasks: List[Task], resource_success_status: str, output: AbstractOutputWriter):
+        """Displays the progress of the tasks using the stack events. It returns once all the tasks are
+        finished or one of the resources is failed.
+        """
+        tasks = [task for task in tasks if task.enabled]
+        resource_statuses = {}
+        task_started = False
+        delay = AdaptiveDelay()
+
+        while tasks:
+            events = self.events.get_new_events()
+            for event in events:
+                resource_statuses[event['LogicalResourceId']] = event['ResourceStatus']
+
+            # update the progress
+            while tasks:
+                task = tasks[0]
+                if not task_started and (not task.start_resource
+                                         or (resource_statuses.get(task.start_resource) == resource_success_status)):
                     task_started = True
                     output.write('- %s... ' % task.message, newline=False)
-                elif task_started and (finish_status == resource_success_status):
-                    task_finished = True
+                elif task_started and (resource_statuses.get(task.finish_resource) == resource_success_status):
+                    task_started = False
+                    tasks.pop(0)
                     output.write('DONE')
                 else:
-                    sleep(delay_secs)
-                    resource_statuses = self._get_resource_statuses()
-
-                    # check that the stack is not failed
-                    for status in resource_statuses.values():
-                        if status == resource_fail_status:
-                            if task_started and not task_finished:
-                                output.write('')
-                            return
-
-    def _get_resource_statuses(self) -> Dict[str, str]:
-        stack_resources = None
+                    break
+
+            # check that the stack is not failed
+            if self.events.failed_event:
+                if task_started:
+                    output.write('')
+
+                output.write(get_event_error(self.events.failed_event))
+                return
+
+            if tasks:
+                if events:
+                    delay.reset()
+
+                delay.sleep()
+
+
+class StackEvents(object):
+    """Tails events of a stack: each call returns only the events that were not returned before."""
+
+    def __init__(self, cf, stack_id: str, skip_existing: bool = False):
+        self._cf = cf
+        self._stack_id = stack_id
+        self._last_event_id = None
+        self._stack_status = None
+        self._failed_event = None
+
+        if skip_existing:
+            self._skip_existing_events()
+
+    @property
+    def stack_status(self) -> str:
+        """The latest status of the stack according to the received events."""
+        return self._stack_status
+
+    @property
+    def failed_event(self) -> dict:
+        """The first event with a "*_FAILED" status."""
+        return self._failed_event
+
+    @staticmethod
+    def is_stack_event(event: dict) -> bool:
+        """Checks if the event is about the stack itself, not about one of its resources."""
+        return (event['ResourceType'] == 'AWS::CloudFormation::Stack') \
+            and (event['LogicalResourceId'] == event['StackName'])
+
+    def _skip_existing_events(self):
+        """Moves the cursor to the latest event. Events are returned in the reverse chronological order,
+        so only the first page is requested, the rest of the stack history is not needed."""
         try:
-            stack_resources = self._cf.list_stack_resources(StackName=self.stack_id)
-        except Exception as e:
+            res = self._cf.describe_stack_events(StackName=self._stack_id)
+        except (EndpointConnectionError, ClientError) as e:
             logging.warning(str(e))
+            return
 
-        resource_statuses = {}
-        if stack_resources:
-            resource_statuses = {row['LogicalResourceId']: row['ResourceStatus']
-                                 for row in stack_resources['StackResourceSummaries']}
+        if res['StackEvents']:
+            self._last_event_id = res['StackEvents'][0]['EventId']
+
+    def get_new_events(self) -> List[dict]:
+        """Returns new events in the chronological order."""
+        new_events = []
+        try:
+            # events are returned in the reverse chronological order
+            paginator = self._cf.get_paginator('describe_stack_events')
+            for page in paginator.paginate(StackName=self._stack_id):
+                for event in page['StackEvents']:
+                    if event['EventId'] == self._last_event_id:
+                        break
+
+                    new_events.append(event)
+                else:
+                    continue
+
+                break
+        except (EndpointConnectionError, ClientError) as e:
+            logging.warning(str(e))
+            return []
+
+        new_events.reverse()
+
+        if new_events:
+            self._last_event_id = new_events[-1]['EventId']
+
+        for event in new_events:
+            if self.is_stack_event(event):
+                self._stack_status = event['ResourceStatus']
+
+            if not self._failed_event and event['ResourceStatus'].endswith('_FAILED'):
+                self._failed_event = event
+
+        return new_events
+
+
+def get_event_error(event: dict) -> str:
+    error = '%s %s' % (event['LogicalResourceId'], event['ResourceStatus'])
+    if event.get('ResourceStatusReason'):
+        error += ': ' + event['ResourceStatusReason']
 
-        return resource_statuses
+    return error
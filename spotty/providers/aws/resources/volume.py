@@ -1,3 +1,4 @@
+from typing import Dict, List
 from spotty.providers.aws.resources.snapshot import Snapshot
 
 
@@ -22,6 +23,36 @@ class Volume(object):
 
         return Volume(ec2, res['Volumes'][0])
 
+    @staticmethod
+    def get_by_names(ec2, volume_names: List[str]) -> Dict[str, 'Volume']:
+        """Returns volumes by their names using a single API call."""
+        volumes = {}
+        for name, named_volumes in Volume.group_by_names(ec2, volume_names).items():
+            if len(named_volumes) > 1:
+                raise ValueError('Several volumes with Name=%s found.' % name)
+
+            volumes[name] = named_volumes[0]
+
+        return volumes
+
+    @staticmethod
+    def group_by_names(ec2, volume_names: List[str]) -> Dict[str, List['Volume']]:
+        """Returns all volumes with the names using a single API call, grouped by the names.
+        Unlike the "get_by_names" method, it doesn't fail if several volumes have the same name."""
+        if not volume_names:
+            return {}
+
+        res = ec2.describe_volumes(Filters=[
+            {'Name': 'tag:Name', 'Values': list(volume_names)},
+        ])
+
+        volumes = {}
+        for volume_info in res['Volumes']:
+            volume = Volume(ec2, volume_info)
+            volumes.setdefault(volume.name, []).append(volume)
+
+        return volumes
+
     @property
     def name(self) -> str:
         volume_name = [tag['Value'] for tag in self._volume_info['Tags'] if tag['Key'] == 'Name']
@@ -63,5 +94,11 @@ class Volume(object):
 
         return Snapshot(self._ec2, snapshot_info)
 
+    def wait_volume_available(self):
+        """Waits until the volume is detached from a terminated instance and updates its state."""
+        waiter = self._ec2.get_waiter('volume_available')
+        waiter.wait(VolumeIds=[self.volume_id])
+        self._volume_info = self._ec2.describe_volumes(VolumeIds=[self.volume_id])['Volumes'][0]
+
     def delete(self):
         return self._ec2.delete_volume(VolumeId=self._volume_info['VolumeId'])
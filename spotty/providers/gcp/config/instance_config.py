@@ -62,6 +62,11 @@ class InstanceConfig(AbstractInstanceConfig):
     def ports(self) -> List[int]:
         return list(set(self._params['ports']))
 
+    @property
+    def sync_mode(self) -> str:
+        """How the project is synced with the running instance: through the bucket or directly using rsync."""
+        return self._params['syncMode']
+
     @property
     def image_name(self) -> str:
         return self._params['imageName']
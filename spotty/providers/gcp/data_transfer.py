@@ -1,33 +1,59 @@
-import logging
-import subprocess
+import shlex
+from typing import List
+from google.cloud import storage
+from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
 from spotty.deployment.abstract_cloud_instance.abstract_data_transfer import AbstractDataTransfer
-from spotty.providers.gcp.helpers.gsutil_rsync import check_gsutil_installed, get_rsync_command
+from spotty.providers.gcp.helpers.gs_sync import sync_local_to_gs, sync_gs_to_local, upload_files_to_gs
+from spotty.providers.gcp.helpers.gsutil_rsync import get_rsync_command, get_cp_files_command
 
 
 class DataTransfer(AbstractDataTransfer):
 
+    def __init__(self, local_project_dir: str, host_project_dir: str, sync_filters: list, instance_name: str):
+        super().__init__(local_project_dir, host_project_dir, sync_filters, instance_name)
+        self._gs_client = None
+
     @property
     def scheme_name(self) -> str:
         return 'gs'
 
-    def upload_local_to_bucket(self, bucket_name: str, dry_run: bool = False):
+    @property
+    def _gs(self) -> storage.Client:
+        # the client looks up the credentials, so it's created only when files are transferred
+        if self._gs_client is None:
+            self._gs_client = storage.Client()
+
+        return self._gs_client
+
+    def upload_local_to_bucket(self, bucket_name: str, output: AbstractOutputWriter, dry_run: bool = False):
         """Uploads files from local to the bucket."""
-        # check gsutil is installed
-        check_gsutil_installed()
+        # sync the project with GCS, deleted files will be deleted from GCS
+        try:
+            sync_local_to_gs(self._gs, self._local_project_dir, self._get_bucket_project_path(bucket_name), output,
+                             filters=self._sync_filters, delete=True, dry_run=dry_run)
+        except Exception as e:
+            raise ValueError('Failed to upload the project files to the GS bucket.\n' + str(e))
 
-        # sync the project with S3, deleted files will be deleted from S3
-        local_cmd = get_rsync_command(self._local_project_dir, self._get_bucket_project_path(bucket_name),
-                                      filters=self._sync_filters, delete=True, dry_run=dry_run)
+    @property
+    def supports_partial_sync(self) -> bool:
+        return True
 
-        # execute the command locally
-        logging.debug('Local sync command: ' + local_cmd)
-        exit_code = subprocess.call(local_cmd, shell=True)
-        if exit_code != 0:
-            raise ValueError('Failed to upload the project files to the GS bucket.')
+    def upload_files_to_bucket(self, bucket_name: str, upload_paths: List[str], delete_paths: List[str],
+                               output: AbstractOutputWriter, dry_run: bool = False):
+        """Uploads the specified project files to the bucket and deletes the objects of the deleted files."""
+        try:
+            upload_files_to_gs(self._gs, self._local_project_dir, self._get_bucket_project_path(bucket_name),
+                               upload_paths, output, delete_paths=delete_paths, dry_run=dry_run)
+        except Exception as e:
+            raise ValueError('Failed to upload the project files to the GS bucket.\n' + str(e))
 
-    def download_bucket_to_local(self, bucket_name: str, download_filters: list):
+    def download_bucket_to_local(self, bucket_name: str, download_filters: list, output: AbstractOutputWriter):
         """Downloads files from the bucket to local."""
-        raise NotImplementedError
+        try:
+            sync_gs_to_local(self._gs, self._get_bucket_downloads_path(bucket_name), self._local_project_dir, output,
+                             filters=download_filters)
+        except Exception as e:
+            raise ValueError('Failed to download files from the GS bucket to local.\n' + str(e))
 
     def get_download_bucket_to_instance_command(self, bucket_name: str, use_sudo: bool = False) -> str:
         """A remote command to download files from the bucket to the instance."""
@@ -38,6 +64,18 @@ class DataTransfer(AbstractDataTransfer):
 
         return remote_cmd
 
+    def get_download_files_to_instance_command(self, bucket_name: str, download_paths: List[str],
+                                               delete_paths: List[str], use_sudo: bool = False) -> str:
+        """A remote command to download the specified files from the bucket to the instance
+        and to delete the deleted files.
+        """
+        remote_cmd = get_cp_files_command(self._get_bucket_project_path(bucket_name), self._host_project_dir,
+                                          download_paths, delete_paths=delete_paths)
+        if use_sudo:
+            remote_cmd = 'sudo sh -c ' + shlex.quote(remote_cmd)
+
+        return remote_cmd
+
     def get_upload_instance_to_bucket_command(self, bucket_name: str, download_filters: list, use_sudo: bool = False,
                                               dry_run: bool = False) -> str:
         """A remote command to upload files from the instance to the bucket.
@@ -46,4 +84,9 @@ class DataTransfer(AbstractDataTransfer):
         directory keeps all downloaded from the instance files to sync only changed
         files with local.
         """
-        raise NotImplementedError
+        remote_cmd = get_rsync_command(self._host_project_dir, self._get_bucket_downloads_path(bucket_name),
+                                       filters=download_filters, delete=True, dry_run=dry_run)
+        if use_sudo:
+            remote_cmd = 'sudo ' + remote_cmd
+
+        return remote_cmd
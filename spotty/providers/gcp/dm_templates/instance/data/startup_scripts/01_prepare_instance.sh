@@ -1,7 +1,14 @@
 #!/bin/bash -xe
 
-# install jq
-apt-get install -y jq
+# create a script with helper functions to run bootstrap steps in background
+mkdir -p "$(dirname '{{BOOTSTRAP_STEPS_SCRIPT_PATH}}')"
+cat > "{{BOOTSTRAP_STEPS_SCRIPT_PATH}}" <<'EOF2'
+{{{BOOTSTRAP_STEPS_SCRIPT}}}
+EOF2
+source "{{BOOTSTRAP_STEPS_SCRIPT_PATH}}"
+
+# install jq in background
+start_step install_packages 'apt-get install -y jq'
 
 # create tmux config
 echo "bind-key x kill-pane" > /home/{{SSH_USERNAME}}/.tmux.conf
@@ -19,11 +26,11 @@ echo "alias $CONTAINER_BASH_ALIAS=\"{{CONTAINER_BASH_SCRIPT_PATH}}\"" >> /home/{
 echo "alias $CONTAINER_BASH_ALIAS=\"{{CONTAINER_BASH_SCRIPT_PATH}}\"" >> /root/.bashrc
 
 {{#IS_GPU_INSTANCE}}
-# install NVIDIA driver
+# install NVIDIA driver in background, the volumes are mounted and the project is synced in the meantime
 if ! command -v nvidia-smi &> /dev/null; then
   DRIVER_INSTALLER_PATH=/opt/deeplearning/install-driver.sh
   if [ -f "$DRIVER_INSTALLER_PATH" ]; then
-    $DRIVER_INSTALLER_PATH
+    start_step install_gpu_driver "$DRIVER_INSTALLER_PATH"
   fi
 fi
 {{/IS_GPU_INSTANCE}}
@@ -2,7 +2,17 @@
 
 # change docker data root directory
 if [ -n "{{DOCKER_DATA_ROOT_DIR}}" ]; then
-  jq '. + { "data-root": "{{DOCKER_DATA_ROOT_DIR}}" }' /etc/docker/daemon.json > /tmp/docker_daemon.json \
-    && mv /tmp/docker_daemon.json /etc/docker/daemon.json
+  python3 - /etc/docker/daemon.json "{{DOCKER_DATA_ROOT_DIR}}" <<'EOF2'
+import json
+import sys
+
+with open(sys.argv[1]) as f:
+    config = json.load(f)
+
+config['data-root'] = sys.argv[2]
+
+with open(sys.argv[1], 'w') as f:
+    json.dump(config, f, indent=2)
+EOF2
   service docker restart
 fi
@@ -5,4 +5,9 @@ cat > "{{INSTANCE_STARTUP_SCRIPTS_DIR}}/instance_startup_commands.sh" <<'EOF2'
 {{{INSTANCE_STARTUP_COMMANDS}}}
 EOF2
 
+# the startup commands may use the GPU driver and the packages
+source "{{BOOTSTRAP_STEPS_SCRIPT_PATH}}"
+wait_step install_gpu_driver
+wait_step install_packages
+
 /bin/bash -xe "{{INSTANCE_STARTUP_SCRIPTS_DIR}}/instance_startup_commands.sh"
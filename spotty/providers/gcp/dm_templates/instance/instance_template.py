@@ -7,9 +7,10 @@ from spotty.config.validation import is_subdir
 from spotty.config.abstract_instance_volume import AbstractInstanceVolume
 from spotty.deployment.container.docker.docker_commands import DockerCommands
 from spotty.deployment.container.docker.scripts.container_bash_script import ContainerBashScript
-from spotty.deployment.container.docker.scripts.start_container_script import StartContainerScript
+from spotty.deployment.abstract_cloud_instance.start_container_script import CloudStartContainerScript
+from spotty.deployment.abstract_cloud_instance.bootstrap_steps import get_bootstrap_steps_script
 from spotty.deployment.abstract_cloud_instance.file_structure import CONTAINER_BASH_SCRIPT_PATH, \
-    INSTANCE_STARTUP_SCRIPTS_DIR, CONTAINERS_TMP_DIR, INSTANCE_SPOTTY_TMP_DIR
+    INSTANCE_STARTUP_SCRIPTS_DIR, CONTAINERS_TMP_DIR, INSTANCE_SPOTTY_TMP_DIR, BOOTSTRAP_STEPS_SCRIPT_PATH
 from spotty.providers.gcp.config.disk_volume import DiskVolume
 from spotty.providers.gcp.config.instance_config import InstanceConfig
 
@@ -31,6 +32,8 @@ def prepare_instance_template(instance_config: InstanceConfig, docker_commands:
         {
             'filename': '01_prepare_instance.sh',
             'params': {
+                'BOOTSTRAP_STEPS_SCRIPT_PATH': BOOTSTRAP_STEPS_SCRIPT_PATH,
+                'BOOTSTRAP_STEPS_SCRIPT': get_bootstrap_steps_script(),
                 'CONTAINER_BASH_SCRIPT_PATH': CONTAINER_BASH_SCRIPT_PATH,
                 'CONTAINER_BASH_SCRIPT': ContainerBashScript(docker_commands).render(),
                 'IS_GPU_INSTANCE': bool(instance_config.gpu),
@@ -55,15 +58,23 @@ def prepare_instance_template(instance_config: InstanceConfig, docker_commands:
             },
         },
         {
-            'filename': '04_sync_project.sh',
+            'filename': '04_pull_image.sh',
+            'params': {
+                'BOOTSTRAP_STEPS_SCRIPT_PATH': BOOTSTRAP_STEPS_SCRIPT_PATH,
+                'PULL_IMAGE_CMD': '' if instance_config.dockerfile_path else docker_commands.pull(),
+            },
+        },
+        {
+            'filename': '05_sync_project.sh',
             'params': {
                 'HOST_PROJECT_DIR': instance_config.host_project_dir,
                 'SYNC_PROJECT_CMD': sync_project_cmd,
             },
         },
         {
-            'filename': '05_run_instance_startup_commands.sh',
+            'filename': '06_run_instance_startup_commands.sh',
             'params': {
+                'BOOTSTRAP_STEPS_SCRIPT_PATH': BOOTSTRAP_STEPS_SCRIPT_PATH,
                 'INSTANCE_STARTUP_SCRIPTS_DIR': INSTANCE_STARTUP_SCRIPTS_DIR,
                 'INSTANCE_STARTUP_COMMANDS': instance_config.commands,
             },
@@ -82,8 +93,8 @@ def prepare_instance_template(instance_config: InstanceConfig, docker_commands:
         })
 
     startup_scripts_content.append({
-        'filename': '06_start_container.sh',
-        'content': StartContainerScript(docker_commands).render(print_trace=True),
+        'filename': '07_start_container.sh',
+        'content': CloudStartContainerScript(docker_commands).render(print_trace=True),
     })
 
     # render the main startup script
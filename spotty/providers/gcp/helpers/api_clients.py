@@ -0,0 +1,46 @@
+import json
+import threading
+from functools import lru_cache
+import googleapiclient.discovery
+from spotty.providers.gcp.helpers.gcp_credentials import GcpCredentials
+
+
+_thread_data = threading.local()
+
+
+def get_service(service_name: str, version: str):
+    """Returns a Google API service object.
+
+    Each service is built once per thread, because the HTTP transport it uses is not thread-safe.
+    The discovery documents are taken from the "google-api-python-client" package (version 2.0 or newer
+    bundles them) and are parsed once per process, so building a service doesn't make any network
+    requests. All the threads share the default credentials.
+    """
+    services = getattr(_thread_data, 'services', None)
+    if services is None:
+        services = _thread_data.services = {}
+
+    key = (service_name, version)
+    if key not in services:
+        http = GcpCredentials().authorized_http
+        document = _get_discovery_document(service_name, version)
+        if document:
+            services[key] = googleapiclient.discovery.build_from_document(document, http=http)
+        else:
+            # "google-api-python-client" < 2.0 doesn't have static discovery documents
+            services[key] = googleapiclient.discovery.build(service_name, version, http=http,
+                                                            cache_discovery=False)
+
+    return services[key]
+
+
+@lru_cache()
+def _get_discovery_document(service_name: str, version: str) -> dict:
+    try:
+        from googleapiclient.discovery_cache import get_static_doc
+    except ImportError:
+        return None
+
+    document = get_static_doc(service_name, version)
+
+    return json.loads(document) if document else None
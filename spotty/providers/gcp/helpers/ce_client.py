@@ -1,6 +1,5 @@
 from collections import OrderedDict
-from time import sleep
-import googleapiclient.discovery
+from spotty.providers.gcp.helpers.api_clients import get_service
 
 
 class CEClient(object):
@@ -9,7 +8,11 @@ class CEClient(object):
     def __init__(self, project_id: str, zone: str):
         self._project_id = project_id
         self._zone = zone
-        self._client = googleapiclient.discovery.build('compute', 'v1', cache_discovery=False)
+
+    @property
+    def _client(self):
+        # services are not thread-safe, so each thread uses its own service
+        return get_service('compute', 'v1')
 
     @property
     def zone(self):
@@ -120,9 +123,12 @@ class CEClient(object):
         return operation['targetLink']
 
     def _wait_operation(self, operation: dict):
-        """Waits util the operation is finished/"""
+        """Waits util the operation is finished.
+
+        The "wait" method is a long-polling request: it returns as soon as the operation is finished
+        or after 2 minutes, so there is no need to sleep between the requests.
+        """
         while operation['status'] != 'DONE':
-            sleep(5)
             operation = self._client.zoneOperations().wait(project=self._project_id, zone=self._zone,
                                                            operation=operation['name']).execute()
 
@@ -1,6 +1,5 @@
 import logging
 from collections import OrderedDict
-from time import sleep
 from httplib2 import ServerNotFoundError
 from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
 from spotty.providers.gcp.resources.instance import Instance
@@ -8,57 +7,79 @@ from spotty.providers.gcp.resources.stack import Stack
 from spotty.providers.gcp.helpers.ce_client import CEClient
 from spotty.providers.gcp.helpers.dm_client import DMClient
 from spotty.providers.gcp.helpers.dm_resource import DMResource
+from spotty.deployment.utils.polling import AdaptiveDelay
 
 
 def wait_resources(dm: DMClient, ce: CEClient, deployment_name: str, resource_messages: OrderedDict,
-                   instance_resource_name: str, machine_name: str, output: AbstractOutputWriter, delay: int = 5):
+                   instance_resource_name: str, machine_name: str, output: AbstractOutputWriter,
+                   max_delay: float = 10):
+    """Waits until the deployment resources are created.
+
+    On each check, the deployment and all the pending resources are requested with a single
+    batch request. The delay between the checks starts at 1 second and grows up to "max_delay"
+    seconds while nothing changes.
+    """
     # make sure that the instance resource is in the messages list
     assert any(resource_name == instance_resource_name for resource_name, _ in resource_messages.items())
 
+    pending_resources = list(resource_messages.keys())
     created_resources = set()
-    for resource_name, message in resource_messages.items():
-        output.write('- %s...' % message)
+    delay = AdaptiveDelay(initial=1, maximum=max_delay)
 
-        is_created = False
-        while not is_created:
-            sleep(delay)
+    output.write('- %s...' % resource_messages[pending_resources[0]])
 
-            # get the resource info
-            try:
-                # check that the deployment is not failed
-                stack = Stack.get_by_name(dm, deployment_name)
+    while pending_resources:
+        delay.sleep()
+
+        # get the deployment and the resources info
+        try:
+            deployment, resources = dm.get_with_resources(deployment_name, list(pending_resources))
+
+            # check that the deployment is not failed
+            if deployment:
+                stack = Stack(dm, deployment)
                 if stack.error:
                     raise ValueError('Deployment "%s" failed.\n'
                                      'Error: %s' % (deployment_name, stack.error['message']))
 
-                # check if the instance was preempted, terminated or deleted right after creation
-                if instance_resource_name in created_resources:
-                    instance = Instance.get_by_name(ce, machine_name)
-                    if not instance or instance.is_stopped:
-                        raise ValueError('Error: the instance was unexpectedly terminated. Please, check out the '
-                                         'instance logs to find out the reason.\n')
+            # check if the instance was preempted, terminated or deleted right after creation
+            if instance_resource_name in created_resources:
+                instance = Instance.get_by_name(ce, machine_name)
+                if not instance or instance.is_stopped:
+                    raise ValueError('Error: the instance was unexpectedly terminated. Please, check out the '
+                                     'instance logs to find out the reason.\n')
+        except (ConnectionResetError, ServerNotFoundError):
+            logging.warning('Connection problem')
+            continue
 
-                # get resource
-                resource = DMResource.get_by_name(dm, deployment_name, resource_name)
-            except (ConnectionResetError, ServerNotFoundError):
-                logging.warning('Connection problem')
-                continue
+        # resources are reported in the order of the messages
+        while pending_resources:
+            resource_name = pending_resources[0]
 
             # resource doesn't exist yet
-            if not resource:
-                continue
+            if not resources[resource_name]:
+                break
+
+            resource = DMResource(dm, resources[resource_name])
 
             # resource failed
             if resource.is_failed:
                 error_msg = ('Error: ' + resource.error_message) if resource.error_message \
-                    else 'Please, see Deployment Manager logs for the details.' % deployment_name
+                    else 'Please, see Deployment Manager logs for the details.'
 
                 raise ValueError('Deployment "%s" failed.\n%s' % (deployment_name, error_msg))
 
+            # resource is still being created
+            if not resource.is_created:
+                break
+
             # resource was successfully created
-            is_created = resource.is_created
+            created_resources.add(resource_name)
+            pending_resources.pop(0)
+            delay.reset()
 
-        created_resources.add(resource_name)
+            if pending_resources:
+                output.write('- %s...' % resource_messages[pending_resources[0]])
 
 
 def check_gpu_configuration(ce: CEClient, gpu_parameters: dict):
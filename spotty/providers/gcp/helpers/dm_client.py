@@ -1,5 +1,6 @@
 import json
-import googleapiclient.discovery
+from typing import List, Tuple
+from spotty.providers.gcp.helpers.api_clients import get_service
 from googleapiclient.errors import HttpError
 
 
@@ -9,7 +10,11 @@ class DMClient(object):
     def __init__(self, project_id: str, zone: str):
         self._project_id = project_id
         self._zone = zone
-        self._client = googleapiclient.discovery.build('deploymentmanager', 'v2', cache_discovery=False)
+
+    @property
+    def _client(self):
+        # services are not thread-safe, so each thread uses its own service
+        return get_service('deploymentmanager', 'v2')
 
     def get(self, deployment_name: str):
         try:
@@ -58,3 +63,33 @@ class DMClient(object):
             res = None
 
         return res
+
+    def get_with_resources(self, deployment_name: str, resource_names: List[str]) -> Tuple[dict, dict]:
+        """Returns a deployment and its resources using a single batch request.
+
+        Returns:
+            A tuple with the deployment info and a dictionary with the resources by their names. The deployment
+            is None if it doesn't exist, a resource is None if it doesn't exist yet.
+        """
+        responses = {}
+
+        def callback(request_id, response, exception):
+            if exception is not None:
+                if not (isinstance(exception, HttpError) and exception.resp.status == 404):
+                    raise exception
+                response = None
+
+            responses[request_id] = response
+
+        batch = self._client.new_batch_http_request(callback=callback)
+        batch.add(self._client.deployments().get(project=self._project_id, deployment=deployment_name),
+                  request_id='deployment')
+        for i, resource_name in enumerate(resource_names):
+            batch.add(self._client.resources().get(project=self._project_id, deployment=deployment_name,
+                                                   resource=resource_name), request_id='resource-%d' % i)
+
+        batch.execute()
+
+        resources = {resource_name: responses['resource-%d' % i] for i, resource_name in enumerate(resource_names)}
+
+        return responses['deployment'], resources
@@ -1,9 +1,23 @@
+import threading
+from functools import lru_cache
 from google.auth import default
 
 
+_lock = threading.Lock()
+_thread_data = threading.local()
+
+
 class GcpCredentials(object):
+    """Application Default Credentials.
+
+    The credentials are looked up once per process. API clients of the same thread share
+    an authorized HTTP transport.
+    """
+
     def __init__(self):
-        credentials, effective_project_id = default()
+        # the credentials are looked up only once even if several threads need them at the same time
+        with _lock:
+            credentials, effective_project_id = _get_default_credentials()
 
         self._credentials = credentials
         self._project_id = effective_project_id
@@ -15,3 +29,28 @@ class GcpCredentials(object):
     @property
     def service_account_email(self):
         return self._credentials.service_account_email
+
+    @property
+    def authorized_http(self):
+        """An HTTP transport authorized with the credentials. httplib2 is not thread-safe,
+        so each thread gets its own transport."""
+        return _get_authorized_http(self._credentials)
+
+
+@lru_cache()
+def _get_default_credentials():
+    return default()
+
+
+def _get_authorized_http(credentials):
+    import google_auth_httplib2
+    import httplib2
+
+    transports = getattr(_thread_data, 'transports', None)
+    if transports is None:
+        transports = _thread_data.transports = {}
+
+    if credentials not in transports:
+        transports[credentials] = google_auth_httplib2.AuthorizedHttp(credentials, http=httplib2.Http())
+
+    return transports[credentials]
@@ -0,0 +1,367 @@
+import base64
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import partial
+from typing import Callable, Dict, List
+from uuid import uuid4
+import google_crc32c
+from google.cloud.storage import Bucket, Client
+from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
+from spotty.deployment.utils.sync_filters import list_local_files, is_path_included, LocalFile
+
+
+# maximum number of threads that transfer files and file parts between GCS and local
+DEFAULT_MAX_WORKERS = 10
+
+# files larger than this size are uploaded as several components in parallel and composed into one object,
+# and downloaded using several ranged requests in parallel
+COMPOSITE_THRESHOLD = 150 * 1024 * 1024
+
+# size of a component of a composite upload (or a slice of a download)
+COMPONENT_SIZE = 50 * 1024 * 1024
+
+# maximum number of components that can be composed with a single request
+MAX_COMPONENTS = 32
+
+# a bucket directory for temporary components of composite uploads
+COMPONENTS_PREFIX = '.spotty-components/'
+
+# the same metadata key as gsutil uses to keep modification times of the files
+MTIME_METADATA_KEY = 'goog-reserved-file-mtime'
+
+GSObject = namedtuple('GSObject', ['name', 'size', 'mtime', 'crc32c'])
+
+
+class _Transfer(object):
+    """An upload or a download of a single file.
+
+    Parts of the transfer are run concurrently in a worker pool, then the transfer is finished
+    in the main thread (a composite object is composed, a downloaded file is moved to its place).
+    """
+
+    def __init__(self, msg: str, size: int, parts: List[Callable], finish: Callable = None,
+                 cleanup: Callable = None):
+        self.msg = msg
+        self.size = size
+        self.parts = parts
+        self.finish = finish
+        self.cleanup = cleanup
+
+
+def sync_local_to_gs(client: Client, local_dir: str, gs_path: str, output: AbstractOutputWriter, filters: list = None,
+                     delete: bool = False, dry_run: bool = False, max_workers: int = DEFAULT_MAX_WORKERS):
+    """Uploads new and changed files from a local directory to GCS in parallel.
+
+    A file is uploaded if it doesn't exist in the bucket, if its size is different, or if its modification time
+    is different from the one saved in the object metadata and its content doesn't match the CRC32C
+    checksum of the object.
+
+    Args:
+        client: Google Storage client.
+        local_dir: Local directory.
+        gs_path: GCS path in the "gs://<bucket>/<prefix>" format.
+        output: Output writer.
+        filters: Sync filters with the "aws s3 sync" semantics.
+        delete: Delete GCS objects that don't exist locally.
+        dry_run: Only display the operations that would be performed.
+        max_workers: Maximum number of threads that upload files.
+    """
+    bucket_name, prefix = _parse_gs_path(gs_path)
+    bucket = client.bucket(bucket_name)
+
+    local_files = list_local_files(local_dir, filters)
+    gs_objects = list_gs_objects(bucket, prefix, filters)
+
+    # get new and changed files
+    upload_paths = [rel_path for rel_path, local_file in sorted(local_files.items())
+                    if _is_upload_required(local_file, gs_objects.get(rel_path))]
+
+    # get deleted files
+    delete_paths = sorted(set(gs_objects) - set(local_files)) if delete else []
+
+    upload_files_to_gs(client, local_dir, gs_path, upload_paths, output, delete_paths=delete_paths, dry_run=dry_run,
+                       max_workers=max_workers)
+
+
+def upload_files_to_gs(client: Client, local_dir: str, gs_path: str, upload_paths: List[str],
+                       output: AbstractOutputWriter, delete_paths: List[str] = None, dry_run: bool = False,
+                       max_workers: int = DEFAULT_MAX_WORKERS):
+    """Uploads the specified files to GCS in parallel and deletes GCS objects for the deleted files.
+    The bucket is not listed, so the caller is responsible for finding changed files.
+
+    Args:
+        upload_paths: Paths of the files relative to the local directory (with "/" separators).
+        delete_paths: Paths of the deleted files relative to the local directory.
+    """
+    bucket_name, prefix = _parse_gs_path(gs_path)
+    bucket = client.bucket(bucket_name)
+
+    transfers = []
+    for rel_path in upload_paths:
+        msg = 'upload: ./%s to gs://%s/%s' % (rel_path, bucket_name, prefix + rel_path)
+        if dry_run:
+            output.write('(dryrun) ' + msg)
+        else:
+            transfers.append(_get_upload_transfer(bucket, os.path.join(local_dir, *rel_path.split('/')),
+                                                  prefix + rel_path, msg))
+
+    _run_transfers(transfers, output, upload=True, max_workers=max_workers)
+
+    # delete objects
+    delete_names = [prefix + rel_path for rel_path in (delete_paths or [])]
+    for name in delete_names:
+        output.write('%sdelete: gs://%s/%s' % ('(dryrun) ' if dry_run else '', bucket_name, name))
+
+    if not dry_run:
+        _delete_blobs(client, bucket, delete_names)
+
+
+def sync_gs_to_local(client: Client, gs_path: str, local_dir: str, output: AbstractOutputWriter, filters: list = None,
+                     dry_run: bool = False, max_workers: int = DEFAULT_MAX_WORKERS):
+    """Downloads new and changed objects from GCS to a local directory in parallel.
+
+    An object is downloaded if the local file doesn't exist, if its size is different, or if its modification time
+    is different and its CRC32C checksum doesn't match the content of the local file. Modification times of
+    the downloaded files are set to the modification times of the objects.
+    """
+    bucket_name, prefix = _parse_gs_path(gs_path)
+    bucket = client.bucket(bucket_name)
+
+    gs_objects = list_gs_objects(bucket, prefix, filters)
+    local_files = list_local_files(local_dir, filters) if os.path.isdir(local_dir) else {}
+
+    download_paths = [rel_path for rel_path, gs_object in sorted(gs_objects.items())
+                      if _is_download_required(gs_object, local_files.get(rel_path))]
+
+    transfers = []
+    for rel_path in download_paths:
+        msg = 'download: gs://%s/%s to %s' % (bucket_name, gs_objects[rel_path].name, rel_path)
+        if dry_run:
+            output.write('(dryrun) ' + msg)
+        else:
+            transfers.append(_get_download_transfer(bucket, gs_objects[rel_path],
+                                                    os.path.join(local_dir, *rel_path.split('/')), msg))
+
+    _run_transfers(transfers, output, upload=False, max_workers=max_workers)
+
+
+def list_gs_objects(bucket: Bucket, prefix: str, filters: list = None) -> Dict[str, GSObject]:
+    """Returns GCS objects under the prefix that match the filters.
+
+    Returns:
+        A dictionary where keys are object names relative to the prefix.
+    """
+    gs_objects = {}
+    for blob in bucket.list_blobs(prefix=prefix):
+        rel_path = blob.name[len(prefix):]
+        if not rel_path or rel_path.endswith('/') or not is_path_included(rel_path, filters):
+            continue
+
+        gs_objects[rel_path] = GSObject(name=blob.name, size=blob.size, mtime=_get_blob_mtime(blob),
+                                        crc32c=blob.crc32c)
+
+    return gs_objects
+
+
+def get_file_crc32c(file_path: str) -> str:
+    """Returns a base64-encoded CRC32C checksum of the file in the same format as GCS uses."""
+    checksum = google_crc32c.Checksum()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            checksum.update(chunk)
+
+    return base64.b64encode(checksum.digest()).decode('utf-8')
+
+
+def _get_blob_mtime(blob) -> float:
+    """Returns the modification time of the original file if it was saved in the metadata,
+    otherwise the modification time of the object."""
+    mtime = (blob.metadata or {}).get(MTIME_METADATA_KEY)
+    if mtime is not None:
+        try:
+            return float(mtime)
+        except ValueError:
+            pass
+
+    return blob.updated.timestamp()
+
+
+def _is_upload_required(local_file: LocalFile, gs_object: GSObject) -> bool:
+    if not gs_object or (local_file.size != gs_object.size):
+        return True
+
+    if int(local_file.mtime) == int(gs_object.mtime):
+        return False
+
+    # the file was touched, compare its content with the checksum of the object
+    return get_file_crc32c(local_file.path) != gs_object.crc32c
+
+
+def _is_download_required(gs_object: GSObject, local_file: LocalFile) -> bool:
+    if not local_file or (local_file.size != gs_object.size):
+        return True
+
+    if int(local_file.mtime) == int(gs_object.mtime):
+        return False
+
+    return get_file_crc32c(local_file.path) != gs_object.crc32c
+
+
+def _get_parts(size: int) -> List[tuple]:
+    """Splits a file into parts for a parallel transfer.
+
+    Returns:
+        A list of tuples: (offset, length).
+    """
+    if size < COMPOSITE_THRESHOLD:
+        return [(0, size)]
+
+    part_size = max(COMPONENT_SIZE, -(-size // MAX_COMPONENTS))
+
+    return [(offset, min(part_size, size - offset)) for offset in range(0, size, part_size)]
+
+
+def _upload_range(blob, file_path: str, offset: int, length: int):
+    with open(file_path, 'rb') as f:
+        f.seek(offset)
+        blob.upload_from_file(f, size=length, checksum='crc32c')
+
+
+def _download_range(blob, file_path: str, offset: int, length: int):
+    with open(file_path, 'r+b') as f:
+        f.seek(offset)
+        blob.download_to_file(f, start=offset, end=offset + length - 1, checksum=None)
+
+
+def _download_file(blob, file_path: str):
+    with open(file_path, 'wb') as f:
+        blob.download_to_file(f, checksum='crc32c')
+
+
+def _get_upload_transfer(bucket: Bucket, file_path: str, blob_name: str, msg: str) -> _Transfer:
+    stat = os.stat(file_path)
+    blob = bucket.blob(blob_name)
+    blob.metadata = {MTIME_METADATA_KEY: str(int(stat.st_mtime))}
+
+    parts = _get_parts(stat.st_size)
+    if len(parts) == 1:
+        return _Transfer(msg, stat.st_size, [partial(_upload_range, blob, file_path, 0, stat.st_size)])
+
+    # upload the file as several components in parallel and compose them into one object
+    components_prefix = COMPONENTS_PREFIX + uuid4().hex + '/'
+    components = [bucket.blob(components_prefix + str(i)) for i in range(len(parts))]
+
+    def cleanup():
+        for component in components:
+            try:
+                component.delete()
+            except Exception:
+                pass
+
+    return _Transfer(msg, stat.st_size,
+                     parts=[partial(_upload_range, component, file_path, offset, length)
+                            for component, (offset, length) in zip(components, parts)],
+                     finish=partial(blob.compose, components),
+                     cleanup=cleanup)
+
+
+def _get_download_transfer(bucket: Bucket, gs_object: GSObject, file_path: str, msg: str) -> _Transfer:
+    # the object is downloaded to a temporary file, so a failed download won't corrupt the existing file
+    tmp_path = file_path + '.spotty-download'
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+    blob = bucket.blob(gs_object.name)
+    parts = _get_parts(gs_object.size)
+    if len(parts) == 1:
+        part_funcs = [partial(_download_file, blob, tmp_path)]
+    else:
+        # download slices of the object in parallel
+        with open(tmp_path, 'wb') as f:
+            f.truncate(gs_object.size)
+
+        part_funcs = [partial(_download_range, blob, tmp_path, offset, length) for offset, length in parts]
+
+    def finish():
+        if (len(parts) > 1) and (get_file_crc32c(tmp_path) != gs_object.crc32c):
+            raise ValueError('CRC32C checksum of the downloaded file doesn\'t match the object')
+
+        os.replace(tmp_path, file_path)
+        os.utime(file_path, (gs_object.mtime, gs_object.mtime))
+
+    def cleanup():
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+    return _Transfer(msg, gs_object.size, part_funcs, finish=finish, cleanup=cleanup)
+
+
+def _run_transfers(transfers: List[_Transfer], output: AbstractOutputWriter, upload: bool, max_workers: int):
+    """Runs parts of all the transfers using a bounded worker pool."""
+    if not transfers:
+        return
+
+    start_time = time.time()
+    failed_msgs = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [[executor.submit(part) for part in transfer.parts] for transfer in transfers]
+
+        for transfer, part_futures in zip(transfers, futures):
+            # wait for all the parts, so a failed transfer won't be cleaned up while other parts are running
+            wait(part_futures)
+            try:
+                for future in part_futures:
+                    future.result()
+
+                if transfer.finish:
+                    transfer.finish()
+
+                output.write(transfer.msg)
+            except Exception as e:
+                failed_msgs.append('%s (%s)' % (transfer.msg, str(e)))
+            finally:
+                if transfer.cleanup:
+                    transfer.cleanup()
+
+    if failed_msgs:
+        raise ValueError('Failed to %s the files:\n  %s' % ('upload' if upload else 'download',
+                                                            '\n  '.join(failed_msgs)))
+
+    # display the throughput
+    total_secs = max(time.time() - start_time, 0.001)
+    total_bytes = sum(transfer.size for transfer in transfers)
+    output.write('%s %d file(s), %s in %.1fs (%s/s)' % ('Uploaded' if upload else 'Downloaded', len(transfers),
+                                                       _format_size(total_bytes), total_secs,
+                                                       _format_size(total_bytes / total_secs)))
+
+
+def _delete_blobs(client: Client, bucket: Bucket, names: List[str]):
+    """Deletes objects using batch requests (up to 100 requests per batch)."""
+    for i in range(0, len(names), 100):
+        with client.batch():
+            for name in names[i:i + 100]:
+                bucket.delete_blob(name)
+
+
+def _parse_gs_path(gs_path: str) -> (str, str):
+    """Splits a GCS path into a bucket name and an object name prefix (with a trailing slash)."""
+    if not gs_path.startswith('gs://'):
+        raise ValueError('Invalid GCS path: "%s".' % gs_path)
+
+    bucket_name, _, prefix = gs_path[len('gs://'):].partition('/')
+    prefix = prefix.strip('/')
+    if prefix:
+        prefix += '/'
+
+    return bucket_name, prefix
+
+
+def _format_size(size: float) -> str:
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if size < 1024:
+            return '%.1f %s' % (size, unit)
+
+        size /= 1024
+
+    return '%.1f TB' % size
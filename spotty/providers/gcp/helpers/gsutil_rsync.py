@@ -1,15 +1,10 @@
-import fnmatch
-from shutil import which
-import os
+import re
 from typing import List
-
 from spotty.deployment.utils.cli import shlex_join
 
 
-def check_gsutil_installed():
-    """Checks that gsutil is installed."""
-    if which('gsutil') is None:
-        raise ValueError('gsutil is not installed.')
+# maximum number of "gsutil cp" commands to download the changed files one by one
+MAX_SINGLE_COPY_COMMANDS = 5
 
 
 def get_rsync_command(from_path: str, to_path: str, filters: List[dict] = None, delete: bool = False,
@@ -21,16 +16,7 @@ def get_rsync_command(from_path: str, to_path: str, filters: List[dict] = None,
     args += ['rsync', '-r']
 
     if filters:
-        if (len(filters) > 1) or (len(filters[0]) > 1) or ('include' in filters[0]):
-            raise ValueError('At the moment GCP provider supports only one list of exclude filters.')
-
-        path_regs = []
-        for path in filters[0]['exclude']:
-            path = path.replace('/', os.sep)  # fix for Windows machines
-            path_regs.append(fnmatch.translate(path)[4:-3])
-
-        filter_regex = '^(%s)$' % '|'.join(path_regs)
-        args += ['-x', filter_regex]
+        args += ['-x', get_exclude_regex(filters)]
 
     if delete:
         args.append('-d')
@@ -41,3 +27,103 @@ def get_rsync_command(from_path: str, to_path: str, filters: List[dict] = None,
     args += [from_path, to_path]
 
     return shlex_join(args)
+
+
+def get_cp_files_command(gs_path: str, local_dir: str, download_paths: List[str], delete_paths: List[str] = None):
+    """Builds a shell command that downloads only the specified objects from GCS and deletes the
+    specified local files.
+
+    Args:
+        gs_path: GCS path in the "gs://<bucket>/<prefix>" format.
+        local_dir: Local directory.
+        download_paths: Paths of the objects relative to the GCS path (with "/" separators).
+        delete_paths: Paths of the files relative to the local directory.
+    """
+    gs_path = gs_path.rstrip('/')
+    local_dir = local_dir.rstrip('/')
+
+    commands = []
+    if delete_paths:
+        commands.append(shlex_join(['rm', '-f'] + [local_dir + '/' + rel_path for rel_path in delete_paths]))
+
+    if len(download_paths) <= MAX_SINGLE_COPY_COMMANDS:
+        # copy a few objects one by one, so the bucket won't be listed
+        for rel_path in download_paths:
+            commands.append(shlex_join(['mkdir', '-p', (local_dir + '/' + rel_path).rsplit('/', 1)[0]]))
+            commands.append(shlex_join(['gsutil', '-q', 'cp', gs_path + '/' + rel_path, local_dir + '/' + rel_path]))
+    elif download_paths:
+        # sync only the specified objects, it lists the bucket but doesn't delete local files
+        exclude_regex = '^(?!(%s)$)' % '|'.join(re.escape(rel_path) for rel_path in download_paths)
+        commands.append(shlex_join(['gsutil', '-m', '-q', 'rsync', '-r', '-x', exclude_regex, gs_path, local_dir]))
+
+    return ' && '.join(commands)
+
+
+def get_exclude_regex(filters: List[dict]) -> str:
+    """Converts sync filters with the "aws s3 sync" semantics to a regular expression for the "-x" option
+    of the "gsutil rsync" command.
+
+    A path is excluded if it matches one of the exclude patterns and doesn't match any of the include
+    patterns that follow it, so each exclude filter is combined with a negative lookahead for the include
+    filters after it.
+    """
+    exclude_regs = []
+    for i, sync_filter in enumerate(filters):
+        if ('exclude' in sync_filter) == ('include' in sync_filter):
+            raise ValueError('Sync filter has wrong format.')
+
+        if 'exclude' not in sync_filter:
+            continue
+
+        include_patterns = [pattern for next_filter in filters[i + 1:] for pattern in next_filter.get('include', [])]
+        exclude_reg = '(%s)$' % '|'.join(_glob_to_regex(pattern) for pattern in sync_filter['exclude'])
+        if include_patterns:
+            exclude_reg = '(?!(%s)$)' % '|'.join(_glob_to_regex(pattern) for pattern in include_patterns) \
+                          + exclude_reg
+
+        exclude_regs.append(exclude_reg)
+
+    if not exclude_regs:
+        # a regex that doesn't match anything
+        return '^(?!)'
+
+    return '^(%s)' % '|'.join(exclude_regs)
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Converts a glob pattern to a regular expression. Unlike "fnmatch.translate", it doesn't use
+    features of new Python versions, because the regex is used by gsutil on the instance.
+    The "*" character matches any sequence of characters including the "/" character.
+    """
+    res = ''
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        i += 1
+        if char == '*':
+            res += '.*'
+        elif char == '?':
+            res += '.'
+        elif char == '[':
+            j = i
+            if pattern[j:j + 1] == '!':
+                j += 1
+            if pattern[j:j + 1] == ']':
+                j += 1
+
+            end = pattern.find(']', j)
+            if end == -1:
+                res += '\\['
+            else:
+                chars = pattern[i:end].replace('\\', '\\\\')
+                i = end + 1
+                if chars.startswith('!'):
+                    chars = '^' + chars[1:]
+                elif chars.startswith('^'):
+                    chars = '\\' + chars
+
+                res += '[%s]' % chars
+        else:
+            res += re.escape(char)
+
+    return res
@@ -1,4 +1,4 @@
-import googleapiclient.discovery
+from spotty.providers.gcp.helpers.api_clients import get_service
 
 
 class RtcClient(object):
@@ -6,7 +6,11 @@ class RtcClient(object):
     def __init__(self, project_id: str, zone: str):
         self._project_id = project_id
         self._zone = zone
-        self._rtc = googleapiclient.discovery.build('runtimeconfig', 'v1beta1', cache_discovery=False)
+
+    @property
+    def _rtc(self):
+        # services are not thread-safe, so each thread uses its own service
+        return get_service('runtimeconfig', 'v1beta1')
 
     def get_value(self, config_name, template):
         config_name = 'projects/%s/configs/%s' % (self._project_id, config_name)
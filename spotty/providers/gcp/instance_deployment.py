@@ -25,10 +25,15 @@ class InstanceDeployment(AbstractInstanceDeployment):
         self._project_name = instance_config.project_config.project_name
         self._credentials = GcpCredentials()
         self._ce = CEClient(self._credentials.project_id, instance_config.zone)
+        self._stack_manager = None
 
     @property
     def stack_manager(self) -> InstanceStackManager:
-        return InstanceStackManager(self.instance_config.machine_name, self._credentials.project_id, self.instance_config.zone)
+        if self._stack_manager is None:
+            self._stack_manager = InstanceStackManager(self.instance_config.machine_name,
+                                                       self._credentials.project_id, self.instance_config.zone)
+
+        return self._stack_manager
 
     @property
     def ssh_key_manager(self) -> SshKeyManager:
@@ -54,7 +59,7 @@ class InstanceDeployment(AbstractInstanceDeployment):
         # sync the project with the S3 bucket
         if bucket_name is not None:
             output.write('Syncing the project with the bucket...')
-            data_transfer.upload_local_to_bucket(bucket_name, dry_run=dry_run)
+            data_transfer.upload_local_to_bucket(bucket_name, output=output, dry_run=dry_run)
 
         # create volumes
         if self.instance_config.volumes:
@@ -96,7 +101,16 @@ class InstanceDeployment(AbstractInstanceDeployment):
         if not dry_run:
             stack_manager.create_stack(template, output=output)
 
-    def delete(self, output: AbstractOutputWriter):
+    def delete(self, output: AbstractOutputWriter, wait: bool = True):
+        if not wait:
+            # deleting the stack may require to wait for an ongoing operation first,
+            # so the whole stack is deleted by the "finish_delete" method
+            output.write('The instance will be deleted in background.')
+            return
+
         self.stack_manager.delete_stack(output)
 
         # TODO: apply deletion policies
+
+    def finish_delete(self, output: AbstractOutputWriter):
+        self.stack_manager.delete_stack(output)
@@ -1,4 +1,3 @@
-from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
 from spotty.errors.instance_not_running import InstanceNotRunningError
 from spotty.deployment.abstract_cloud_instance.abstract_cloud_instance_manager import AbstractCloudInstanceManager
 from spotty.providers.gcp.config.instance_config import InstanceConfig
@@ -36,11 +35,9 @@ class InstanceManager(AbstractCloudInstanceManager):
         """Returns an instance deployment manager."""
         return InstanceDeployment(self.instance_config)
 
-    def download(self, download_filters: list, output: AbstractOutputWriter, dry_run=False):
-        raise NotImplementedError('GCP provider doesn\'t have an implementation of the "download" command yet.')
-
     def get_status_text(self) -> str:
         instance = self.instance_deployment.get_instance()
+        self.refresh_ssh_endpoint(instance)
         if not instance:
             raise InstanceNotRunningError(self.instance_config.name)
 
@@ -57,6 +54,20 @@ class InstanceManager(AbstractCloudInstanceManager):
 
         return render_table(table)
 
+    def get_status_info(self) -> dict:
+        instance = self.instance_deployment.get_instance()
+        self.refresh_ssh_endpoint(instance)
+        if not instance:
+            return {'state': 'not running', 'location': self.instance_config.zone}
+
+        return {
+            'state': instance.status.lower(),
+            'location': instance.zone,
+            'instance_type': instance.machine_type,
+            'ip_address': instance.public_ip_address,
+            'purchasing_option': 'preemptible' if instance.is_preemtible else 'on-demand',
+        }
+
     @property
     def ssh_key_path(self):
         return self.instance_deployment.ssh_key_manager.private_key_file
@@ -71,6 +71,10 @@ class Instance(AbstractInstance):
 
         return Instance(ce, res[0])
 
+    @property
+    def instance_id(self) -> str:
+        return self._data['id']
+
     @property
     def name(self) -> str:
         return self._data['name']
@@ -1,7 +1,7 @@
 import logging
-from time import sleep
 from httplib2 import ServerNotFoundError
 from spotty.providers.gcp.helpers.dm_client import DMClient
+from spotty.deployment.utils.polling import AdaptiveDelay
 
 
 class Stack(object):
@@ -94,25 +94,23 @@ class Stack(object):
     def delete(self):
         self._dm.delete(self.name)
 
-    def wait_stack_deleted(self, delay=15):
+    def wait_stack_deleted(self, max_delay: float = 15):
+        delay = AdaptiveDelay(initial=2, maximum=max_delay)
         stack = True
         while stack:
+            delay.sleep()
             try:
                 stack = self.get_by_name(self._dm, self.name)
             except (ConnectionResetError, ServerNotFoundError):
                 logging.warning('Connection problem')
-                continue
 
-            sleep(delay)
-
-    def wait_stack_done(self, delay=5):
+    def wait_stack_done(self, max_delay: float = 10):
+        delay = AdaptiveDelay(initial=1, maximum=max_delay)
         is_done = False
         while not is_done:
+            delay.sleep()
             try:
                 stack = self.get_by_name(self._dm, self.name)
                 is_done = stack.is_done
             except (ConnectionResetError, ServerNotFoundError):
                 logging.warning('Connection problem')
-                continue
-
-            sleep(delay)
@@ -1,4 +1,5 @@
 from importlib import import_module
+from typing import Type
 from spotty.config.project_config import ProjectConfig
 from spotty.deployment.abstract_instance_manager import AbstractInstanceManager
 
@@ -22,12 +23,14 @@ class InstanceManagerFactory(object):
 
     @classmethod
     def get_instance(cls, project_config: ProjectConfig, instance_config: dict) -> AbstractInstanceManager:
-        provider_name = instance_config['provider']
+        InstanceManagerClass = cls.get_class(instance_config['provider'])
+
+        return InstanceManagerClass(project_config, instance_config)
+
+    @classmethod
+    def get_class(cls, provider_name: str) -> Type[AbstractInstanceManager]:
+        """Returns an Instance Manager class for the provider."""
         if provider_name not in cls.SUPPORTED_PROVIDERS:
             raise ValueError('Provider "%s" is not supported' % provider_name)
 
-        # get Instance Manger class for the provider
-        InstanceManagerClass = getattr(import_module('spotty.providers.%s.instance_manager' % provider_name),
-                                       'InstanceManager')
-
-        return InstanceManagerClass(project_config, instance_config)
+        return getattr(import_module('spotty.providers.%s.instance_manager' % provider_name), 'InstanceManager')
@@ -1,6 +1,7 @@
 from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
 from spotty.errors.nothing_to_do import NothingToDoError
 from spotty.deployment.abstract_docker_instance_manager import AbstractDockerInstanceManager
+from spotty.deployment.container.docker.scripts.start_container_script import StartContainerScript
 from spotty.providers.local.config.instance_config import InstanceConfig
 
 
@@ -18,6 +19,11 @@ class InstanceManager(AbstractDockerInstanceManager):
     def clean(self, output: AbstractOutputWriter):
         pass
 
+    def _get_start_container_script(self) -> StartContainerScript:
+        # the image is built from the project directory itself, so the files excluded
+        # from the sync are still a part of the build context
+        return StartContainerScript(self.container_commands, use_sync_filters=False)
+
     def sync(self, output: AbstractOutputWriter, dry_run=False):
         raise NothingToDoError('Nothing to do. The project directory is mounted to the container.')
 
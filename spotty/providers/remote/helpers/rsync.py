@@ -10,37 +10,53 @@ def check_rsync_installed():
 
 
 def get_upload_command(local_dir: str, remote_dir: str, ssh_user: str, ssh_host: str, ssh_port: int,
-                       ssh_key_path: str, filters: List[dict] = None, use_sudo: bool = False, dry_run: bool = False):
-
+                       ssh_key_path: str, filters: List[dict] = None, use_sudo: bool = False, dry_run: bool = False,
+                       ssh_control_path: str = None, delete: bool = False):
+    """Returns an rsync command to upload a local directory to the instance.
+
+    If "delete" is True, remote files that don't exist locally are deleted. Files excluded
+    by the filters are not deleted.
+    """
+    # rsync applies the first matching rule, while "aws s3 sync" applies the last one,
+    # so the filters are reversed to give priority to the later ones
+    filters = filters[::-1] if filters else filters
     remote_path = '%s@%s:%s' % (ssh_user, ssh_host, remote_dir)
 
     return _get_rsync_command(local_dir, remote_path, ssh_port, ssh_key_path, filters, mkdir=remote_dir,
-                              use_sudo=use_sudo, dry_run=dry_run)
+                              use_sudo=use_sudo, dry_run=dry_run, ssh_control_path=ssh_control_path, delete=delete)
 
 
 def get_download_command(remote_dir: str, local_dir: str, ssh_user: str, ssh_host: str, ssh_port: int,
-                         ssh_key_path: str, filters: List[dict] = None, use_sudo: bool = False, dry_run: bool = False):
+                         ssh_key_path: str, filters: List[dict] = None, use_sudo: bool = False, dry_run: bool = False,
+                         ssh_control_path: str = None):
     filters = filters[::-1]
     remote_path = '%s@%s:%s' % (ssh_user, ssh_host, remote_dir)
     return _get_rsync_command(remote_path, local_dir, ssh_port, ssh_key_path, filters, use_sudo=use_sudo,
-                              dry_run=dry_run)
+                              dry_run=dry_run, ssh_control_path=ssh_control_path)
 
 
 def _get_rsync_command(src_path: str, dst_path: str, ssh_port: int, ssh_key_path: str, filters: List[dict] = None,
-                       mkdir: str = None, use_sudo: bool = False, dry_run: bool = False):
+                       mkdir: str = None, use_sudo: bool = False, dry_run: bool = False, ssh_control_path: str = None,
+                       delete: bool = False):
 
     sudo_str = 'sudo ' if use_sudo else ''
     remote_rsync_cmd = sudo_str + 'rsync'
     if mkdir:
         remote_rsync_cmd = '%smkdir -p \'%s\' && %s' % (sudo_str, mkdir, remote_rsync_cmd)
 
+    # reuse the SSH master connection
+    control_path_option = (' -o ControlPath=\'%s\'' % ssh_control_path) if ssh_control_path else ''
+
     rsync_cmd = 'rsync -av ' \
                 '--no-owner ' \
                 '--no-group ' \
                 '--prune-empty-dirs ' \
-                '-e "ssh -i \'%s\' -p %d -o StrictHostKeyChecking=no -o ConnectTimeout=10" ' \
+                '-e "ssh -i \'%s\' -p %d -o StrictHostKeyChecking=no -o ConnectTimeout=10%s" ' \
                 '--rsync-path="%s"'  \
-                % (ssh_key_path, ssh_port, remote_rsync_cmd)
+                % (ssh_key_path, ssh_port, control_path_option, remote_rsync_cmd)
+
+    if delete:
+        rsync_cmd += ' --delete'
 
     if dry_run:
         rsync_cmd += ' --dry-run'
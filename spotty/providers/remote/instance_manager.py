@@ -29,16 +29,18 @@ class InstanceManager(AbstractSshInstanceManager):
         check_rsync_installed()
 
         # sync the project with the instance
+        endpoint, control_path = self.get_ssh_connection()
         rsync_cmd = get_upload_command(
             local_dir=self.project_config.project_dir,
             remote_dir=self.instance_config.host_project_dir,
-            ssh_user=self.ssh_user,
-            ssh_host=self.ssh_host,
+            ssh_user=endpoint['user'],
+            ssh_host=endpoint['host'],
             ssh_key_path=self.ssh_key_path,
-            ssh_port=self.ssh_port,
+            ssh_port=endpoint['port'],
             filters=self.project_config.sync_filters,
             use_sudo=(not self.instance_config.container_config.run_as_host_user),
             dry_run=dry_run,
+            ssh_control_path=control_path,
         )
 
         # execute the command locally
@@ -55,16 +57,18 @@ class InstanceManager(AbstractSshInstanceManager):
         check_rsync_installed()
 
         # sync the project with the instance
+        endpoint, control_path = self.get_ssh_connection()
         rsync_cmd = get_download_command(
             local_dir=self.project_config.project_dir,
             remote_dir=self.instance_config.host_project_dir,
-            ssh_user=self.ssh_user,
-            ssh_host=self.ssh_host,
+            ssh_user=endpoint['user'],
+            ssh_host=endpoint['host'],
             ssh_key_path=self.ssh_key_path,
-            ssh_port=self.ssh_port,
+            ssh_port=endpoint['port'],
             filters=download_filters,
             use_sudo=(not self.instance_config.container_config.run_as_host_user),
             dry_run=dry_run,
+            ssh_control_path=control_path,
         )
 
         # execute the command locally
@@ -1,8 +1,10 @@
+import json
 from argparse import ArgumentParser, Namespace
-from spotty.providers.vast.helpers.vast_cli import search__offers, deindent, api_key_guard, api_key_file_base, \
-    server_url_default
-from spotty.providers.vast.helpers.vast_cli import parser as vast_parser
-
+from spotty.providers.vast.helpers.vast_cli import api_key_file_base, server_url_default, display_table, \
+    displayable_fields
+from spotty.providers.vast.helpers.offer_cache import get_offers
+from spotty.providers.vast.helpers.offer_ranking import DEFAULT_RANKING_WEIGHTS, rank_offers, parse_ranking_weights
+from spotty.providers.vast.helpers.vast_client import VastClient, build_offers_query, build_offers_order
 from spotty.commands.abstract_command import AbstractCommand
 from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
 
@@ -33,6 +35,12 @@ class SearchOfferCommand(AbstractCommand):
         parser.add_argument("-o", "--order", type=str,
                             help="Comma-separated list of fields to sort on. postfix field with - to sort desc. ex: -o 'num_gpus,total_flops-'.  default='score-'",
                             default='score-')
+        parser.add_argument("--rank", action="store_true",
+                            help="Rank the offers locally by weighted scores instead of sorting them with the API")
+        parser.add_argument("--weights", type=str, default=None,
+                            help="Comma-separated weights of the fields for the \"--rank\" option. A negative weight "
+                                 "means that lower values are better. default: '%s'"
+                                 % ','.join('%s=%g' % item for item in DEFAULT_RANKING_WEIGHTS.items()))
         parser.add_argument("query",
                             nargs="*", default=None,
                             help="""
@@ -102,4 +110,23 @@ class SearchOfferCommand(AbstractCommand):
     """)
 
     def run(self, args: Namespace, output: AbstractOutputWriter):
-        search__offers(args)
+        client = VastClient(api_key=(args.api_key or None), url=args.url)
+        query = build_offers_query(' '.join(args.query) if args.query else None, use_defaults=(not args.no_default))
+
+        fields = displayable_fields
+        if args.rank:
+            # the same ranking as the "start" command uses
+            weights = parse_ranking_weights(args.weights) if args.weights else None
+            rows = rank_offers(get_offers(client, query, offer_type=args.type), weights=weights)
+            fields += (('score', 'Score', '{:0.3f}', None, True),)
+        else:
+            if args.weights:
+                raise ValueError('The "--weights" option can be used only with the "--rank" option.')
+
+            rows = client.search_offers(query, order=build_offers_order(args.order), offer_type=args.type,
+                                        disable_bundling=args.disable_bundling)
+
+        if args.raw:
+            output.write(json.dumps(rows, indent=1, sort_keys=True))
+        else:
+            display_table(rows, fields)
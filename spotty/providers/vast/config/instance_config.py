@@ -44,6 +44,17 @@ class InstanceConfig(AbstractInstanceConfig):
     def sort(self) -> int:
         return self._params['sort']
 
+    @property
+    def ranking(self) -> dict:
+        """Weights and constraints to rank the offers locally. If it's None, the offers
+        are sorted by the API using the "sort" parameter."""
+        return self._params['ranking']
+
+    @property
+    def offer_attempts(self) -> int:
+        """Maximum number of offers to try if the instance cannot be created."""
+        return self._params['offerAttempts']
+
     @property
     def bid_ratio(self) -> float:
         return self._params['bidRatio']
@@ -1,5 +1,6 @@
 from schema import Optional, And, Regex, Or, Use
 from spotty.config.validation import validate_config, get_instance_parameters_schema
+from spotty.providers.vast.helpers.offer_ranking import DEFAULT_RANKING_WEIGHTS
 from spotty.providers.vast.helpers.vast_cli import parse_query
 
 
@@ -25,6 +26,15 @@ def validate_instance_parameters(params: dict):
                                                     ),
         Optional('ports', default=[]): [And(str, Regex(r'^port-[0-9]+$'))],
         Optional('imageLogin', default=None): str,
+        Optional('ranking', default=None): Or(None, {
+            Optional('weights', default=dict(DEFAULT_RANKING_WEIGHTS)): {str: And(Or(float, int), Use(float))},
+            Optional('constraints', default={}): {str: {
+                Optional('min'): Or(float, int),
+                Optional('max'): Or(float, int),
+            }},
+        }),
+        Optional('offerAttempts', default=3): And(int, lambda x: x > 0,
+                                                  error='"offerAttempts" should be greater than 0.'),
     }
 
     schema = get_instance_parameters_schema(instance_parameters, HostPathVolume.TYPE_NAME)
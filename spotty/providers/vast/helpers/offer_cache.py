@@ -0,0 +1,83 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import List
+from spotty.configuration import get_spotty_cache_dir
+from spotty.providers.vast.helpers.vast_client import VastClient
+
+
+# offers change quickly, so they are reused only for a short time
+OFFERS_CACHE_TTL = 60
+
+# number of offers that are fetched to be ranked locally
+OFFERS_LIMIT = 256
+
+
+class OfferCache(object):
+    """On-disk cache for the Vast.ai offers.
+
+    Offers are keyed by the search query, each entry expires after the TTL.
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, ttl: int = OFFERS_CACHE_TTL):
+        self._ttl = ttl
+        self._cache_path = os.path.join(get_spotty_cache_dir('vast'), 'offers.json')
+
+    @staticmethod
+    def get_key(query: dict, offer_type: str) -> str:
+        return hashlib.sha1(json.dumps([query, offer_type], sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _load(self) -> dict:
+        try:
+            with open(self._cache_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def get_offers(self, key: str) -> List[dict]:
+        """Returns the offers or None if they are not cached or expired."""
+        with self._lock:
+            entry = self._load().get(key)
+
+        if not entry or (time.time() - entry['timestamp'] > self._ttl):
+            return None
+
+        return entry['offers']
+
+    def set_offers(self, key: str, offers: List[dict]):
+        with self._lock:
+            data = self._load()
+
+            # remove expired entries
+            now = time.time()
+            data = {key: entry for key, entry in data.items() if now - entry['timestamp'] <= self._ttl}
+            data[key] = {'timestamp': now, 'offers': offers}
+
+            tmp_path = '%s.%d.tmp' % (self._cache_path, os.getpid())
+            try:
+                with open(tmp_path, 'w') as f:
+                    json.dump(data, f)
+
+                os.replace(tmp_path, self._cache_path)
+            except OSError as e:
+                logging.debug('Couldn\'t save the Vast offers cache: ' + str(e))
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+
+
+def get_offers(client: VastClient, query: dict, offer_type: str, use_cache: bool = True) -> List[dict]:
+    """Returns a broad set of offers that match the query. The offers are cached for a short time."""
+    cache = OfferCache()
+    key = cache.get_key(query, offer_type)
+
+    offers = cache.get_offers(key) if use_cache else None
+    if offers is None:
+        offers = client.search_offers(query, offer_type=offer_type, limit=OFFERS_LIMIT)
+        cache.set_offers(key, offers)
+
+    return offers
@@ -0,0 +1,102 @@
+from typing import Dict, List
+from spotty.providers.vast.helpers.vast_client import OFFER_FIELD_ALIASES
+
+
+# default weights of the offer fields: the price is minimized, the performance,
+# the reliability and the bandwidth are maximized
+DEFAULT_RANKING_WEIGHTS = {
+    'dph_total': -1.0,
+    'dlperf': 1.0,
+    'reliability2': 1.0,
+    'inet_down': 0.25,
+    'disk_bw': 0.25,
+}
+
+
+def parse_ranking_weights(weights_str: str) -> Dict[str, float]:
+    """Parses weights in the "field=weight,field=weight" format."""
+    weights = {}
+    for item in weights_str.split(','):
+        item = item.strip()
+        if not item:
+            continue
+
+        field, sep, value = item.partition('=')
+        try:
+            weights[field.strip()] = float(value)
+        except ValueError:
+            raise ValueError('Incorrect weight "%s", the format is "field=weight".' % item)
+
+    return weights
+
+
+def is_offer_allowed(offer: dict, constraints: Dict[str, dict]) -> bool:
+    """Checks that the offer satisfies the hard constraints.
+
+    Args:
+        offer: Offer info.
+        constraints: Minimum and maximum values of the fields, for example: {'dph_total': {'max': 0.5}}.
+    """
+    for field, limits in constraints.items():
+        value = offer.get(OFFER_FIELD_ALIASES.get(field, field))
+        if value is None:
+            return False
+
+        if ('min' in limits) and (value < limits['min']):
+            return False
+
+        if ('max' in limits) and (value > limits['max']):
+            return False
+
+    return True
+
+
+def score_offers(offers: List[dict], weights: Dict[str, float]) -> List[float]:
+    """Returns scores of the offers.
+
+    Each field is normalized to the [0, 1] range across all the offers, then the normalized
+    values are multiplied by the weights and summed up. A missing value is treated as
+    the worst value of the field.
+    """
+    scores = [0.0] * len(offers)
+    for field, weight in weights.items():
+        if not weight:
+            continue
+
+        field = OFFER_FIELD_ALIASES.get(field, field)
+        column = [offer.get(field) for offer in offers]
+        values = [value for value in column if value is not None]
+        if not values:
+            continue
+
+        min_value, max_value = min(values), max(values)
+        value_range = max_value - min_value
+        worst_value = min_value if weight > 0 else max_value
+
+        for i, value in enumerate(column):
+            if value is None:
+                value = worst_value
+
+            normalized_value = (value - min_value) / value_range if value_range else 0
+            scores[i] += weight * normalized_value
+
+    return scores
+
+
+def rank_offers(offers: List[dict], weights: Dict[str, float] = None,
+                constraints: Dict[str, dict] = None) -> List[dict]:
+    """Filters the offers using the hard constraints and sorts them by scores.
+
+    Returns:
+        Copies of the offers with the "score" field, the best offer goes first.
+    """
+    if weights is None:
+        weights = DEFAULT_RANKING_WEIGHTS
+
+    offers = [offer for offer in offers if is_offer_allowed(offer, constraints or {})]
+    scores = score_offers(offers, weights)
+
+    ranked_offers = [dict(offer, score=score) for offer, score in zip(offers, scores)]
+    ranked_offers.sort(key=lambda offer: offer['score'], reverse=True)
+
+    return ranked_offers
@@ -0,0 +1,82 @@
+import logging
+import socket
+import subprocess
+import time
+from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
+from spotty.deployment.utils.commands import get_ssh_command
+from spotty.deployment.utils.polling import AdaptiveDelay
+from spotty.providers.vast.helpers.vast_client import VastClient
+
+
+def get_ssh_port(instance: dict) -> int:
+    """Returns a host port that is mapped to the SSH port of the container or None
+    if the ports are not mapped yet."""
+    for host_port in (instance.get('ports') or {}).get('22/tcp') or []:
+        if host_port.get('HostPort'):
+            return int(host_port['HostPort'])
+
+    return None
+
+
+def is_port_open(host: str, port: int, timeout: float = 3) -> bool:
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+def is_ssh_ready(host: str, port: int, user: str, key_path: str, timeout: float = 20) -> bool:
+    """Checks that an SSH connection can be established and a command can be executed."""
+    ssh_cmd = get_ssh_command(host, port, user, key_path, 'true', tty=False, quiet=True, batch_mode=True)
+    try:
+        res = subprocess.run(ssh_cmd, shell=True, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                             stderr=subprocess.DEVNULL, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return False
+
+    return res.returncode == 0
+
+
+def wait_instance_ready(client: VastClient, instance_id: int, ssh_user: str, ssh_key_path: str,
+                        output: AbstractOutputWriter, timeout: float = 600) -> dict:
+    """Waits until the SSH server of the instance accepts connections.
+
+    The instance is polled with short delays that grow up to 15 seconds and are reset once its status
+    changes. Status messages of the instance are written to the output. Once the SSH port is mapped, the port
+    is probed with a TCP connection and then with the "ssh true" command.
+
+    Returns:
+        The instance info.
+    """
+    delay = AdaptiveDelay(initial=2, maximum=15)
+    deadline = time.time() + timeout
+    last_status_msg = None
+
+    while True:
+        instance = client.get_instance(instance_id)
+
+        # show the status transitions as a progress
+        status_msg = (instance.get('status_msg') or '').strip()
+        if status_msg and (status_msg != last_status_msg):
+            output.write('- %s' % status_msg)
+            last_status_msg = status_msg
+            delay.reset()
+
+        if 'error' in status_msg.lower():
+            raise ValueError('Instance creation failed: %s' % status_msg)
+
+        host = instance.get('public_ipaddr')
+        port = get_ssh_port(instance)
+        if (instance.get('actual_status') == 'running') and host and port:
+            host = host.strip()
+            if is_port_open(host, port) and is_ssh_ready(host, port, ssh_user, ssh_key_path):
+                return instance
+
+            logging.debug('SSH server on %s:%d is not ready yet' % (host, port))
+
+        if time.time() + delay.delay > deadline:
+            raise ValueError('Instance creation timeout. Current instance status: %s\n'
+                             'Check it manually at https://cloud.vast.ai/instances/' % (status_msg or 'unknown'))
+
+        delay.sleep()
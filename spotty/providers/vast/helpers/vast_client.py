@@ -0,0 +1,220 @@
+import json
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import List
+import requests
+from requests.adapters import HTTPAdapter
+from spotty.providers.vast.helpers.vast_api_key import vast_api_key
+from spotty.providers.vast.helpers.vast_cli import server_url_default, parse_query, parse_env
+
+
+# statuses of the responses that can be retried
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# the same aliases as the "vast search offers" command uses
+OFFER_FIELD_ALIASES = {
+    'cuda_vers': 'cuda_max_good',
+    'reliability': 'reliability2',
+    'dlperf_usd': 'dlperf_per_dphtotal',
+    'dph': 'dph_total',
+    'flops_usd': 'flops_per_dphtotal',
+}
+
+
+class VastClient(object):
+    """Vast.ai REST API client.
+
+    All requests share one HTTP session, so connections are kept alive and reused. Requests that
+    failed because of a connection error, rate limiting or a server error are retried with an exponential
+    backoff and a jitter, the "Retry-After" header is honored. The client can be used from several threads.
+    """
+
+    def __init__(self, api_key: str = None, url: str = server_url_default, max_retries: int = 5,
+                 backoff_base: float = 1, backoff_max: float = 30, timeout: float = 30, pool_size: int = 10):
+        self._api_key = vast_api_key if api_key is None else api_key
+        self._url = url.rstrip('/') + '/api/v0'
+        self._max_retries = max_retries
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._timeout = timeout
+
+        # the connection pool of the adapter is thread-safe
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+
+    def get_instances(self) -> List[dict]:
+        """Returns the user's instances."""
+        return self._request('GET', '/instances', params={'owner': 'me'})['instances']
+
+    def get_instance(self, instance_id: int) -> dict:
+        return self._request('GET', '/instances/%d/' % instance_id)['instances']
+
+    def search_offers(self, query: dict, order: List[list] = None, offer_type: str = 'on-demand',
+                      disable_bundling: bool = False, limit: int = None) -> List[dict]:
+        """Returns offers that match the query.
+
+        Args:
+            query: A query in the API format, see the "build_offers_query" function.
+            order: A list of fields to sort on, for example: [['dph_total', 'asc']].
+            offer_type: "on-demand" or "bid" (interruptible) offers.
+            disable_bundling: Show identical offers.
+            limit: Maximum number of offers.
+        """
+        query = dict(query, order=order or [], type='bid' if offer_type == 'interruptible' else offer_type)
+        if disable_bundling:
+            query['disable_bundling'] = True
+
+        if limit:
+            query['limit'] = limit
+
+        return self._request('GET', '/bundles', params={'q': query})['offers']
+
+    def create_instance(self, offer_id: int, image: str, disk: float, label: str = None, env: str = None,
+                        price: float = None, onstart: str = None, image_login: str = None,
+                        direct: bool = True) -> dict:
+        """Rents an offer and starts a container with SSH access.
+
+        Returns:
+            A response in the format: {'success': True, 'new_contract': <instance ID>}.
+        """
+        # the request is not idempotent, so it's retried only if it was rejected by the rate limiter
+        return self._request('PUT', '/asks/%d/' % offer_id, idempotent=False, body={
+            'client_id': 'me',
+            'image': image,
+            'env': parse_env(env),
+            'price': price,
+            'disk': disk,
+            'label': label,
+            'onstart': onstart,
+            'runtype': 'ssh_direc ssh_proxy' if direct else 'ssh_proxy',
+            'image_login': image_login,
+        })
+
+    def stop_instance(self, instance_id: int):
+        self._request('PUT', '/instances/%d/' % instance_id, body={'state': 'stopped'})
+
+    def destroy_instance(self, instance_id: int):
+        self._request('DELETE', '/instances/%d/' % instance_id, body={})
+
+    def get_current_user(self) -> dict:
+        user = self._request('GET', '/users/current', params={'owner': 'me'})
+        user.pop('api_key', None)
+
+        return user
+
+    def set_ssh_key(self, user_id: int, ssh_key: str):
+        self._request('PUT', '/users/%d/' % user_id, body={'ssh_key': ssh_key})
+
+    def _request(self, method: str, path: str, params: dict = None, body: dict = None,
+                 idempotent: bool = True) -> dict:
+        """Sends a request and returns the parsed response.
+
+        Args:
+            idempotent: If False, the request is retried only if it was rejected by the rate limiter.
+        """
+        params = _encode_params(dict(params or {}, api_key=self._api_key))
+        url = self._url + path
+        retry_statuses = RETRY_STATUSES if idempotent else (429,)
+
+        attempt = 0
+        while True:
+            try:
+                response = self._session.request(method, url, params=params, json=body, timeout=self._timeout)
+            except requests.ConnectionError:
+                if not idempotent or (attempt >= self._max_retries):
+                    raise
+
+                delay = self._get_backoff_delay(attempt)
+                logging.debug('Vast API: connection error, retrying in %.1fs' % delay)
+            else:
+                if (response.status_code not in retry_statuses) or (attempt >= self._max_retries):
+                    response.raise_for_status()
+                    res = response.json()
+                    if isinstance(res, dict) and (res.get('success') is False):
+                        raise ValueError('Vast API error: %s' % (res.get('msg') or res.get('error') or res))
+
+                    return res
+
+                delay = _get_retry_after(response)
+                if delay is None:
+                    delay = self._get_backoff_delay(attempt)
+
+                logging.debug('Vast API: status %d, retrying in %.1fs' % (response.status_code, delay))
+
+            time.sleep(delay)
+            attempt += 1
+
+    def _get_backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with a "full jitter"."""
+        return random.uniform(0, min(self._backoff_max, self._backoff_base * (2 ** attempt)))
+
+
+def build_offers_query(query_str: str = None, use_defaults: bool = True) -> dict:
+    """Converts a query string in the "vast search offers" format to the API format."""
+    query = {'verified': {'eq': True}, 'external': {'eq': False}, 'rentable': {'eq': True}} if use_defaults else {}
+    if query_str:
+        query = parse_query(query_str, query)
+
+    return query
+
+
+def build_offers_order(order_str: str) -> List[list]:
+    """Converts a comma-separated list of fields to sort on to the API format.
+    A field with the "-" postfix is sorted in the descending order."""
+    order = []
+    for name in order_str.split(','):
+        name = name.strip()
+        if not name:
+            continue
+
+        field = name.strip('-')
+        order.append([OFFER_FIELD_ALIASES.get(field, field), 'desc' if field != name else 'asc'])
+
+    return order
+
+
+def _encode_params(params: dict) -> dict:
+    """Query parameters that are not strings are sent as JSON values."""
+    return {key: (value if isinstance(value, str) else json.dumps(value)) for key, value in params.items()}
+
+
+def _get_retry_after(response: requests.Response):
+    """Returns a number of seconds from the "Retry-After" header or None if it's not set."""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0)
+
+
+_lock = threading.Lock()
+_client = None
+
+
+def get_vast_client() -> VastClient:
+    """Returns a client that is shared within the process."""
+    global _client
+    with _lock:
+        if _client is None:
+            _client = VastClient()
+
+    return _client
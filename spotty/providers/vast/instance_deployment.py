@@ -1,44 +1,31 @@
-import json
 import subprocess
-import time
-from argparse import Namespace
-
+from typing import List
+import requests
 from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
 from spotty.deployment.abstract_cloud_instance.abstract_data_transfer import AbstractDataTransfer
 from spotty.deployment.abstract_cloud_instance.abstract_instance_deployment import AbstractInstanceDeployment
 from spotty.deployment.container.abstract_container_commands import AbstractContainerCommands
 from spotty.providers.vast.config.instance_config import InstanceConfig
-
-from spotty.providers.vast.helpers.catch_stdout import catch_stdout
-from spotty.providers.vast.helpers.vast_api_key import vast_api_key
-from spotty.providers.vast.helpers.vast_cli import server_url_default, show__instances, create__instance, \
-    search__offers, displayable_fields, display_table, stop__instance, destroy__instance
+from spotty.providers.vast.helpers.offer_cache import get_offers
+from spotty.providers.vast.helpers.offer_ranking import rank_offers
+from spotty.providers.vast.helpers.readiness import wait_instance_ready, get_ssh_port
+from spotty.providers.vast.helpers.vast_cli import displayable_fields, display_table
+from spotty.providers.vast.helpers.vast_client import get_vast_client, build_offers_query, build_offers_order
 from spotty.providers.vast.resource_managers.ssh_key_manager import SshKeyManager
 
-default_args = {
-    "raw": True,
-    "api_key": vast_api_key,
-    'url': server_url_default,
-}
-
 
 class InstanceDeployment(AbstractInstanceDeployment):
     instance_config: InstanceConfig
 
     def __init__(self, instance_config: InstanceConfig):
         super().__init__(instance_config)
+        self._client = get_vast_client()
         self._instance = None
 
     def get_instance(self, force_update=False) -> dict:
         if force_update or not self._instance:
-            args = Namespace(**{
-                "raw": True,
-                "api_key": vast_api_key,
-                'url': server_url_default,
-            })
-
             self._instance = next(filter(lambda x: x.get('label') == self.instance_config.name,
-                                         json.loads(catch_stdout(lambda: show__instances(args)))), {})
+                                         self._client.get_instances()), {})
         return self._instance
 
     @property
@@ -47,7 +34,10 @@ class InstanceDeployment(AbstractInstanceDeployment):
 
     def deploy(self, container_commands: AbstractContainerCommands, output: AbstractOutputWriter,
                bucket_name: str = None, data_transfer: AbstractDataTransfer = None, dry_run: bool = False):
-        machine = self._find_instance(output)
+        # the key of the account is added to the instance when it's created
+        self.ssh_key_manager.match_rsa_key(force=True)
+
+        offers = self._find_offers(output)
 
         if self.instance_config.image_login and 'docker login' not in self.instance_config.image_login:
             login = subprocess.check_output(self.instance_config.image_login, shell=True).decode().split('\n')[0]
@@ -64,83 +54,61 @@ class InstanceDeployment(AbstractInstanceDeployment):
             env += [f"-p {i['containerPort']}:{i['containerPort']}" for i in
                     self.instance_config.container_config.ports]
 
-        args = Namespace(**{
-            "id": machine['id'],
-            "image": self.instance_config.container_config.image,
-            "env": ' '.join(env),
-            "price": machine['dph_base'] * self.instance_config.bid_ratio,
-            "disk": self.instance_config.root_volume_size,
-            "label": self.instance_config.name,
-            "extra": None,
-            "onstart": None,
-            "onstart_cmd": self._startup_script,
-            "args": None,
-            "login": login,
-            "python_utf8": False,
-            "lang_utf8": False,
-            "jupyter": False,
-            "ssh": True,
-            "direct": True,
-            "use_jupyter_lab": False,
-            "jupyter_dir": None,
-            "jupyter_lab": None,
-            "create_from": None,
-            "force": None,
-        }, **default_args)
-
-        output_str = catch_stdout(lambda: create__instance(args))
-
-        if json.loads(output_str)['success']:
-            for i in range(20):
-                time.sleep(30)
-
-                instance = self.get_instance(force_update=True)
-                status = (instance.get('status_msg') or "").lower()
-
-                if "success" in status and instance.get('ports'):
-                    output.write("Instance created successfully.")
-                    break
-                elif "error" in status:
-                    output.write(f"error message: {status}")
-                    raise ValueError("Instance creation failed.")
-
-                elif i == 19:
-                    output.write(f"Instance creation timeout. Current instance status: {status}")
-                    output.write("check manually at https://cloud.vast.ai/instances/")
-                    raise ValueError("Instance creation failed.")
-
-            self.ssh_key_manager.match_rsa_key(default_args)
-
-    def _find_instance(self, output: AbstractOutputWriter) -> dict:
+        # try the next best offer if the instance cannot be created
+        res = None
+        for i, offer in enumerate(offers[:self.instance_config.offer_attempts]):
+            output.write('\nSelected offer%s:' % (' #%d' % (i + 1) if i else ''))
+            display_table([offer], displayable_fields)
+
+            try:
+                res = self._client.create_instance(
+                    offer_id=offer['id'],
+                    image=self.instance_config.container_config.image,
+                    disk=self.instance_config.root_volume_size,
+                    label=self.instance_config.name,
+                    env=' '.join(env),
+                    price=offer['dph_base'] * self.instance_config.bid_ratio,
+                    onstart=self._startup_script(),
+                    image_login=login,
+                )
+                break
+            except (requests.HTTPError, ValueError) as e:
+                output.write('Couldn\'t rent the offer: %s' % str(e))
+
+        if not res:
+            raise ValueError('Failed to create the instance.')
+
+        output.write('Waiting for the instance to be ready...')
+        with output.prefix('  '):
+            self._instance = wait_instance_ready(self._client, res['new_contract'], self.instance_config.user,
+                                                 self.ssh_key_manager.private_key_file, output)
+
+        output.write('Instance created successfully.')
+
+    def _find_offers(self, output: AbstractOutputWriter) -> List[dict]:
+        """Returns offers that match the query, the best offer goes first."""
         output.write(f"Finding instance related to query:\n{self.instance_config.query}"
-                     f"sorted by: {self.instance_config.sort}\n")
+                     f"sorted by: {self.instance_config.sort if not self.instance_config.ranking else 'ranking'}\n")
         query = self.instance_config.query.replace("\r\n", "\n").replace("\n", " ")
         query += f" disk_space>={self.instance_config.root_volume_size}"
         query += f" direct_port_count>{len(self.instance_config.container_config.ports)}"  # strict > to have at least one port for direct ssh
         query += " rentable=True"
 
-        args = Namespace(**{
-            'query': query,
-            'type': self.instance_config.type,
-            'order': self.instance_config.sort,
-            'storage': self.instance_config.root_volume_size,
-            'no_default': False,
-            'disable_bundling': False,
-            'api_key': '',
-            'url': server_url_default,
-            'raw': True
-        })
-
-        output_str = catch_stdout(lambda: search__offers(args))
-        selected_machine = next(iter(json.loads(output_str)), None)
-
-        if selected_machine:
-            output.write("\n\nselected machine:")
-            display_table([selected_machine], displayable_fields)
-            return selected_machine
+        ranking = self.instance_config.ranking
+        if ranking:
+            # fetch a broad set of offers and rank them locally
+            offers = get_offers(self._client, build_offers_query(query), offer_type=self.instance_config.type)
+            offers = rank_offers(offers, weights=ranking['weights'], constraints=ranking['constraints'])
         else:
+            offers = self._client.search_offers(build_offers_query(query),
+                                                order=build_offers_order(self.instance_config.sort),
+                                                offer_type=self.instance_config.type)
+
+        if not offers:
             raise ValueError('No instances found with these parameters.')
 
+        return offers
+
     def _startup_script(self) -> str:
         commands = f"echo 'HOME={self.instance_config.host_project_dir}' >> /root/.bashrc\n"
         commands += f"echo 'cd' >> /root/.bashrc\n"
@@ -152,24 +120,20 @@ class InstanceDeployment(AbstractInstanceDeployment):
     def delete(self, output: AbstractOutputWriter):
         instance_id = self.get_instance().get('id')
         if instance_id:
-            args = Namespace(**default_args, id=instance_id)
             output.write('Deleting the instance...')
-            destroy__instance(args)
+            self._client.destroy_instance(instance_id)
 
     def stop(self, output: AbstractOutputWriter):
         instance_id = self.get_instance().get('id')
         if instance_id:
-            args = Namespace(**default_args, id=instance_id)
             output.write('Shutting down the instance...')
-            stop__instance(args)
+            self._client.stop_instance(instance_id)
 
     @property
     def ssh_port(self) -> int:
-        instance = self.get_instance()
-
-        for port, host in instance.get('ports', {}).items():
-            if '22' in port:
-                return int(host[0]['HostPort'])
+        port = get_ssh_port(self.get_instance())
+        if not port:
+            raise ValueError('No ssh port found.')
 
-        raise ValueError('No ssh port found.')
+        return port
 
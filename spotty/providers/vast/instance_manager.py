@@ -1,9 +1,11 @@
 from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
 from spotty.config.project_config import ProjectConfig
 from spotty.deployment.container.vast.vast_commands import VastCommands
+from spotty.errors.instance_not_running import InstanceNotRunningError
 from spotty.providers.remote.instance_manager import InstanceManager as RemoteInstanceManager
 from spotty.providers.vast.config.instance_config import InstanceConfig
-from spotty.providers.vast.instance_deployment import InstanceDeployment, default_args
+from spotty.providers.vast.helpers.readiness import get_ssh_port
+from spotty.providers.vast.instance_deployment import InstanceDeployment
 from spotty.utils import render_table
 
 
@@ -32,12 +34,12 @@ class InstanceManager(RemoteInstanceManager):
     def delete(self, output: AbstractOutputWriter):
         pass
 
-    def exec(self, command: str, tty: bool = True) -> int:
+    def exec(self, command: str, tty: bool = True, output: AbstractOutputWriter = None) -> int:
         """Executes a command on the host OS."""
-        self.instance_deployment.ssh_key_manager.match_rsa_key(default_args)
+        self.instance_deployment.ssh_key_manager.match_rsa_key()
         if command == "$SHELL":
             raise ValueError("Cannot run shell on Host on Vast.ai")
-        super().exec(command, tty)
+        return super().exec(command, tty, output=output)
 
     def start(self, output: AbstractOutputWriter, dry_run=False):
         # make sure the Dockerfile exists
@@ -69,14 +71,31 @@ class InstanceManager(RemoteInstanceManager):
 
 
     def stop(self, only_shutdown: bool, output: AbstractOutputWriter):
+        self.delete_ssh_endpoint()
         if only_shutdown:
             self.instance_deployment.stop(output)
         else:
             self.instance_deployment.delete(output)
 
+    def get_status_info(self) -> dict:
+        instance = self.instance_deployment.get_instance()
+        self.refresh_ssh_endpoint(instance)
+        if not instance:
+            return {'state': 'not running'}
+
+        return {
+            'state': instance.get('actual_status') or 'unknown',
+            'location': instance.get('geolocation'),
+            'instance_type': '%sx %s' % (instance.get('num_gpus'), instance.get('gpu_name')),
+            'ip_address': instance.get('public_ipaddr'),
+            'purchasing_option': 'interruptible' if instance.get('is_bid') else 'on-demand',
+            'price': instance.get('dph_total'),
+        }
+
     def get_status_text(self):
         self.is_running()
         instance = self.instance_deployment.get_instance()
+        self.refresh_ssh_endpoint(instance)
         table = [
             ('CPU',
              instance.get('cpu_name') + f" ({int(instance.get('cpu_cores_effective'))}T available)"),
@@ -101,6 +120,26 @@ class InstanceManager(RemoteInstanceManager):
     def ssh_host(self) -> str:
         return self.instance_deployment.get_instance().get('public_ipaddr')
 
+    def _get_ssh_endpoint(self, instance: dict = None) -> dict:
+        if not instance:
+            instance = self.instance_deployment.get_instance()
+
+        if not instance or (instance.get('actual_status') != 'running'):
+            raise InstanceNotRunningError(self.instance_config.name)
+
+        # the endpoint is built from the same instance data to avoid extra API calls
+        ssh_port = get_ssh_port(instance)
+        if not ssh_port:
+            raise ValueError('No ssh port found.')
+
+        return {
+            'host': instance.get('public_ipaddr'),
+            'port': ssh_port,
+            'user': self.ssh_user,
+            'instance_id': instance.get('id'),
+            'container_name': self.instance_config.full_container_name,
+        }
+
     @property
     def ssh_key_path(self):
         return self.instance_deployment.ssh_key_manager.private_key_file
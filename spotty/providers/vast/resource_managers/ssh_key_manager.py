@@ -1,15 +1,18 @@
+import hashlib
 import json
+import logging
 import os
 import subprocess
-from argparse import Namespace
-
-import requests
-
+import time
 from spotty.configuration import get_spotty_keys_dir
 from shutil import which
 from spotty.providers.instance_manager_factory import PROVIDER_VAST
-from spotty.providers.vast.helpers.catch_stdout import catch_stdout
-from spotty.providers.vast.helpers.vast_cli import show__user, apiurl
+from spotty.providers.vast.helpers.vast_api_key import vast_api_key
+from spotty.providers.vast.helpers.vast_client import get_vast_client
+
+
+# the key registered in the account is checked again after this time
+KEY_VERIFICATION_TTL = 24 * 3600
 
 
 class SshKeyManager(object):
@@ -26,6 +29,11 @@ class SshKeyManager(object):
     def public_key_file(self):
         return os.path.join(self._keys_dir, self._key_name + '.pub')
 
+    @property
+    def verification_file(self):
+        """A file with the fingerprint of the key that was verified to be registered in the account."""
+        return os.path.join(self._keys_dir, self._key_name + '.verified.json')
+
     def get_public_key_value(self):
         # generate a key if it doesn't exist
         if not os.path.isfile(self.private_key_file) or not os.path.isfile(self.public_key_file):
@@ -58,19 +66,62 @@ class SshKeyManager(object):
         if res.returncode:
             raise subprocess.CalledProcessError(res.returncode, generate_key_cmd)
 
-    def match_rsa_key(self, args):
-        user = json.loads(catch_stdout(lambda: show__user(Namespace(**args))))
-        if user["ssh_key"] != self.get_public_key_value():
+    def match_rsa_key(self, force: bool = False):
+        """Checks that the local public key is registered in the Vast.ai account.
+
+        The result is cached, so the account is requested again only if the local key or the API key
+        was changed or the verification is older than the TTL.
+
+        Args:
+            force: Check the key even if it was verified recently.
+        """
+        public_key_value = self.get_public_key_value()
+        if not force and self._is_key_verified(public_key_value):
+            return
+
+        client = get_vast_client()
+        user = client.get_current_user()
+        if user["ssh_key"] != public_key_value:
             print('Vast ai account already have a different RSA key registered.')
-            print('local:\n', self.get_public_key_value())
+            print('local:\n', public_key_value)
             print('remote:\n', user["ssh_key"])
             res = input('Type "y" to update it automatically: ')
             if res != 'y':
                 raise ValueError(f'Put your private rsa key in {self.private_key_file}')
             print("Updating RSA key...")
 
-            url = apiurl(Namespace(**args), f"/users/{user['id']}/")
-            requests.put(url, json={
-                "ssh_key": self.get_public_key_value()
-            })
-
+            client.set_ssh_key(user['id'], public_key_value)
+
+        self._save_verification(public_key_value, user['id'])
+
+    @staticmethod
+    def _get_fingerprint(value: str) -> str:
+        return hashlib.sha256(value.strip().encode('utf-8')).hexdigest()
+
+    def _is_key_verified(self, public_key_value: str) -> bool:
+        try:
+            with open(self.verification_file, 'r') as f:
+                verification = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        return (verification.get('key_fingerprint') == self._get_fingerprint(public_key_value)) \
+            and (verification.get('api_key_fingerprint') == self._get_fingerprint(vast_api_key)) \
+            and (time.time() - verification.get('timestamp', 0) <= KEY_VERIFICATION_TTL)
+
+    def _save_verification(self, public_key_value: str, account_id: int):
+        tmp_path = '%s.%d.tmp' % (self.verification_file, os.getpid())
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump({
+                    'key_fingerprint': self._get_fingerprint(public_key_value),
+                    'api_key_fingerprint': self._get_fingerprint(vast_api_key),
+                    'account_id': account_id,
+                    'timestamp': time.time(),
+                }, f)
+
+            os.replace(tmp_path, self.verification_file)
+        except OSError as e:
+            logging.debug('Couldn\'t save the SSH key verification: ' + str(e))
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
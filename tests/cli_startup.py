@@ -0,0 +1,75 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+
+SPOTTY_BIN_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'bin', 'spotty'))
+
+# modules that should never be imported by lightweight commands
+HEAVY_MODULES = ['boto3', 'botocore', 'googleapiclient', 'google.cloud.storage', 'requests', 'pkg_resources',
+                 'spotty.providers.vast.helpers.vast_cli']
+
+# commands that are measured by the benchmark
+BENCHMARK_COMMANDS = [
+    ['-V'],
+    ['status', '-h'],
+    ['exec', '-h'],
+]
+
+
+def get_import_times(args: list, only_top_level: bool = False) -> dict:
+    """Runs the "spotty" script with the "-X importtime" option and returns
+    cumulative import times (in microseconds) for the imported modules.
+    """
+    env = {**os.environ, 'PYTHONPATH': os.path.dirname(os.path.dirname(SPOTTY_BIN_PATH))}
+    res = subprocess.run([sys.executable, '-X', 'importtime', SPOTTY_BIN_PATH] + args, env=env,
+                         stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+    import_times = {}
+    for line in res.stderr.decode('utf-8').splitlines():
+        # format: "import time: self [us] | cumulative | imported package"
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+
+        _, cumulative_us, module_name = line.split('|')
+        if only_top_level and module_name[1:].startswith(' '):
+            continue
+
+        import_times[module_name.strip()] = int(cumulative_us)
+
+    return import_times
+
+
+def get_benchmark() -> dict:
+    """Returns the total import time for each benchmark command."""
+    benchmark = {}
+    for args in BENCHMARK_COMMANDS:
+        benchmark[' '.join(args)] = {
+            'total_import_time_us': sum(get_import_times(args, only_top_level=True).values()),
+            'imported_modules': len(get_import_times(args)),
+        }
+
+    return benchmark
+
+
+class TestCliStartup(unittest.TestCase):
+
+    def test_version_imports(self):
+        import_times = get_import_times(['-V'])
+        self.assertNotIn('spotty.commands.start', import_times)
+        for module_name in HEAVY_MODULES:
+            self.assertNotIn(module_name, import_times)
+
+    def test_command_imports(self):
+        for args in BENCHMARK_COMMANDS[1:]:
+            import_times = get_import_times(args)
+            for module_name in HEAVY_MODULES:
+                self.assertNotIn(module_name, import_times, 'Command "spotty %s" imports the "%s" module'
+                                 % (' '.join(args), module_name))
+
+
+if __name__ == '__main__':
+    # print the benchmark results in the JSON format, so they can be tracked by CI
+    print(json.dumps(get_benchmark(), indent=2))
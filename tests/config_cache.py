@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from spotty.config.config_utils import load_config
+
+
+CONFIG = '''
+project:
+  name: test-project
+
+containers:
+  - projectDir: /workspace/project
+    image: ubuntu:16.04
+
+instances:
+  - name: instance-1
+    provider: local
+'''
+
+
+class TestConfigCache(unittest.TestCase):
+
+    def setUp(self):
+        self._home_dir = tempfile.TemporaryDirectory()
+        self._project_dir = tempfile.TemporaryDirectory()
+        self._config_path = os.path.join(self._project_dir.name, 'spotty.yaml')
+        with open(self._config_path, 'w') as f:
+            f.write(CONFIG)
+
+        self._home_patcher = mock.patch.dict(os.environ, {'HOME': self._home_dir.name})
+        self._home_patcher.start()
+
+    def tearDown(self):
+        self._home_patcher.stop()
+        self._home_dir.cleanup()
+        self._project_dir.cleanup()
+
+    def test_cache_hit(self):
+        project_config = load_config(self._config_path)
+
+        with mock.patch('spotty.config.project_config.validate_basic_config') as validate_mock:
+            cached_project_config = load_config(self._config_path)
+            validate_mock.assert_not_called()
+
+        self.assertEqual(cached_project_config.project_name, project_config.project_name)
+        self.assertEqual(cached_project_config.containers, project_config.containers)
+        self.assertEqual(cached_project_config.instances, project_config.instances)
+
+    def test_cache_invalidation(self):
+        load_config(self._config_path)
+
+        # add an override config
+        with open(os.path.join(self._project_dir.name, 'spotty.override.yaml'), 'w') as f:
+            f.write('project:\n  name: override-project\n')
+
+        project_config = load_config(self._config_path)
+        self.assertEqual(project_config.project_name, 'override-project')
+
+    def test_no_cache(self):
+        load_config(self._config_path)
+
+        with mock.patch('spotty.config.project_config.validate_basic_config') as validate_mock:
+            load_config(self._config_path, use_cache=False)
+            validate_mock.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,22 @@
+import unittest
+from spotty.deployment.abstract_cloud_instance.file_structure import BOOTSTRAP_STEPS_SCRIPT_PATH
+from spotty.deployment.abstract_cloud_instance.start_container_script import CloudStartContainerScript
+from spotty.deployment.container.docker.scripts.start_container_script import StartContainerScript
+from tests.helpers.docker_commands import get_docker_commands_mock
+
+
+class TestCloudStartContainerScript(unittest.TestCase):
+
+    def test_wait_pull_image_step(self):
+        script = CloudStartContainerScript(get_docker_commands_mock()).render()
+
+        self.assertIn('source "%s"\nwait_step pull_image' % BOOTSTRAP_STEPS_SCRIPT_PATH, script)
+        self.assertLess(script.index('wait_step pull_image'), script.index('docker pull ubuntu'))
+
+        # local instances don't have bootstrap steps
+        script = StartContainerScript(get_docker_commands_mock()).render()
+        self.assertNotIn('wait_step', script)
+
+
+if __name__ == '__main__':
+    unittest.main()
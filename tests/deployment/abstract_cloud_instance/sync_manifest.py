@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from spotty.deployment.abstract_cloud_instance.sync_manifest import SyncManifest, get_changes, get_file_entries
+from spotty.deployment.utils.sync_filters import list_local_files
+
+
+class TestSyncManifest(unittest.TestCase):
+
+    def setUp(self):
+        self._home_dir = tempfile.TemporaryDirectory()
+        self._project_dir = tempfile.TemporaryDirectory()
+
+        self._home_patcher = mock.patch.dict(os.environ, {'HOME': self._home_dir.name})
+        self._home_patcher.start()
+
+    def tearDown(self):
+        self._home_patcher.stop()
+        self._home_dir.cleanup()
+        self._project_dir.cleanup()
+
+    def _write_file(self, path: str, content: str, mtime: float = None):
+        file_path = os.path.join(self._project_dir.name, path)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, 'w') as f:
+            f.write(content)
+
+        if mtime:
+            os.utime(file_path, (mtime, mtime))
+
+    def test_changes(self):
+        self._write_file('unchanged', 'a')
+        self._write_file('touched', 'b', mtime=1000)
+        self._write_file('modified', 'c')
+        self._write_file('dir/deleted', 'd')
+
+        manifest = SyncManifest('aws', 'instance-1', self._project_dir.name)
+        self.assertIsNone(manifest.get_files('bucket', '/workspace', []))
+
+        # save the synced files, only the "touched" file has a hash
+        _, _, files = get_changes(list_local_files(self._project_dir.name), {})
+        manifest.save('bucket', '/workspace', [], files)
+        self.assertIsNone(manifest.get_files('bucket', '/workspace', [{'exclude': ['*']}]))
+
+        self._write_file('touched', 'b', mtime=2000)
+        self._write_file('modified', 'cc')
+        self._write_file('new', 'e')
+        os.unlink(os.path.join(self._project_dir.name, 'dir', 'deleted'))
+
+        changed_paths, deleted_paths, files = get_changes(list_local_files(self._project_dir.name),
+                                                          manifest.get_files('bucket', '/workspace', []))
+        self.assertEqual(changed_paths, ['modified', 'new'])
+        self.assertEqual(deleted_paths, ['dir/deleted'])
+        self.assertEqual(files['touched']['mtime'], 2000)
+
+        # nothing changed
+        manifest.save('bucket', '/workspace', [], files)
+        changed_paths, deleted_paths, _ = get_changes(list_local_files(self._project_dir.name),
+                                                      manifest.get_files('bucket', '/workspace', []))
+        self.assertEqual((changed_paths, deleted_paths), ([], []))
+
+        manifest.delete()
+        self.assertIsNone(manifest.get_files('bucket', '/workspace', []))
+
+    def test_unknown_hash(self):
+        self._write_file('file', 'a', mtime=1000)
+        files = get_file_entries(list_local_files(self._project_dir.name))
+
+        # the content is the same, but the hash is unknown
+        self._write_file('file', 'a', mtime=2000)
+        changed_paths, _, files = get_changes(list_local_files(self._project_dir.name), files)
+        self.assertEqual(changed_paths, ['file'])
+        self.assertIsNotNone(files['file']['md5'])
+
+
+if __name__ == '__main__':
+    unittest.main()
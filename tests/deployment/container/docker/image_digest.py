@@ -0,0 +1,111 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from spotty.deployment.container.docker.image_digest import get_build_context_digest, is_dockerignored, \
+    read_dockerignore
+from spotty.deployment.container.docker.scripts.start_container_script import StartContainerScript
+
+
+class TestImageDigest(unittest.TestCase):
+
+    def setUp(self):
+        self._home_dir = tempfile.TemporaryDirectory()
+        self._home_patcher = mock.patch.dict(os.environ, {'HOME': self._home_dir.name})
+        self._home_patcher.start()
+
+        self._project_dir = tempfile.TemporaryDirectory()
+        os.makedirs(os.path.join(self._project_dir.name, 'docker', 'data'))
+        self._write('docker/Dockerfile', 'FROM ubuntu:20.04\n')
+        self._write('docker/requirements.txt', 'numpy\n')
+        self._write('docker/data/model.bin', 'model')
+        self._write('docker/.dockerignore', 'data\n*.log\n')
+        self._write('train.py', 'print(1)\n')
+
+    def tearDown(self):
+        self._home_patcher.stop()
+        self._home_dir.cleanup()
+        self._project_dir.cleanup()
+
+    def _write(self, rel_path: str, content: str):
+        with open(os.path.join(self._project_dir.name, rel_path), 'w') as f:
+            f.write(content)
+
+    def _get_digest(self, sync_filters=None) -> str:
+        return get_build_context_digest(self._project_dir.name, 'docker/Dockerfile', sync_filters)
+
+    def test_digest(self):
+        digest = self._get_digest()
+        self.assertEqual(self._get_digest(), digest)
+
+        # files outside the context and ignored files don't change the digest
+        self._write('train.py', 'print(2)\n')
+        self._write('docker/data/model.bin', 'model2')
+        self._write('docker/build.log', 'log')
+        self.assertEqual(self._get_digest(), digest)
+
+        # files in the context change the digest
+        self._write('docker/requirements.txt', 'numpy\nscipy\n')
+        new_digest = self._get_digest()
+        self.assertNotEqual(new_digest, digest)
+
+        # the Dockerfile is always a part of the context
+        self._write('docker/Dockerfile', 'FROM ubuntu:22.04\n')
+        self.assertNotEqual(self._get_digest(), new_digest)
+
+    def test_sync_filters(self):
+        sync_filters = [{'exclude': ['docker/weights/*', 'docker/Dockerfile']}]
+        os.makedirs(os.path.join(self._project_dir.name, 'docker', 'weights'))
+        self._write('docker/weights/checkpoint.bin', 'checkpoint-1')
+        digest = self._get_digest(sync_filters)
+
+        # files that are not synced don't change the digest
+        self._write('docker/weights/checkpoint.bin', 'checkpoint-2')
+        self.assertEqual(self._get_digest(sync_filters), digest)
+
+        # the Dockerfile is always a part of the context
+        self._write('docker/Dockerfile', 'FROM ubuntu:22.04\n')
+        self.assertNotEqual(self._get_digest(sync_filters), digest)
+
+    def _get_image_name(self, use_sync_filters: bool) -> str:
+        instance_config = mock.Mock()
+        instance_config.project_config.project_dir = self._project_dir.name
+        instance_config.project_config.sync_filters = [{'exclude': ['docker/weights.txt']}]
+        instance_config.container_config.file = 'docker/Dockerfile'
+        instance_config.container_config.image_registry = None
+        instance_config.container_config.run_as_host_user = False
+        instance_config.full_container_name = 'spotty-project-instance'
+
+        return StartContainerScript(mock.Mock(instance_config=instance_config),
+                                    use_sync_filters=use_sync_filters)._get_image_name()[2]
+
+    def test_file_excluded_from_sync(self):
+        self._write('docker/weights.txt', 'weights-1')
+        synced_image_name = self._get_image_name(use_sync_filters=True)
+        local_image_name = self._get_image_name(use_sync_filters=False)
+
+        self._write('docker/weights.txt', 'weights-2')
+
+        # the file is not synced with the instance, so it's not in the build context there
+        self.assertEqual(self._get_image_name(use_sync_filters=True), synced_image_name)
+
+        # the local provider builds the image from the project directory itself
+        self.assertNotEqual(self._get_image_name(use_sync_filters=False), local_image_name)
+
+    def test_dockerignore(self):
+        patterns = read_dockerignore(os.path.join(self._project_dir.name, 'docker'))
+        self.assertEqual(patterns, [('data', False), ('*.log', False)])
+
+        patterns = [('**/*.log', False), ('keep.log', True), ('tmp', False)]
+        self.assertTrue(is_dockerignored('a/b/c.log', patterns))
+        self.assertTrue(is_dockerignored('c.log', patterns))
+        self.assertFalse(is_dockerignored('keep.log', patterns))
+        self.assertTrue(is_dockerignored('tmp/file.txt', patterns))
+        self.assertFalse(is_dockerignored('src/tmp.txt', patterns))
+
+        # "*" doesn't match the "/" character
+        self.assertFalse(is_dockerignored('logs/c.txt', [('*.txt', False)]))
+
+
+if __name__ == '__main__':
+    unittest.main()
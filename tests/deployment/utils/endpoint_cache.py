@@ -0,0 +1,112 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from spotty.deployment import abstract_ssh_instance_manager
+from spotty.deployment.abstract_ssh_instance_manager import AbstractSshInstanceManager
+from spotty.deployment.utils.endpoint_cache import EndpointCache
+from spotty.errors.host_unreachable import HostUnreachableError
+
+
+class TestEndpointCache(unittest.TestCase):
+
+    def setUp(self):
+        self._home_dir = tempfile.TemporaryDirectory()
+        self._home_patcher = mock.patch.dict(os.environ, {'HOME': self._home_dir.name})
+        self._home_patcher.start()
+
+    def tearDown(self):
+        self._home_patcher.stop()
+        self._home_dir.cleanup()
+
+    def test_cache(self):
+        cache = EndpointCache()
+        self.assertIsNone(cache.get_endpoint('aws:project:instance-1'))
+
+        cache.set_endpoint('aws:project:instance-1', '1.2.3.4', 22, 'ubuntu', 'i-123', 'spotty-project-instance-1')
+        cache.set_endpoint('vast:project:instance-2', '1.2.3.5', 40022, 'root', 123)
+
+        endpoint = cache.get_endpoint('aws:project:instance-1')
+        self.assertEqual((endpoint['host'], endpoint['port'], endpoint['user'], endpoint['instance_id'],
+                          endpoint['container_name']), ('1.2.3.4', 22, 'ubuntu', 'i-123', 'spotty-project-instance-1'))
+        self.assertTrue(os.path.isfile(os.path.join(self._home_dir.name, '.spotty', 'state', 'endpoints.json')))
+
+        # expired endpoints are ignored
+        self.assertIsNone(EndpointCache(ttl=-1).get_endpoint('aws:project:instance-1'))
+
+        cache.delete_endpoint('aws:project:instance-1')
+        self.assertIsNone(cache.get_endpoint('aws:project:instance-1'))
+        self.assertEqual(cache.get_endpoint('vast:project:instance-2')['port'], 40022)
+
+    def _refresh_ssh_endpoint(self, instance_manager, instance):
+        for method_name in ['update_ssh_endpoint', 'delete_ssh_endpoint']:
+            setattr(instance_manager, method_name, getattr(AbstractSshInstanceManager, method_name)
+                    .__get__(instance_manager))
+
+        AbstractSshInstanceManager.refresh_ssh_endpoint(instance_manager, instance)
+
+    def test_refresh_from_status(self):
+        instance = mock.Mock()
+        instance_manager = mock.Mock(_ssh_instance_key='aws:project:instance-1')
+        instance_manager._get_ssh_endpoint.return_value = {'host': '1.2.3.4', 'port': 22, 'user': 'ubuntu'}
+
+        # the endpoint is built from the instance that was already requested
+        self._refresh_ssh_endpoint(instance_manager, instance)
+        instance_manager._get_ssh_endpoint.assert_called_once_with(instance)
+        self.assertEqual(EndpointCache().get_endpoint('aws:project:instance-1')['host'], '1.2.3.4')
+
+        # the running instance doesn't have an IP address yet
+        instance_manager._get_ssh_endpoint.side_effect = ValueError('Instance IP address not found')
+        self._refresh_ssh_endpoint(instance_manager, instance)
+        self.assertIsNone(EndpointCache().get_endpoint('aws:project:instance-1'))
+
+        # the instance doesn't exist
+        EndpointCache().set_endpoint('aws:project:instance-1', '1.2.3.4', 22, 'ubuntu')
+        instance_manager._get_ssh_endpoint.reset_mock()
+        self._refresh_ssh_endpoint(instance_manager, None)
+        self.assertIsNone(EndpointCache().get_endpoint('aws:project:instance-1'))
+        instance_manager._get_ssh_endpoint.assert_not_called()
+
+    def _get_ssh_connection(self, instance_manager):
+        with mock.patch.object(abstract_ssh_instance_manager, 'is_control_master_supported', return_value=True):
+            return AbstractSshInstanceManager.get_ssh_connection(instance_manager)
+
+    def test_cached_connection(self):
+        EndpointCache().set_endpoint('aws:project:instance-1', '1.2.3.4', 22, 'ubuntu')
+
+        instance_manager = mock.Mock(_ssh_instance_key='aws:project:instance-1')
+        instance_manager.get_ssh_control_path.return_value = '/control-path'
+
+        endpoint, control_path = self._get_ssh_connection(instance_manager)
+        self.assertEqual((endpoint['host'], control_path), ('1.2.3.4', '/control-path'))
+        instance_manager.update_ssh_endpoint.assert_not_called()
+
+    def test_refresh_on_connection_failure(self):
+        EndpointCache().set_endpoint('aws:project:instance-1', '1.2.3.4', 22, 'ubuntu')
+
+        new_endpoint = {'host': '1.2.3.5', 'port': 22, 'user': 'ubuntu'}
+        instance_manager = mock.Mock(_ssh_instance_key='aws:project:instance-1')
+        instance_manager.update_ssh_endpoint.return_value = new_endpoint
+        instance_manager.get_ssh_control_path.side_effect = \
+            lambda endpoint: '/control-path' if endpoint['host'] == '1.2.3.5' else None
+
+        endpoint, control_path = self._get_ssh_connection(instance_manager)
+        self.assertEqual((endpoint, control_path), (new_endpoint, '/control-path'))
+        instance_manager.update_ssh_endpoint.assert_called_once_with()
+
+    def test_unreachable_host(self):
+        EndpointCache().set_endpoint('aws:project:instance-1', '1.2.3.4', 22, 'ubuntu')
+
+        instance_manager = mock.Mock(_ssh_instance_key='aws:project:instance-1')
+        instance_manager.update_ssh_endpoint.return_value = {'host': '1.2.3.4', 'port': 22, 'user': 'ubuntu'}
+        instance_manager.get_ssh_control_path.side_effect = HostUnreachableError('1.2.3.4', 22, 'Connection timed out')
+
+        # the endpoint is refreshed once, then the error is raised instead of falling back to a plain SSH connection
+        with self.assertRaises(HostUnreachableError):
+            self._get_ssh_connection(instance_manager)
+
+        instance_manager.update_ssh_endpoint.assert_called_once_with()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import threading
+import time
+import unittest
+from unittest import mock
+from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
+from spotty.deployment.utils.fleet import select_instances, run_on_instances
+
+
+class ListOutputWriter(AbstractOutputWriter):
+
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+
+    def _write(self, msg: str, newline: bool = True):
+        self.lines.append(msg)
+
+
+class TestFleet(unittest.TestCase):
+
+    def test_select_instances(self):
+        instances = [{'name': 'worker-1'}, {'name': 'worker-2'}, {'name': 'main'}]
+
+        self.assertEqual(select_instances(instances, ['main', 'worker-*']), instances)
+        self.assertEqual(select_instances(instances, ['worker-2', 'worker-2']), [{'name': 'worker-2'}])
+        self.assertEqual(select_instances(instances, [], select_all=True), instances)
+
+        with self.assertRaises(ValueError):
+            select_instances(instances, ['worker-3'])
+
+        with self.assertRaises(ValueError):
+            select_instances(instances, ['gpu-*'])
+
+    def test_run_on_instances(self):
+        instance_managers = []
+        for instance_name in ['i1', 'instance-2', 'i3']:
+            instance_manager = mock.Mock()
+            instance_manager.instance_config.name = instance_name
+            instance_managers.append(instance_manager)
+
+        barrier = threading.Barrier(3, timeout=5)
+
+        def func(instance_manager, output):
+            # all the instances are processed at the same time
+            barrier.wait()
+
+            output.write('started... ', newline=False)
+            time.sleep(0.01)
+            output.write('done')
+
+            if instance_manager.instance_config.name == 'i3':
+                raise ValueError('Failed')
+
+            return 2 if instance_manager.instance_config.name == 'i1' else 0
+
+        output = ListOutputWriter()
+        exit_codes = run_on_instances(instance_managers, func, output, max_workers=3)
+
+        self.assertEqual(exit_codes, [2, 0, 1])
+        self.assertEqual(sorted(output.lines), [
+            '[i1]         started... done',
+            '[i3]         Error: Failed',
+            '[i3]         started... done',
+            '[instance-2] started... done',
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+from spotty.commands.writers.null_output_writrer import NullOutputWriter
+from spotty.deployment.utils.jobs import Job, get_running_jobs, resume_interrupted_jobs
+
+
+class TestJobs(unittest.TestCase):
+
+    def setUp(self):
+        self._home_dir = tempfile.TemporaryDirectory()
+        self._home_patcher = mock.patch.dict(os.environ, {'HOME': self._home_dir.name})
+        self._home_patcher.start()
+
+    def tearDown(self):
+        self._home_patcher.stop()
+        self._home_dir.cleanup()
+
+    def test_job_record(self):
+        job = Job.create('stop', 'stopping the instance', None, '/project', 'instance-1')
+        self.assertTrue(job.is_running)
+        self.assertIsNone(job.config_path)
+
+        job.set_pid(os.getpid())
+        self.assertFalse(Job.get(job.job_id).is_interrupted)
+        self.assertEqual([j.job_id for j in get_running_jobs('/project', 'instance-1')], [job.job_id])
+        self.assertEqual(get_running_jobs('/project', 'instance-2'), [])
+
+        job.set_status(Job.STATUS_FAILED, error='Error')
+        job = Job.get(job.job_id)
+        self.assertEqual(job.status, Job.STATUS_FAILED)
+        self.assertEqual(job.error, 'Error')
+        self.assertEqual(get_running_jobs('/project', 'instance-1'), [])
+
+        job.delete()
+        self.assertIsNone(Job.get(job.job_id))
+        self.assertEqual(Job.get_all(), [])
+
+    def test_set_pid_keeps_worker_updates(self):
+        job = Job.create('stop', 'stopping the instance', None, '/project', 'instance-1')
+
+        # the worker finished the job before the parent process saved its PID
+        Job.get(job.job_id).set_status(Job.STATUS_DONE)
+        job.set_pid(12345)
+
+        job = Job.get(job.job_id)
+        self.assertEqual(job.status, Job.STATUS_DONE)
+        self.assertEqual(job.pid, 12345)
+
+    def test_starting_job(self):
+        job = Job.create('stop', 'stopping the instance', None, '/project', 'instance-1')
+
+        # the worker is being started, so the job is not resumed by another command
+        self.assertTrue(Job.get(job.job_id).is_starting)
+        self.assertFalse(Job.get(job.job_id).is_interrupted)
+        with mock.patch.object(Job, 'start_worker') as start_worker:
+            self.assertEqual(resume_interrupted_jobs(NullOutputWriter()), [])
+
+        start_worker.assert_not_called()
+
+        # the worker wasn't started within the grace period
+        with mock.patch('spotty.deployment.utils.jobs.time.time', return_value=job.updated_at + 60):
+            self.assertFalse(Job.get(job.job_id).is_starting)
+            self.assertTrue(Job.get(job.job_id).is_interrupted)
+
+    @unittest.skipIf(os.name == 'nt', 'Processes are not checked on Windows')
+    def test_resume_interrupted_jobs(self):
+        process = subprocess.Popen([sys.executable, '-c', 'pass'])
+        process.wait()
+
+        job = Job.create('stop', 'stopping the instance', None, '/project', 'instance-1')
+        job.set_pid(process.pid)
+        self.assertTrue(Job.get(job.job_id).is_interrupted)
+
+        with mock.patch.object(Job, 'start_worker') as start_worker:
+            jobs = resume_interrupted_jobs(NullOutputWriter())
+
+        self.assertEqual([j.job_id for j in jobs], [job.job_id])
+        start_worker.assert_called_once_with()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import subprocess
+import tempfile
+import unittest
+from unittest import mock
+from spotty.deployment.utils.commands import get_ssh_command
+from spotty.deployment.utils.ssh_master import get_control_path, close_masters, start_master
+from spotty.errors.host_unreachable import HostUnreachableError
+
+
+class TestSshMaster(unittest.TestCase):
+
+    def setUp(self):
+        self._home_dir = tempfile.TemporaryDirectory()
+        self._home_patcher = mock.patch.dict(os.environ, {'HOME': self._home_dir.name})
+        self._home_patcher.start()
+
+    def tearDown(self):
+        self._home_patcher.stop()
+        self._home_dir.cleanup()
+
+    def test_control_path(self):
+        control_path = get_control_path('aws:project:instance-1', 'ubuntu', '1.2.3.4', 22)
+        self.assertTrue(control_path.startswith(os.path.join(self._home_dir.name, '.spotty', 'ssh')))
+
+        # a new socket for a new IP address of the same instance
+        new_control_path = get_control_path('aws:project:instance-1', 'ubuntu', '1.2.3.5', 22)
+        self.assertNotEqual(control_path, new_control_path)
+        self.assertEqual(os.path.basename(control_path)[:12], os.path.basename(new_control_path)[:12])
+
+        ssh_command = get_ssh_command('1.2.3.4', 22, 'ubuntu', '/key', 'echo', control_path=control_path)
+        self.assertIn('-o ControlPath=' + control_path, ssh_command)
+
+    def test_close_stale_sockets(self):
+        control_path = get_control_path('aws:project:instance-1', 'ubuntu', '1.2.3.4', 22)
+        open(control_path, 'w').close()
+
+        self.assertEqual(close_masters('aws:project:instance-1'), 0)
+        self.assertFalse(os.path.exists(control_path))
+
+    def _start_master(self, exit_code: int, stderr: bytes) -> bool:
+        control_path = get_control_path('aws:project:instance-1', 'ubuntu', '1.2.3.4', 22)
+        res = subprocess.CompletedProcess([], exit_code, stderr=stderr)
+        with mock.patch('spotty.deployment.utils.ssh_master.subprocess.run', return_value=res):
+            return start_master(control_path, 'ubuntu', '1.2.3.4', 22, '/key')
+
+    def test_start_master(self):
+        self.assertTrue(self._start_master(0, b''))
+
+        # the connection can still work without the master
+        self.assertFalse(self._start_master(255, b'ControlPath too long'))
+
+        # a plain SSH connection would wait for the same timeout
+        with self.assertRaises(HostUnreachableError):
+            self._start_master(255, b'ssh: connect to host 1.2.3.4 port 22: Connection timed out')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import threading
+import unittest
+from spotty.deployment.utils.task_graph import run_task_graph, graph_task
+
+
+class TestTaskGraph(unittest.TestCase):
+
+    def test_dependencies(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        res = run_task_graph([
+            # independent tasks run concurrently, otherwise the barrier would time out
+            graph_task('a', lambda _: (barrier.wait(), 1)[1]),
+            graph_task('b', lambda _: (barrier.wait(), 2)[1]),
+            graph_task('sum', lambda res: res['a'] + res['b'], ['a', 'b']),
+            graph_task('double', lambda res: res['sum'] * 2, ['sum']),
+        ])
+
+        self.assertEqual(res, {'a': 1, 'b': 2, 'sum': 3, 'double': 6})
+
+    def test_error(self):
+        started = []
+
+        def fail(_):
+            raise ValueError('Failed')
+
+        with self.assertRaisesRegex(ValueError, 'Failed'):
+            run_task_graph([
+                graph_task('fail', fail),
+                graph_task('dependent', lambda _: started.append('dependent'), ['fail']),
+            ])
+
+        self.assertEqual(started, [])
+
+    def test_unknown_dependency(self):
+        with self.assertRaises(ValueError):
+            run_task_graph([graph_task('a', lambda _: None, ['b'])])
+
+
+if __name__ == '__main__':
+    unittest.main()
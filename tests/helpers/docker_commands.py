@@ -0,0 +1,15 @@
+from unittest import mock
+
+
+def get_docker_commands_mock(image: str = 'ubuntu', container_name: str = 'spotty') -> mock.Mock:
+    """Returns Docker commands for a container that runs an image from a registry
+    and doesn't have startup commands."""
+    commands = mock.Mock()
+    commands.instance_config.dockerfile_path = None
+    commands.instance_config.container_config.commands = None
+    commands.is_created.return_value = 'docker container inspect %s' % container_name
+    commands.remove.return_value = 'docker rm -f %s' % container_name
+    commands.pull.return_value = 'docker pull %s' % image
+    commands.run.return_value = 'docker run -d --name %s %s' % (container_name, image)
+
+    return commands
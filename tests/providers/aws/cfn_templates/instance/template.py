@@ -0,0 +1,124 @@
+import os
+import unittest
+import yaml
+from cfn_tools import CfnYamlLoader
+from spotty.deployment.abstract_cloud_instance.file_structure import BOOTSTRAP_STEPS_SCRIPT_PATH
+from spotty.providers.aws.cfn_templates.instance.start_container_script import StartContainerScriptWithCfnSignals
+from spotty.providers.aws.cfn_templates.instance.template import can_update_instance_stack, \
+    get_updated_instance_template, _read_template_file
+from tests.helpers.docker_commands import get_docker_commands_mock
+
+
+TEMPLATE = '''
+Resources:
+  InstanceLaunchTemplate:
+    Type: AWS::EC2::LaunchTemplate
+    Metadata:
+      AWS::CloudFormation::Init:
+        mount_volumes:
+          commands:
+            mount: {command: %(mount_cmd)s}
+        start_container:
+          commands:
+            start: {command: %(start_cmd)s}
+    Properties:
+      LaunchTemplateData:
+        InstanceType: !Ref InstanceType
+        %(placement)s
+  InstanceSecurityGroup:
+    Type: AWS::EC2::SecurityGroup
+    Properties:
+      SecurityGroupIngress:
+        - {FromPort: %(port)d, ToPort: %(port)d}
+  %(volumes)s
+'''
+
+VOLUMES = '''Volume1:
+    Type: AWS::EC2::Volume
+  VolumeAttachment1:
+    Type: AWS::EC2::VolumeAttachment
+    Properties:
+      VolumeId: !Ref Volume1'''
+
+
+def get_template(mount_cmd='mount-1', start_cmd='start-1', port=22, placement=True, volumes=True):
+    return TEMPLATE % {
+        'mount_cmd': mount_cmd,
+        'start_cmd': start_cmd,
+        'port': port,
+        'placement': 'Placement: {AvailabilityZone: us-east-1a}' if placement else '',
+        'volumes': VOLUMES if volumes else '',
+    }
+
+
+class TestInstanceTemplate(unittest.TestCase):
+
+    def test_can_update_instance_stack(self):
+        live_template = get_template()
+        live_parameters = {'InstanceType': 'p2.xlarge'}
+
+        # the same template rendered without volumes and with a different placement
+        self.assertTrue(can_update_instance_stack(live_template, live_parameters,
+                                                  get_template(placement=False, volumes=False),
+                                                  {'InstanceType': 'p2.xlarge'}))
+
+        # changed container configuration and ports
+        self.assertTrue(can_update_instance_stack(live_template, live_parameters,
+                                                  get_template(start_cmd='start-2', port=8888, volumes=False),
+                                                  live_parameters))
+
+        # changed instance startup scripts
+        self.assertFalse(can_update_instance_stack(live_template, live_parameters,
+                                                   get_template(mount_cmd='mount-2', volumes=False),
+                                                   live_parameters))
+
+        # changed parameters
+        self.assertFalse(can_update_instance_stack(live_template, live_parameters, get_template(volumes=False),
+                                                   {'InstanceType': 'p3.2xlarge'}))
+
+    def test_get_updated_instance_template(self):
+        updated_template = get_updated_instance_template(get_template(),
+                                                         get_template(start_cmd='start-2', port=8888, volumes=False))
+        updated_template = yaml.load(updated_template, Loader=CfnYamlLoader)
+        resources = updated_template['Resources']
+        cfn_init = resources['InstanceLaunchTemplate']['Metadata']['AWS::CloudFormation::Init']
+
+        # volumes are kept, the container configuration and the ports are updated
+        self.assertIn('Volume1', resources)
+        self.assertIn('VolumeAttachment1', resources)
+        self.assertEqual(cfn_init['start_container']['commands']['start']['command'], 'start-2')
+        self.assertEqual(resources['InstanceSecurityGroup']['Properties']['SecurityGroupIngress'][0]['FromPort'], 8888)
+
+    def test_startup_scripts(self):
+        pull_image_script = _read_template_file(os.path.join('startup_scripts', '04_pull_image.sh'), {
+            'BOOTSTRAP_STEPS_SCRIPT_PATH': BOOTSTRAP_STEPS_SCRIPT_PATH,
+            'PULL_IMAGE_CMD': 'docker pull ubuntu',
+        })
+        sync_project_script = _read_template_file(os.path.join('startup_scripts', '05_sync_project.sh'), {
+            'BOOTSTRAP_STEPS_SCRIPT_PATH': BOOTSTRAP_STEPS_SCRIPT_PATH,
+            'SYNC_PROJECT_CMD': 'aws s3 sync s3://bucket/project /project',
+        })
+
+        for script in [pull_image_script, sync_project_script]:
+            self.assertNotIn('{{', script)
+            self.assertIn('source %s\n' % BOOTSTRAP_STEPS_SCRIPT_PATH, script)
+
+        self.assertIn("start_step pull_image 'docker pull ubuntu'", pull_image_script)
+
+        # the project is synced once AWS CLI is installed
+        self.assertLess(sync_project_script.index('wait_step install_packages'),
+                        sync_project_script.index('aws s3 sync s3://bucket/project /project'))
+
+    def test_start_container_script(self):
+        script = StartContainerScriptWithCfnSignals(get_docker_commands_mock()).render()
+
+        # CloudFormation variables in the signals are substituted by the "Fn::Sub" function
+        self.assertIn('--stack ${AWS::StackName}', script)
+        self.assertNotIn('${!AWS::', script)
+
+        # the cfn-init step waits for the background pull first
+        self.assertLess(script.index('wait_step pull_image'), script.index('BuildingDockerImageSignal'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -27,6 +27,7 @@ class TestBucketResource(unittest.TestCase):
             'rootVolumeSize': 0,
             'spotInstance': False,
             'subnetId': '',
+            'syncMode': 'bucket',
             'volumes': [],
         }
 
@@ -0,0 +1,71 @@
+import unittest
+import boto3
+from spotty.commands.writers.abstract_output_writrer import AbstractOutputWriter
+from spotty.providers.aws.config.ebs_volume import EbsVolume
+from spotty.providers.aws.deletion_policies import apply_deletion_policies
+
+try:
+    from moto import mock_aws as mock_ec2
+except ImportError:
+    from moto import mock_ec2
+
+
+class ListOutputWriter(AbstractOutputWriter):
+
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+
+    def _write(self, msg: str, newline: bool = True):
+        self.lines.append(msg)
+
+
+class TestDeletionPolicies(unittest.TestCase):
+
+    @staticmethod
+    def _create_volume(ec2, volume_name: str):
+        ec2.create_volume(AvailabilityZone='us-east-1a', Size=1, TagSpecifications=[{
+            'ResourceType': 'volume',
+            'Tags': [{'Key': 'Name', 'Value': volume_name}],
+        }])
+
+    @staticmethod
+    def _get_volume_names(ec2) -> list:
+        return sorted(tag['Value'] for volume in ec2.describe_volumes()['Volumes']
+                      for tag in volume['Tags'] if tag['Key'] == 'Name')
+
+    @mock_ec2
+    def test_duplicated_names(self):
+        ec2 = boto3.client('ec2', region_name='us-east-1')
+        self._create_volume(ec2, 'duplicated')
+        self._create_volume(ec2, 'duplicated')
+        self._create_volume(ec2, 'volume-2')
+        self._create_volume(ec2, 'volume-3')
+
+        # two snapshots with the same name for the third volume
+        volume_id = ec2.describe_volumes()['Volumes'][0]['VolumeId']
+        for _ in range(2):
+            ec2.create_snapshot(VolumeId=volume_id, TagSpecifications=[{
+                'ResourceType': 'snapshot',
+                'Tags': [{'Key': 'Name', 'Value': 'volume-3'}],
+            }])
+
+        volumes = [EbsVolume({'name': name, 'parameters': {'volumeName': name, 'deletionPolicy': policy}},
+                             'project', 'instance')
+                   for name, policy in [('duplicated', EbsVolume.DP_DELETE), ('volume-2', EbsVolume.DP_DELETE),
+                                        ('volume-3', EbsVolume.DP_UPDATE_SNAPSHOT)]]
+
+        output = ListOutputWriter()
+        apply_deletion_policies(ec2, volumes, output)
+
+        # only the volumes with duplicated names are skipped
+        self.assertEqual(self._get_volume_names(ec2), ['duplicated', 'duplicated', 'volume-3'])
+        self.assertIn('- volume "duplicated" not found. Error: Several volumes with Name=duplicated found.',
+                      output.lines)
+        self.assertIn('- volume "volume-2" was deleted', output.lines)
+        self.assertIn('- snapshot for the volume "volume-3" was not created. '
+                      'Error: Several snapshots with Name=volume-3 found.', output.lines)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+from unittest import mock
+import boto3
+from spotty.commands.writers.null_output_writrer import NullOutputWriter
+from spotty.providers.aws.helpers.bake_ami import bake_ami, _get_user_data, BAKED_AMI_VERSION, \
+    BAKED_AMI_VERSION_FILE
+from spotty.providers.aws.resources.image import Image
+
+try:
+    from moto import mock_aws as mock_ec2
+except ImportError:
+    from moto import mock_ec2
+
+
+class TestBakeAmi(unittest.TestCase):
+
+    @mock_ec2
+    def test_bake_ami(self):
+        ec2 = boto3.client('ec2', region_name='us-east-1')
+        base_image = Image(ec2, ec2.describe_images()['Images'][0])
+
+        # the builder instance stops itself once the tools are installed
+        get_waiter = ec2.get_waiter
+
+        def get_waiter_mock(waiter_name):
+            if waiter_name == 'instance_stopped':
+                waiter = mock.Mock()
+                waiter.wait.side_effect = lambda InstanceIds, **kwargs: ec2.stop_instances(InstanceIds=InstanceIds)
+                return waiter
+
+            return get_waiter(waiter_name)
+
+        with mock.patch.object(ec2, 'get_waiter', side_effect=get_waiter_mock):
+            ami_id = bake_ami(ec2, base_image, 'SpottyAMI', 'm5.large', ['ubuntu:20.04'], None, NullOutputWriter())
+
+        image = Image.get_by_name(ec2, 'SpottyAMI')
+        self.assertEqual(image.image_id, ami_id)
+        self.assertEqual(image.get_tag_value('spotty:ami-version'), BAKED_AMI_VERSION)
+
+        # the builder instance is terminated
+        instances = ec2.describe_instances()['Reservations'][0]['Instances']
+        self.assertEqual(instances[0]['State']['Name'], 'terminated')
+
+    def test_user_data(self):
+        user_data = _get_user_data(['ubuntu:20.04', 'python:3.8'])
+        self.assertIn('docker pull ubuntu:20.04\ndocker pull python:3.8\n', user_data)
+        self.assertIn("echo '%s' > '%s'" % (BAKED_AMI_VERSION, BAKED_AMI_VERSION_FILE), user_data)
+
+
+if __name__ == '__main__':
+    unittest.main()
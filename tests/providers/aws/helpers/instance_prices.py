@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+from spotty.providers.aws.helpers import instance_prices
+from spotty.providers.aws.helpers.instance_prices import get_spot_prices, get_spot_prices_for_regions
+
+
+class FakeEc2(object):
+
+    def __init__(self, region: str):
+        self.meta = SimpleNamespace(region_name=region)
+        self.calls = 0
+
+    def get_paginator(self, operation_name: str):
+        assert operation_name == 'describe_spot_price_history'
+        return self
+
+    def paginate(self, InstanceTypes, **kwargs):
+        self.calls += 1
+
+        # each instance type is returned on a separate page
+        return [{'SpotPriceHistory': [
+            {'InstanceType': instance_type, 'AvailabilityZone': self.meta.region_name + 'a', 'SpotPrice': '0.5'},
+            {'InstanceType': instance_type, 'AvailabilityZone': self.meta.region_name + 'b', 'SpotPrice': '0.7'},
+        ]} for instance_type in InstanceTypes]
+
+
+class TestInstancePrices(unittest.TestCase):
+
+    def setUp(self):
+        self._home_dir = tempfile.TemporaryDirectory()
+        self._home_patcher = mock.patch.dict(os.environ, {'HOME': self._home_dir.name})
+        self._home_patcher.start()
+
+    def tearDown(self):
+        self._home_patcher.stop()
+        self._home_dir.cleanup()
+
+    def test_get_spot_prices(self):
+        ec2 = FakeEc2('us-east-1')
+
+        prices = get_spot_prices(ec2, 'p2.xlarge')
+        self.assertEqual(prices, {'us-east-1a': 0.5, 'us-east-1b': 0.7})
+
+        # the second call uses the cache
+        self.assertEqual(get_spot_prices(ec2, 'p2.xlarge'), prices)
+        self.assertEqual(ec2.calls, 1)
+
+        get_spot_prices(ec2, 'p2.xlarge', use_cache=False)
+        self.assertEqual(ec2.calls, 2)
+
+    def test_get_spot_prices_for_regions(self):
+        clients = {region: FakeEc2(region) for region in ['us-east-1', 'eu-west-1']}
+        get_spot_prices(clients['us-east-1'], 'p2.xlarge')
+
+        with mock.patch.object(instance_prices, '_get_ec2_client', side_effect=lambda region: clients[region]):
+            prices = get_spot_prices_for_regions(['us-east-1', 'eu-west-1'], ['p2.xlarge', 'p3.2xlarge'])
+
+        self.assertEqual(set(prices), {('us-east-1', 'p2.xlarge'), ('us-east-1', 'p3.2xlarge'),
+                                       ('eu-west-1', 'p2.xlarge'), ('eu-west-1', 'p3.2xlarge')})
+        self.assertEqual(prices[('eu-west-1', 'p3.2xlarge')], {'eu-west-1a': 0.5, 'eu-west-1b': 0.7})
+
+        # one request per region, the cached prices are not requested again
+        self.assertEqual(clients['us-east-1'].calls, 2)
+        self.assertEqual(clients['eu-west-1'].calls, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import boto3
+from spotty.providers.aws.helpers.instance_status import get_instances_status_info
+from spotty.providers.aws.resources.instance import Instance
+
+try:
+    from moto import mock_aws as mock_ec2
+except ImportError:
+    from moto import mock_ec2
+
+
+class TestInstanceStatus(unittest.TestCase):
+
+    def setUp(self):
+        self._home_dir = tempfile.TemporaryDirectory()
+        self._home_patcher = mock.patch.dict(os.environ, {'HOME': self._home_dir.name})
+        self._home_patcher.start()
+
+    def tearDown(self):
+        self._home_patcher.stop()
+        self._home_dir.cleanup()
+
+    @staticmethod
+    def _get_instance_config(name: str, region: str):
+        instance_config = mock.Mock(region=region)
+        instance_config.name = name
+        instance_config.project_config.project_name = 'Project'
+        return instance_config
+
+    @staticmethod
+    def _run_instance(region: str, stack_name: str):
+        ec2 = boto3.client('ec2', region_name=region)
+        ec2.run_instances(ImageId=ec2.describe_images()['Images'][0]['ImageId'], InstanceType='m5.large',
+                          MinCount=1, MaxCount=1, TagSpecifications=[{
+                              'ResourceType': 'instance',
+                              'Tags': [{'Key': 'aws:cloudformation:stack-name', 'Value': stack_name}],
+                          }])
+
+    @mock_ec2
+    def test_get_instances_status_info(self):
+        self._run_instance('us-east-1', 'spotty-instance-project-i1')
+        self._run_instance('eu-west-1', 'spotty-instance-project-i3')
+        self._run_instance('eu-west-1', 'spotty-instance-other-i3')
+
+        instance_configs = [
+            self._get_instance_config('i1', 'us-east-1'),
+            self._get_instance_config('i2', 'us-east-1'),
+            self._get_instance_config('i3', 'eu-west-1'),
+        ]
+
+        with mock.patch('spotty.providers.aws.resources.instance.get_on_demand_price', return_value=0.096) \
+                as get_on_demand_price, \
+                mock.patch.object(Instance, 'get_by_stack_names', wraps=Instance.get_by_stack_names) \
+                as get_by_stack_names:
+            status_infos = get_instances_status_info(instance_configs)
+
+        # a single call per region
+        self.assertEqual(get_by_stack_names.call_count, 2)
+
+        self.assertEqual([info['state'] for info in status_infos], ['running', 'not running', 'running'])
+        self.assertEqual(status_infos[0]['instance_type'], 'm5.large')
+        self.assertEqual(status_infos[0]['purchasing_option'], 'on-demand')
+        self.assertEqual(status_infos[0]['price'], 0.096)
+
+        # the Pricing API client is created in the main thread and shared with the workers
+        self.assertEqual(get_on_demand_price.call_args_list[0][1]['pricing'].meta.service_model.service_name,
+                         'pricing')
+        self.assertTrue(status_infos[2]['location'].startswith('eu-west-1'))
+
+
+if __name__ == '__main__':
+    unittest.main()
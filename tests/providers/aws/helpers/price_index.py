@@ -0,0 +1,58 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+from spotty.providers.aws.helpers.price_index import OnDemandPriceIndex, parse_price_list
+
+
+def get_price_item(instance_type: str, os_name: str, price: str):
+    return json.dumps({
+        'product': {'attributes': {'instanceType': instance_type, 'operatingSystem': os_name}},
+        'terms': {'OnDemand': {'TERM1': {'priceDimensions': {'DIM1': {'pricePerUnit': {'USD': price}}}}}},
+    })
+
+
+class TestPriceIndex(unittest.TestCase):
+
+    def setUp(self):
+        self._home_dir = tempfile.TemporaryDirectory()
+        self._home_patcher = mock.patch.dict(os.environ, {'HOME': self._home_dir.name})
+        self._home_patcher.start()
+
+    def tearDown(self):
+        self._home_patcher.stop()
+        self._home_dir.cleanup()
+
+    def test_parse_price_list(self):
+        prices = parse_price_list([
+            get_price_item('p2.xlarge', 'Linux', '0.9000000000'),
+            get_price_item('p2.xlarge', 'Windows', '1.0800000000'),
+            get_price_item('p3.2xlarge', 'Linux', '0.0000000000'),
+        ])
+
+        self.assertEqual(prices, {('p2.xlarge', 'Linux'): 0.9, ('p2.xlarge', 'Windows'): 1.08})
+
+    def test_get_price(self):
+        price_index = OnDemandPriceIndex()
+        self.assertIsNone(price_index.get_price('us-east-1', 'p2.xlarge'))
+
+        price_index.update_region('us-east-1', {('p2.xlarge', 'Linux'): 0.9, ('p2.xlarge', 'Windows'): 1.08})
+        self.assertEqual(price_index.get_price('us-east-1', 'p2.xlarge'), 0.9)
+        self.assertEqual(price_index.get_price('us-east-1', 'p2.xlarge', 'Windows'), 1.08)
+        self.assertIsNone(price_index.get_price('us-east-1', 'p3.2xlarge'))
+        self.assertIsNone(price_index.get_price('eu-west-1', 'p2.xlarge'))
+
+        # the prices of the region are replaced
+        price_index.update_region('us-east-1', {('p2.xlarge', 'Linux'): 0.95})
+        self.assertEqual(price_index.get_price('us-east-1', 'p2.xlarge'), 0.95)
+        self.assertIsNone(price_index.get_price('us-east-1', 'p2.xlarge', 'Windows'))
+
+        # expired index
+        with mock.patch('time.time', return_value=time.time() + 8 * 24 * 3600):
+            self.assertIsNone(price_index.get_price('us-east-1', 'p2.xlarge'))
+
+
+if __name__ == '__main__':
+    unittest.main()
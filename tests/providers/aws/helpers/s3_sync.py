@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+import boto3
+from spotty.commands.writers.null_output_writrer import NullOutputWriter
+from spotty.providers.aws.helpers.s3_sync import sync_local_to_s3, sync_s3_to_local, list_s3_objects, \
+    upload_files_to_s3
+try:
+    from moto import mock_aws as mock_s3
+except ImportError:
+    from moto import mock_s3
+
+
+class TestS3Sync(unittest.TestCase):
+
+    @staticmethod
+    def _create_files(root_dir: str, paths: list):
+        for path in paths:
+            file_path = os.path.join(root_dir, path)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(file_path, 'w') as f:
+                f.write(path)
+
+    @mock_s3
+    def test_upload_and_download(self):
+        s3 = boto3.client('s3', region_name='us-east-1')
+        s3.create_bucket(Bucket='test-bucket')
+        output = NullOutputWriter()
+
+        filters = [
+            {'exclude': ['ignored-dir/*', 'ignored-file']},
+            {'include': ['ignored-dir/included-file']},
+        ]
+
+        with tempfile.TemporaryDirectory() as local_dir:
+            self._create_files(local_dir, ['local-file', 'dir/file', 'ignored-file', 'ignored-dir/ignored-file',
+                                           'ignored-dir/included-file'])
+
+            # upload files
+            sync_local_to_s3(s3, local_dir, 's3://test-bucket/project', output, filters=filters, delete=True)
+            self.assertEqual(set(list_s3_objects(s3, 'test-bucket', 'project/')),
+                             {'local-file', 'dir/file', 'ignored-dir/included-file'})
+
+            # delete a file
+            os.unlink(os.path.join(local_dir, 'dir', 'file'))
+            sync_local_to_s3(s3, local_dir, 's3://test-bucket/project', output, filters=filters, delete=True)
+            self.assertEqual(set(list_s3_objects(s3, 'test-bucket', 'project/')),
+                             {'local-file', 'ignored-dir/included-file'})
+
+            # upload and delete only the specified files
+            self._create_files(local_dir, ['new-file'])
+            upload_files_to_s3(s3, local_dir, 's3://test-bucket/project', ['new-file'], output,
+                               delete_paths=['local-file'])
+            self.assertEqual(set(list_s3_objects(s3, 'test-bucket', 'project/')),
+                             {'new-file', 'ignored-dir/included-file'})
+
+        # download files
+        with tempfile.TemporaryDirectory() as local_dir:
+            sync_s3_to_local(s3, 's3://test-bucket/project', local_dir, output,
+                             filters=[{'exclude': ['*']}, {'include': ['ignored-dir/*']}], exact_timestamp=True)
+
+            with open(os.path.join(local_dir, 'ignored-dir', 'included-file')) as f:
+                self.assertEqual(f.read(), 'ignored-dir/included-file')
+
+            self.assertFalse(os.path.exists(os.path.join(local_dir, 'local-file')))
+
+
+if __name__ == '__main__':
+    unittest.main()
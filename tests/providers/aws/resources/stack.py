@@ -0,0 +1,106 @@
+import unittest
+from unittest import mock
+from spotty.commands.writers.null_output_writrer import NullOutputWriter
+from spotty.providers.aws.resources.stack import Stack, StackEvents, Task
+
+STACK_ID = 'arn:aws:cloudformation:us-east-1:123456789012:stack/test-stack/uuid'
+
+
+class FakeCloudFormation(object):
+    """Returns one more event on each "describe_stack_events" call."""
+
+    def __init__(self, events: list):
+        self._events = [{
+            'EventId': str(i),
+            'StackName': 'test-stack',
+            'LogicalResourceId': resource_id,
+            'ResourceType': 'AWS::CloudFormation::Stack' if resource_id == 'test-stack' else 'AWS::EC2::Instance',
+            'ResourceStatus': status,
+        } for i, (resource_id, status) in enumerate(events)]
+        self.num_calls = 0
+
+    def get_paginator(self, operation_name: str):
+        assert operation_name == 'describe_stack_events'
+        paginator = mock.Mock()
+        paginator.paginate = self._paginate
+        return paginator
+
+    def _paginate(self, StackName: str):
+        self.num_calls += 1
+        # events are returned in the reverse chronological order, 2 events per page
+        events = self._events[:self.num_calls][::-1]
+        for i in range(0, len(events), 2):
+            yield {'StackEvents': events[i:i + 2]}
+
+    def describe_stack_events(self, StackName: str):
+        return next(self._paginate(StackName))
+
+    def describe_stacks(self, StackName: str):
+        return {'Stacks': [{'StackId': STACK_ID, 'StackName': 'test-stack',
+                            'StackStatus': self._events[-1]['ResourceStatus']}]}
+
+
+class TestStack(unittest.TestCase):
+
+    @mock.patch('spotty.deployment.utils.polling.sleep')
+    def test_wait_tasks(self, _):
+        cf = FakeCloudFormation([
+            ('test-stack', 'CREATE_IN_PROGRESS'),
+            ('Instance', 'CREATE_IN_PROGRESS'),
+            ('Instance', 'CREATE_COMPLETE'),
+            ('Signal', 'CREATE_COMPLETE'),
+            ('test-stack', 'CREATE_COMPLETE'),
+        ])
+        stack = Stack(cf, {'StackId': STACK_ID})
+
+        tasks = [
+            Task(message='launching the instance', start_resource=None, finish_resource='Instance', enabled=True),
+            Task(message='preparing the instance', start_resource='Instance', finish_resource='Signal', enabled=True),
+        ]
+
+        stack.wait_tasks(tasks, resource_success_status='CREATE_COMPLETE', output=NullOutputWriter())
+        self.assertEqual(cf.num_calls, 4)
+
+        stack = stack.wait_status_changed(stack_waiting_status='CREATE_IN_PROGRESS', output=NullOutputWriter())
+        self.assertEqual(stack.status, 'CREATE_COMPLETE')
+        self.assertEqual(cf.num_calls, 5)
+
+    @mock.patch('spotty.deployment.utils.polling.sleep')
+    def test_failed_resource(self, _):
+        cf = FakeCloudFormation([
+            ('test-stack', 'DELETE_IN_PROGRESS'),
+            ('Instance', 'DELETE_FAILED'),
+            ('test-stack', 'DELETE_FAILED'),
+        ])
+        stack = Stack(cf, {'StackId': STACK_ID})
+
+        with self.assertRaisesRegex(ValueError, 'Instance DELETE_FAILED'):
+            stack.wait_stack_deleted()
+
+        self.assertEqual(cf.num_calls, 2)
+
+    @mock.patch('spotty.deployment.utils.polling.sleep')
+    def test_skip_existing_events(self, _):
+        cf = FakeCloudFormation([
+            ('test-stack', 'CREATE_IN_PROGRESS'),
+            ('Instance', 'CREATE_FAILED'),
+            ('test-stack', 'ROLLBACK_COMPLETE'),
+            ('test-stack', 'DELETE_IN_PROGRESS'),
+            ('Instance', 'DELETE_COMPLETE'),
+            ('test-stack', 'DELETE_COMPLETE'),
+        ])
+
+        # the previous operation produced 3 events on several pages
+        cf.num_calls = 2
+        stack = Stack(cf, {'StackId': STACK_ID})
+        stack._events = StackEvents(cf, STACK_ID, skip_existing=True)
+        self.assertEqual(cf.num_calls, 3)
+
+        # the failed event of the previous operation is ignored
+        stack.wait_stack_deleted()
+        self.assertEqual(stack.events.stack_status, 'DELETE_COMPLETE')
+        self.assertEqual(cf.num_calls, 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
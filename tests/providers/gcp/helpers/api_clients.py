@@ -0,0 +1,70 @@
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+import google.auth.credentials
+from spotty.providers.gcp.helpers import api_clients, gcp_credentials
+
+
+class TestApiClients(unittest.TestCase):
+
+    def setUp(self):
+        gcp_credentials._get_default_credentials.cache_clear()
+        self._patchers = [
+            mock.patch.object(api_clients, '_thread_data', threading.local()),
+            mock.patch.object(gcp_credentials, '_thread_data', threading.local()),
+        ]
+        for patcher in self._patchers:
+            patcher.start()
+
+        credentials = mock.Mock(spec=google.auth.credentials.Credentials)
+        self._default_patcher = mock.patch.object(gcp_credentials, 'default', return_value=(credentials, 'project-id'))
+        self._default = self._default_patcher.start()
+        self._request_patcher = mock.patch('httplib2.Http.request', side_effect=AssertionError('Unexpected request'))
+        self._request_patcher.start()
+
+    def tearDown(self):
+        self._request_patcher.stop()
+        self._default_patcher.stop()
+        for patcher in self._patchers:
+            patcher.stop()
+
+        gcp_credentials._get_default_credentials.cache_clear()
+
+    def test_get_service(self):
+        compute = api_clients.get_service('compute', 'v1')
+        dm = api_clients.get_service('deploymentmanager', 'v2')
+
+        # services are built once per thread and share the credentials
+        self.assertIs(api_clients.get_service('compute', 'v1'), compute)
+        self.assertIs(compute._http, dm._http)
+        self.assertEqual(self._default.call_count, 1)
+
+    def test_get_service_from_threads(self):
+        barrier = threading.Barrier(4)
+
+        def get_services():
+            # all the threads get their services at the same time
+            barrier.wait()
+            compute = api_clients.get_service('compute', 'v1')
+            self.assertIs(api_clients.get_service('compute', 'v1'), compute)
+
+            return compute, api_clients.get_service('runtimeconfig', 'v1beta1')
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            services = list(executor.map(lambda _: get_services(), range(4)))
+
+        # each thread has its own services and HTTP transport
+        self.assertEqual(len(set(id(compute) for compute, _ in services)), 4)
+        self.assertEqual(len(set(id(compute._http) for compute, _ in services)), 4)
+        self.assertEqual(len(set(id(compute._http.http) for compute, _ in services)), 4)
+        for compute, rtc in services:
+            self.assertIs(compute._http, rtc._http)
+
+        # the credentials are shared
+        self.assertEqual(self._default.call_count, 1)
+        self.assertEqual(len(set(id(compute._http.credentials) for compute, _ in services)), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+from collections import OrderedDict
+from unittest import mock
+from spotty.commands.writers.null_output_writrer import NullOutputWriter
+from spotty.deployment.utils import polling
+from spotty.providers.gcp.helpers.deployment import wait_resources
+
+
+class TestWaitResources(unittest.TestCase):
+
+    _RESOURCE_MESSAGES = OrderedDict([
+        ('instance', 'launching the instance'),
+        ('docker-waiter', 'running the Docker container'),
+    ])
+
+    def setUp(self):
+        self._sleep_patcher = mock.patch.object(polling, 'sleep')
+        self._sleep = self._sleep_patcher.start()
+
+    def tearDown(self):
+        self._sleep_patcher.stop()
+
+    def _wait_resources(self, dm, ce):
+        wait_resources(dm, ce, 'deployment', self._RESOURCE_MESSAGES, instance_resource_name='instance',
+                       machine_name='machine', output=NullOutputWriter())
+
+    def test_resources_created(self):
+        deployment = {'name': 'deployment', 'operation': {'status': 'RUNNING'}}
+        created = {'finalProperties': '', 'update': {'state': 'COMPLETED'}}
+        in_progress = {'update': {'state': 'IN_PROGRESS'}}
+
+        dm = mock.Mock()
+        dm.get_with_resources.side_effect = [
+            (None, {'instance': None, 'docker-waiter': None}),
+            (deployment, {'instance': in_progress, 'docker-waiter': None}),
+            (deployment, {'instance': created, 'docker-waiter': in_progress}),
+            (deployment, {'docker-waiter': created}),
+        ]
+
+        ce = mock.Mock()
+        ce.list_instances.return_value = [{'name': 'machine', 'status': 'RUNNING'}]
+
+        self._wait_resources(dm, ce)
+
+        # each check is a single batch request for all the pending resources
+        self.assertEqual([c[0][1] for c in dm.get_with_resources.call_args_list], [
+            ['instance', 'docker-waiter'],
+            ['instance', 'docker-waiter'],
+            ['instance', 'docker-waiter'],
+            ['docker-waiter'],
+        ])
+
+        # the delay grows while nothing changes and is reset once a resource is created
+        delays = [c[0][0] for c in self._sleep.call_args_list]
+        self.assertEqual(delays, [1, 1.5, 2.25, 1])
+
+    def test_deployment_failed(self):
+        deployment = {'name': 'deployment', 'operation': {'status': 'DONE', 'error': {'errors': [
+            {'code': 'RESOURCE_ERROR', 'message': 'Quota exceeded'},
+        ]}}}
+
+        dm = mock.Mock()
+        dm.get_with_resources.return_value = (deployment, {'instance': None, 'docker-waiter': None})
+
+        with self.assertRaisesRegex(ValueError, 'Quota exceeded'):
+            self._wait_resources(dm, mock.Mock())
+
+    def test_instance_terminated(self):
+        deployment = {'name': 'deployment', 'operation': {'status': 'RUNNING'}}
+        created = {'finalProperties': '', 'update': {'state': 'COMPLETED'}}
+
+        dm = mock.Mock()
+        dm.get_with_resources.return_value = (deployment, {'instance': created, 'docker-waiter': None})
+
+        ce = mock.Mock()
+        ce.list_instances.return_value = [{'name': 'machine', 'status': 'TERMINATED'}]
+
+        with self.assertRaisesRegex(ValueError, 'unexpectedly terminated'):
+            self._wait_resources(dm, ce)
+
+
+if __name__ == '__main__':
+    unittest.main()
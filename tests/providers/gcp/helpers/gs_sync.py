@@ -0,0 +1,167 @@
+import base64
+import contextlib
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from unittest import mock
+import google_crc32c
+from spotty.commands.writers.null_output_writrer import NullOutputWriter
+from spotty.providers.gcp.helpers import gs_sync
+from spotty.providers.gcp.helpers.gs_sync import sync_local_to_gs, sync_gs_to_local, list_gs_objects, \
+    upload_files_to_gs
+
+
+class FakeBlob(object):
+    """An in-memory replacement for a Google Storage blob."""
+
+    def __init__(self, bucket, name: str):
+        self.bucket = bucket
+        self.name = name
+        self.metadata = None
+        self.data = b''
+        self.updated = datetime.now(timezone.utc)
+
+    @property
+    def size(self):
+        return len(self.data)
+
+    @property
+    def crc32c(self):
+        return base64.b64encode(google_crc32c.Checksum(self.data).digest()).decode('utf-8')
+
+    def _save(self, data: bytes):
+        blob = FakeBlob(self.bucket, self.name)
+        blob.metadata = self.metadata
+        blob.data = data
+        self.bucket.blobs[self.name] = blob
+
+    def upload_from_file(self, f, size: int, checksum: str = None):
+        self._save(f.read(size))
+
+    def compose(self, sources: list):
+        self._save(b''.join(self.bucket.blobs[source.name].data for source in sources))
+
+    def download_to_file(self, f, start: int = None, end: int = None, checksum: str = None):
+        data = self.bucket.blobs[self.name].data
+        f.write(data[start:(end + 1)] if start is not None else data)
+
+    def delete(self):
+        del self.bucket.blobs[self.name]
+
+
+class FakeBucket(object):
+
+    def __init__(self):
+        self.blobs = {}
+
+    def blob(self, name: str):
+        return FakeBlob(self, name)
+
+    def list_blobs(self, prefix: str):
+        return [blob for name, blob in sorted(self.blobs.items()) if name.startswith(prefix)]
+
+    def delete_blob(self, name: str):
+        del self.blobs[name]
+
+
+class FakeClient(object):
+
+    def __init__(self):
+        self._bucket = FakeBucket()
+
+    def bucket(self, bucket_name: str):
+        return self._bucket
+
+    def batch(self):
+        return contextlib.suppress()
+
+
+class TestGSSync(unittest.TestCase):
+
+    @staticmethod
+    def _create_files(root_dir: str, paths: list):
+        for path in paths:
+            file_path = os.path.join(root_dir, path)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(file_path, 'w') as f:
+                f.write(path)
+
+    def test_upload_and_download(self):
+        client = FakeClient()
+        bucket = client.bucket('test-bucket')
+        output = NullOutputWriter()
+
+        filters = [
+            {'exclude': ['ignored-dir/*', 'ignored-file']},
+            {'include': ['ignored-dir/included-file']},
+        ]
+
+        with tempfile.TemporaryDirectory() as local_dir:
+            self._create_files(local_dir, ['local-file', 'dir/file', 'ignored-file', 'ignored-dir/ignored-file',
+                                           'ignored-dir/included-file'])
+
+            # upload files
+            sync_local_to_gs(client, local_dir, 'gs://test-bucket/project', output, filters=filters, delete=True)
+            self.assertEqual(set(list_gs_objects(bucket, 'project/')),
+                             {'local-file', 'dir/file', 'ignored-dir/included-file'})
+
+            # touched files with the same content are not uploaded again
+            os.utime(os.path.join(local_dir, 'local-file'), (0, 0))
+            with mock.patch.object(gs_sync, '_get_upload_transfer') as get_upload_transfer:
+                sync_local_to_gs(client, local_dir, 'gs://test-bucket/project', output, filters=filters)
+                get_upload_transfer.assert_not_called()
+
+            # delete a file
+            os.unlink(os.path.join(local_dir, 'dir', 'file'))
+            sync_local_to_gs(client, local_dir, 'gs://test-bucket/project', output, filters=filters, delete=True)
+            self.assertEqual(set(list_gs_objects(bucket, 'project/')),
+                             {'local-file', 'ignored-dir/included-file'})
+
+            # upload and delete only the specified files
+            self._create_files(local_dir, ['new-file'])
+            upload_files_to_gs(client, local_dir, 'gs://test-bucket/project', ['new-file'], output,
+                               delete_paths=['local-file'])
+            self.assertEqual(set(list_gs_objects(bucket, 'project/')),
+                             {'new-file', 'ignored-dir/included-file'})
+
+        # download files
+        with tempfile.TemporaryDirectory() as local_dir:
+            sync_gs_to_local(client, 'gs://test-bucket/project', local_dir, output,
+                             filters=[{'exclude': ['*']}, {'include': ['ignored-dir/*']}])
+
+            with open(os.path.join(local_dir, 'ignored-dir', 'included-file')) as f:
+                self.assertEqual(f.read(), 'ignored-dir/included-file')
+
+            self.assertFalse(os.path.exists(os.path.join(local_dir, 'new-file')))
+
+    def test_composite_transfers(self):
+        client = FakeClient()
+        bucket = client.bucket('test-bucket')
+        output = NullOutputWriter()
+        content = os.urandom(1000)
+
+        with mock.patch.object(gs_sync, 'COMPOSITE_THRESHOLD', 100), \
+                mock.patch.object(gs_sync, 'COMPONENT_SIZE', 30):
+            with tempfile.TemporaryDirectory() as local_dir:
+                with open(os.path.join(local_dir, 'large-file'), 'wb') as f:
+                    f.write(content)
+
+                sync_local_to_gs(client, local_dir, 'gs://test-bucket/project', output)
+
+            # the object is composed from the components and the components are deleted
+            self.assertEqual(list(bucket.blobs), ['project/large-file'])
+            self.assertEqual(bucket.blobs['project/large-file'].data, content)
+
+            # the object is downloaded in slices
+            with tempfile.TemporaryDirectory() as local_dir:
+                sync_gs_to_local(client, 'gs://test-bucket/project', local_dir, output)
+
+                with open(os.path.join(local_dir, 'large-file'), 'rb') as f:
+                    self.assertEqual(f.read(), content)
+
+                self.assertEqual(os.listdir(local_dir), ['large-file'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,27 @@
+import re
+import unittest
+from spotty.deployment.utils.sync_filters import is_path_included
+from spotty.providers.gcp.helpers.gsutil_rsync import get_exclude_regex
+
+
+class TestGsutilRsync(unittest.TestCase):
+
+    def test_exclude_regex(self):
+        filters = [
+            {'exclude': ['ignored-dir/*', 'ignored-file', '*.py[co]']},
+            {'include': ['ignored-dir/included-*']},
+            {'exclude': ['ignored-dir/included-file-2']},
+        ]
+
+        exclude_regex = re.compile(get_exclude_regex(filters))
+        for path in ['file', 'dir/file.py', 'dir/file.pyc', 'ignored-file', 'ignored-dir/file',
+                     'ignored-dir/included-file-1', 'ignored-dir/included-file-2']:
+            # the regex gives the same result as the in-process sync
+            self.assertEqual(exclude_regex.match(path) is not None, not is_path_included(path, filters), path)
+
+    def test_include_only_filters(self):
+        self.assertIsNone(re.match(get_exclude_regex([{'include': ['*']}]), 'file'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import os
+import shlex
+import subprocess
+import tempfile
+import unittest
+from shutil import which
+from spotty.providers.remote.helpers.rsync import get_upload_command, get_download_command
+
+
+class TestRsync(unittest.TestCase):
+
+    _FILTERS = [{'exclude': ['.git/*', 'data/*']}, {'include': ['data/config.json']}]
+
+    def _get_upload_args(self, **kwargs) -> list:
+        return shlex.split(get_upload_command('/project', '/root/project', 'ubuntu', '1.2.3.4', 22, '/key',
+                                              filters=self._FILTERS, **kwargs))
+
+    def test_upload_with_delete(self):
+        args = self._get_upload_args(delete=True)
+        self.assertIn('--delete', args)
+
+        # excluded files are not deleted on the instance
+        self.assertNotIn('--delete-excluded', args)
+
+    def test_upload_without_delete(self):
+        self.assertNotIn('--delete', self._get_upload_args())
+
+        download_args = shlex.split(get_download_command('/root/project', '/project', 'ubuntu', '1.2.3.4', 22,
+                                                         '/key', filters=self._FILTERS))
+        self.assertNotIn('--delete', download_args)
+
+    def test_upload_filters_order(self):
+        # rsync applies the first matching rule, so the later filters go first as they take priority
+        self.assertEqual(self._get_upload_args()[-8:], ['--include', '/data/config.json',
+                                                        '--exclude', '/.git/**', '--exclude', '/data/**',
+                                                        '/project/', 'ubuntu@1.2.3.4:/root/project'])
+
+    @unittest.skipIf(which('rsync') is None, 'rsync is not installed')
+    def test_include_after_exclude(self):
+        with tempfile.TemporaryDirectory() as src_dir, tempfile.TemporaryDirectory() as dst_dir:
+            os.makedirs(os.path.join(src_dir, 'data'))
+            for filename in ['config.json', 'dataset.csv']:
+                open(os.path.join(src_dir, 'data', filename), 'w').close()
+
+            # run the generated filters against local directories
+            filter_args = self._get_upload_args()[-8:-2]
+            subprocess.check_call(['rsync', '-r'] + filter_args + [src_dir + '/', dst_dir],
+                                  stdout=subprocess.DEVNULL)
+
+            self.assertTrue(os.path.isfile(os.path.join(dst_dir, 'data', 'config.json')))
+            self.assertFalse(os.path.exists(os.path.join(dst_dir, 'data', 'dataset.csv')))
+
+
+if __name__ == '__main__':
+    unittest.main()
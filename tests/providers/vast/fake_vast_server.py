@@ -0,0 +1,123 @@
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+class FakeVastServer(object):
+    """A local HTTP server that emulates the Vast.ai REST API endpoints used by Spotty.
+
+    Usage:
+        with FakeVastServer() as server:
+            client = VastClient(api_key='test', url=server.url)
+    """
+
+    def __init__(self):
+        self.offers = []
+        self.instances = {}
+        self.user = {'id': 1, 'ssh_key': '', 'api_key': 'test'}
+        self.requests = []
+        self._errors = []
+        self._lock = threading.Lock()
+        self._next_instance_id = 1000
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._get_handler_class())
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        return 'http://127.0.0.1:%d' % self._server.server_address[1]
+
+    def add_errors(self, status: int, count: int = 1, headers: dict = None):
+        """The next "count" requests will fail with the status."""
+        with self._lock:
+            self._errors += [(status, headers or {})] * count
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def _handle(self, method: str, path: str, query: dict, body: dict) -> (int, dict, dict):
+        with self._lock:
+            self.requests.append((method, path, query))
+            if self._errors:
+                status, headers = self._errors.pop(0)
+                return status, headers, {'error': 'fake error'}
+
+            if query.get('api_key') != self.user['api_key']:
+                return 401, {}, {'error': 'unauthorized'}
+
+            if (method, path) == ('GET', '/api/v0/instances'):
+                return 200, {}, {'instances': list(self.instances.values())}
+
+            if (method, path) == ('GET', '/api/v0/bundles'):
+                return 200, {}, {'offers': self.offers}
+
+            if (method, path) == ('GET', '/api/v0/users/current'):
+                return 200, {}, dict(self.user)
+
+            match = re.match(r'^/api/v0/asks/(\d+)/$', path)
+            if match and method == 'PUT':
+                instance_id = self._next_instance_id
+                self._next_instance_id += 1
+                self.instances[instance_id] = dict(body, id=instance_id, machine_id=int(match.group(1)),
+                                                   actual_status='loading', status_msg='')
+                return 200, {}, {'success': True, 'new_contract': instance_id}
+
+            match = re.match(r'^/api/v0/instances/(\d+)/$', path)
+            if match:
+                instance_id = int(match.group(1))
+                if instance_id not in self.instances:
+                    return 200, {}, {'success': False, 'msg': 'Instance not found'}
+
+                if method == 'GET':
+                    return 200, {}, {'instances': self.instances[instance_id]}
+                elif method == 'PUT':
+                    self.instances[instance_id].update(actual_status=body.get('state'))
+                    return 200, {}, {'success': True}
+                elif method == 'DELETE':
+                    del self.instances[instance_id]
+                    return 200, {}, {'success': True}
+
+            match = re.match(r'^/api/v0/users/(\d+)/$', path)
+            if match and method == 'PUT':
+                self.user.update(body)
+                return 200, {}, {'success': True}
+
+            return 404, {}, {'error': 'not found'}
+
+    def _get_handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def _process(self):
+                url = urlparse(self.path)
+                query = {key: values[0] for key, values in parse_qs(url.query).items()}
+                length = int(self.headers.get('Content-Length') or 0)
+                body = json.loads(self.rfile.read(length)) if length else {}
+
+                status, headers, res = server._handle(self.command, url.path, query, body)
+                data = json.dumps(res).encode('utf-8')
+
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_PUT = do_DELETE = _process
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,55 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from spotty.providers.vast.helpers.offer_cache import get_offers
+from spotty.providers.vast.helpers.offer_ranking import rank_offers, score_offers, parse_ranking_weights
+from spotty.providers.vast.helpers.vast_client import VastClient
+from tests.providers.vast.fake_vast_server import FakeVastServer
+
+
+class TestOfferRanking(unittest.TestCase):
+
+    _OFFERS = [
+        {'id': 1, 'dph_total': 1.0, 'dlperf': 20, 'reliability2': 0.99},
+        {'id': 2, 'dph_total': 0.5, 'dlperf': 20, 'reliability2': 0.99},
+        {'id': 3, 'dph_total': 0.5, 'dlperf': 10, 'reliability2': 0.90},
+        {'id': 4, 'dph_total': 0.2, 'dlperf': None, 'reliability2': 0.80},
+    ]
+
+    def test_score_offers(self):
+        scores = score_offers(self._OFFERS, {'dph_total': -1, 'dlperf': 2})
+        for score, expected_score in zip(scores, [-1 + 2, -0.375 + 2, -0.375, 0]):
+            self.assertAlmostEqual(score, expected_score)
+
+    def test_rank_offers(self):
+        offers = rank_offers(self._OFFERS, weights={'dph': -1, 'dlperf': 1})
+        self.assertEqual([offer['id'] for offer in offers], [2, 1, 4, 3])
+
+        # hard constraints
+        offers = rank_offers(self._OFFERS, weights={'dph': -1, 'dlperf': 1},
+                             constraints={'reliability': {'min': 0.95}, 'dph_total': {'max': 0.9}})
+        self.assertEqual([offer['id'] for offer in offers], [2])
+
+    def test_parse_ranking_weights(self):
+        self.assertEqual(parse_ranking_weights('dph_total=-1, dlperf=0.5'), {'dph_total': -1, 'dlperf': 0.5})
+        with self.assertRaises(ValueError):
+            parse_ranking_weights('dph_total')
+
+    def test_offers_cache(self):
+        with FakeVastServer() as server, tempfile.TemporaryDirectory() as home_dir, \
+                mock.patch.dict(os.environ, {'HOME': home_dir}):
+            server.offers = self._OFFERS
+            client = VastClient(api_key='test', url=server.url)
+
+            self.assertEqual(get_offers(client, {'num_gpus': {'eq': 1}}, 'on-demand'), self._OFFERS)
+            self.assertEqual(get_offers(client, {'num_gpus': {'eq': 1}}, 'on-demand'), self._OFFERS)
+            self.assertEqual(len(server.requests), 1)
+
+            # a different query is not cached
+            get_offers(client, {'num_gpus': {'eq': 2}}, 'on-demand')
+            self.assertEqual(len(server.requests), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import socket
+import unittest
+from unittest import mock
+from spotty.commands.writers.null_output_writrer import NullOutputWriter
+from spotty.deployment.utils import polling
+from spotty.providers.vast.helpers import readiness
+from spotty.providers.vast.helpers.readiness import wait_instance_ready
+from spotty.providers.vast.helpers.vast_client import VastClient
+from tests.providers.vast.fake_vast_server import FakeVastServer
+
+
+class TestReadiness(unittest.TestCase):
+
+    def setUp(self):
+        self._server = FakeVastServer().__enter__()
+        self._client = VastClient(api_key='test', url=self._server.url)
+        self._instance_id = self._client.create_instance(1, image='ubuntu', disk=10)['new_contract']
+
+        # a local port that accepts TCP connections
+        self._ssh_socket = socket.socket()
+        self._ssh_socket.bind(('127.0.0.1', 0))
+        self._ssh_socket.listen(5)
+
+    def tearDown(self):
+        self._ssh_socket.close()
+        self._server.__exit__()
+
+    def _wait(self, status_updates: list):
+        """Waits for the instance, the fake instance is updated on every sleep."""
+        instance = self._server.instances[self._instance_id]
+        delays = []
+
+        def sleep(delay):
+            delays.append(delay)
+            instance.update(status_updates.pop(0))
+
+        with mock.patch.object(polling, 'sleep', side_effect=sleep), \
+                mock.patch.object(readiness, 'is_ssh_ready', return_value=True) as is_ssh_ready:
+            instance = wait_instance_ready(self._client, self._instance_id, 'root', '/key', NullOutputWriter())
+
+        return instance, delays, is_ssh_ready
+
+    def test_instance_ready(self):
+        ssh_port = self._ssh_socket.getsockname()[1]
+        instance, delays, is_ssh_ready = self._wait([
+            {'status_msg': 'Pulling the image'},
+            {},
+            {'status_msg': 'Starting the container', 'actual_status': 'running', 'public_ipaddr': '127.0.0.1'},
+            {'ports': {'22/tcp': [{'HostIp': '0.0.0.0', 'HostPort': str(ssh_port)}]}},
+        ])
+
+        self.assertEqual(instance['id'], self._instance_id)
+        is_ssh_ready.assert_called_once_with('127.0.0.1', ssh_port, 'root', '/key')
+
+        # delays are reset when the status changes
+        self.assertEqual(delays, [2, 2, 3.0, 2])
+
+    def test_instance_failed(self):
+        with self.assertRaisesRegex(ValueError, 'Instance creation failed'):
+            self._wait([{'status_msg': 'Error response from daemon: manifest unknown'}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+import requests
+from spotty.providers.vast.helpers import vast_client
+from spotty.providers.vast.helpers.vast_client import VastClient, build_offers_query, build_offers_order
+from tests.providers.vast.fake_vast_server import FakeVastServer
+
+
+class TestVastClient(unittest.TestCase):
+
+    def setUp(self):
+        self._server = FakeVastServer().__enter__()
+        self._client = VastClient(api_key='test', url=self._server.url)
+        self._sleep_patcher = mock.patch.object(vast_client.time, 'sleep')
+        self._sleep = self._sleep_patcher.start()
+
+    def tearDown(self):
+        self._sleep_patcher.stop()
+        self._server.__exit__()
+
+    def test_instances(self):
+        self._server.offers = [{'id': 1, 'dph_total': 0.5}]
+        offers = self._client.search_offers(build_offers_query('num_gpus=1'), order=build_offers_order('dph-'))
+        self.assertEqual(offers, [{'id': 1, 'dph_total': 0.5}])
+
+        res = self._client.create_instance(offers[0]['id'], image='ubuntu', disk=10, label='instance-1',
+                                           env='-e KEY=VALUE -p 8080:8080')
+        instance_id = res['new_contract']
+        instances = self._client.get_instances()
+        self.assertEqual([(i['id'], i['label'], i['env']) for i in instances],
+                         [(instance_id, 'instance-1', {'KEY': 'VALUE', '-p 8080:8080': '1'})])
+
+        self._client.destroy_instance(instance_id)
+        self.assertEqual(self._client.get_instances(), [])
+
+        # an unsuccessful response is an error
+        with self.assertRaisesRegex(ValueError, 'Instance not found'):
+            self._client.stop_instance(instance_id)
+
+    def test_retries(self):
+        # the "Retry-After" header is honored
+        self._server.add_errors(429, headers={'Retry-After': '3'})
+        self._server.add_errors(503)
+        self.assertEqual(self._client.get_instances(), [])
+
+        delays = [c[0][0] for c in self._sleep.call_args_list]
+        self.assertEqual(delays[0], 3)
+        self.assertTrue(0 <= delays[1] <= 2)
+
+        # client errors are not retried
+        self._server.add_errors(400)
+        with self.assertRaises(requests.HTTPError):
+            self._client.get_instances()
+
+        # not idempotent requests are not retried after server errors
+        self._server.add_errors(500)
+        with self.assertRaises(requests.HTTPError):
+            self._client.create_instance(1, image='ubuntu', disk=10)
+
+        self.assertEqual(self._server.instances, {})
+
+    def test_max_retries(self):
+        self._server.add_errors(503, count=10)
+        client = VastClient(api_key='test', url=self._server.url, max_retries=2)
+        with self.assertRaises(requests.HTTPError):
+            client.get_instances()
+
+        self.assertEqual(self._sleep.call_count, 2)
+
+    def test_concurrent_requests(self):
+        self._client.create_instance(1, image='ubuntu', disk=10, label='instance-1')
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: self._client.get_instances(), range(32)))
+
+        self.assertTrue(all(len(instances) == 1 for instances in results))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from spotty.providers.vast.helpers.vast_client import VastClient
+from spotty.providers.vast.resource_managers import ssh_key_manager
+from spotty.providers.vast.resource_managers.ssh_key_manager import SshKeyManager
+from tests.providers.vast.fake_vast_server import FakeVastServer
+
+
+class TestSshKeyManager(unittest.TestCase):
+
+    def setUp(self):
+        self._home_dir = tempfile.TemporaryDirectory()
+        self._home_patcher = mock.patch.dict(os.environ, {'HOME': self._home_dir.name})
+        self._home_patcher.start()
+
+        self._server = FakeVastServer().__enter__()
+        self._client_patcher = mock.patch.object(ssh_key_manager, 'get_vast_client',
+                                                 return_value=VastClient(api_key='test', url=self._server.url))
+        self._client_patcher.start()
+
+        self._key_manager = SshKeyManager()
+        for key_file in [self._key_manager.private_key_file, self._key_manager.public_key_file]:
+            with open(key_file, 'w') as f:
+                f.write('ssh-rsa KEY-1')
+
+        self._server.user['ssh_key'] = 'ssh-rsa KEY-1'
+
+    def tearDown(self):
+        self._client_patcher.stop()
+        self._server.__exit__()
+        self._home_patcher.stop()
+        self._home_dir.cleanup()
+
+    def _get_user_requests_count(self):
+        return len([path for _, path, _ in self._server.requests if path == '/api/v0/users/current'])
+
+    def test_verification_is_cached(self):
+        self._key_manager.match_rsa_key()
+        self._key_manager.match_rsa_key()
+        self.assertEqual(self._get_user_requests_count(), 1)
+
+        # the key is verified again if it's forced
+        self._key_manager.match_rsa_key(force=True)
+        self.assertEqual(self._get_user_requests_count(), 2)
+
+        # the key is verified again after the TTL
+        with mock.patch.object(ssh_key_manager, 'KEY_VERIFICATION_TTL', -1):
+            self._key_manager.match_rsa_key()
+
+        self.assertEqual(self._get_user_requests_count(), 3)
+
+    def test_local_key_changed(self):
+        self._key_manager.match_rsa_key()
+
+        with open(self._key_manager.public_key_file, 'w') as f:
+            f.write('ssh-rsa KEY-2')
+
+        with mock.patch('builtins.input', return_value='y'), mock.patch('builtins.print'):
+            self._key_manager.match_rsa_key()
+
+        self.assertEqual(self._get_user_requests_count(), 2)
+        self.assertEqual(self._server.user['ssh_key'], 'ssh-rsa KEY-2')
+
+
+if __name__ == '__main__':
+    unittest.main()